@@ -0,0 +1,85 @@
+# bench_match_parser.py
+# Compare l'ancienne extraction (regex + str.replace + json.loads) au parseur
+# en une passe de match_centre_parser, sur des pages reconstruites à partir
+# de test.json et whoscored_data.json.
+#
+# Usage : python3 bench/bench_match_parser.py [--repeat 10]
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from match_centre_parser import parse_match_args, PLAYER_LIST_SECTIONS  # noqa: E402
+
+SAMPLES = ['test.json', 'whoscored_data.json']
+
+
+def build_page(sample_path):
+    """Reconstruit une page WhoScored (clés de premier niveau non quotées) à partir d'un JSON brut."""
+    with open(sample_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    body = ',\n'.join(f'            {key}: {json.dumps(value, ensure_ascii=False, indent=4)}'
+                      for key, value in data.items())
+    return ('<html><head><script>\n'
+            '        require.config.params["args"] = {\n' + body + '\n        };\n'
+            '    </script></head><body><div id="layout-wrapper"></div></body></html>'), data
+
+
+def legacy_parse(html):
+    """Chemin historique de WhoScoredDataExtractor._extract_data_from_url."""
+    regex_pattern = r'(?<=require\.config\.params\["args"\].=.)[\s\S]*?;'
+    data_txt = re.search(regex_pattern, html).group(0)
+    data_txt = data_txt.replace('matchId', '"matchId"')
+    data_txt = data_txt.replace('matchCentreData', '"matchCentreData"')
+    data_txt = data_txt.replace('matchCentreEventTypeJson', '"matchCentreEventTypeJson"')
+    data_txt = data_txt.replace('formationIdNameMappings', '"formationIdNameMappings"')
+    data_txt = data_txt.replace('};', '}')
+    return json.loads(data_txt)
+
+
+def measure(func, html, repeat):
+    """Retourne (meilleur temps en ms, pic mémoire en Mo) pour func(html)."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(html)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000, peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du parseur matchCentreData")
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    candidates = [
+        ("regex + replace + json.loads", legacy_parse),
+        ("parse_match_args (complet)", parse_match_args),
+        ("parse_match_args (liste joueurs)", lambda html: parse_match_args(html, PLAYER_LIST_SECTIONS)),
+    ]
+
+    for sample in SAMPLES:
+        html, expected = build_page(os.path.join(ROOT, sample))
+        assert parse_match_args(html) == expected, f"Résultat différent pour {sample}"
+        assert legacy_parse(html) == expected
+
+        print(f"\n{sample} : page de {len(html) / 1e6:.2f} Mo")
+        print(f"  {'méthode':<36}{'temps (ms)':>12}{'pic mémoire (Mo)':>20}")
+        for label, func in candidates:
+            elapsed, peak = measure(func, html, args.repeat)
+            print(f"  {label:<36}{elapsed:>12.1f}{peak:>20.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# bench_pass_network.py
+# Réseaux de passes des deux équipes pour une journée complète : appariement
+# des passes (PassPairings), matrices et positions moyennes (calcul), puis
+# rendu des figures TeamPassNetworkVisualizer. Le match test.json est répété
+# --matches fois pour simuler les rencontres d'une journée.
+#
+# Usage : python3 bench/bench_pass_network.py [--matches 10] [--no-render]
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from pass_network import PassPairings  # noqa: E402
+from visualizer import TeamPassNetworkVisualizer  # noqa: E402
+
+SAMPLE = os.path.join(ROOT, 'test.json')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des réseaux de passes d'une journée")
+    parser.add_argument('--matches', type=int, default=10)
+    parser.add_argument('--no-render', action='store_true', help="Mesurer uniquement le calcul des réseaux")
+    args = parser.parse_args()
+
+    with open(SAMPLE, 'r', encoding='utf-8') as f:
+        match_data = json.load(f)
+    match_centre = match_data['matchCentreData']
+    team_names = [match_centre['home']['name'], match_centre['away']['name']]
+    print(f"{os.path.basename(SAMPLE)} x {args.matches} matchs : {len(match_centre['events'])} événements par match")
+
+    start = time.perf_counter()
+    visualizers = []
+    for _ in range(args.matches):
+        pairings = PassPairings.from_events(match_centre['events'])
+        for team_name in team_names:
+            visualizer = TeamPassNetworkVisualizer(match_data, team_name, "Bench", "#000000", "#5a5403", pairings)
+            visualizer.network()
+            visualizers.append(visualizer)
+    compute = time.perf_counter() - start
+    print(f"  calcul : {len(visualizers)} réseaux en {compute * 1000:.1f} ms")
+
+    if args.no_render:
+        return
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        start = time.perf_counter()
+        for i, visualizer in enumerate(visualizers):
+            visualizer.plot_pass_network(os.path.join(tmp_dir, f"network_{i}.png"))
+        render = time.perf_counter() - start
+        print(f"  rendu  : {len(visualizers)} figures en {render:.2f} s ({render / len(visualizers) * 1000:.0f} ms/figure)")
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# bench_player_data_io.py
+# Taille et temps de chargement d'un fichier joueur selon le format de sortie
+# (player_data_io.OUTPUT_FORMATS), sur player_data/Vitinha_1911398.json.
+# --matches duplique les événements pour simuler un agrégat de saison.
+#
+# Usage : python3 bench/bench_player_data_io.py [--matches 1 38] [--repeat 20]
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from event_table import EventTable  # noqa: E402
+from player_data_io import OUTPUT_FORMATS, open_player_table, read_player_data, write_player_data, zstandard  # noqa: E402
+
+SAMPLE = os.path.join(ROOT, 'player_data', 'Vitinha_1911398.json')
+
+
+def disk_size(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    return os.path.getsize(path)
+
+
+def best_time(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des formats de fichiers joueur")
+    parser.add_argument('--matches', type=int, nargs='+', default=[1, 38])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with open(SAMPLE, 'r', encoding='utf-8') as f:
+        sample = json.load(f)
+    formats = [name for name in OUTPUT_FORMATS if name != 'zstd' or zstandard is not None]
+    if zstandard is None:
+        print("(module 'zstandard' absent : format zstd ignoré)")
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        for n_matches in args.matches:
+            data = dict(sample, events=sample['events'] * n_matches)
+            print(f"\n{os.path.basename(SAMPLE)} x {n_matches} : {len(data['events'])} événements")
+            print(f"  {'format':<10}{'taille (Ko)':>12}{'ratio':>8}{'lecture (ms)':>14}{'table (ms)':>12}")
+            reference = None
+            for output_format in formats:
+                path = write_player_data(os.path.join(tmp_dir, f"{output_format}_{n_matches}"), data, output_format)
+                size = disk_size(path)
+                reference = reference or size
+                # lecture : fiche complète ; table : ce dont les visualizers ont besoin (EventTable)
+                read = best_time(lambda: read_player_data(path), args.repeat)
+                if output_format == 'columnar':
+                    table = best_time(lambda: open_player_table(path), args.repeat)
+                else:
+                    table = best_time(lambda: EventTable(read_player_data(path)['events']), args.repeat)
+                print(f"  {output_format:<10}{size / 1024:>12.1f}{reference / size:>8.1f}{read * 1000:>14.2f}{table * 1000:>12.2f}")
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == '__main__':
+    main()
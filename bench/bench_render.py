@@ -0,0 +1,93 @@
+# bench_render.py
+# Compare le dessin historique (un pitch.scatter / pitch.arrows par événement)
+# au dessin par couches de visualizer (une collection par groupe de style), sur
+# player_data/Vitinha_1911398.json. --matches duplique les événements pour
+# simuler une saison.
+#
+# Usage : python3 bench/bench_render.py [--matches 1 38] [--repeat 3]
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from mplsoccer import VerticalPitch  # noqa: E402
+from event_table import EventTable  # noqa: E402
+from pass_classifier import ZONE_DEFENSIVE, ZONE_MIDDLE, ZONE_OFFENSIVE  # noqa: E402
+from visualizer import draw_scatter_layer, draw_arrow_layer  # noqa: E402
+
+SAMPLE = os.path.join(ROOT, 'player_data', 'Vitinha_1911398.json')
+ZONE_COLORS = ((ZONE_DEFENSIVE, '#FF6B6B'), (ZONE_MIDDLE, '#FFD93D'), (ZONE_OFFENSIVE, '#6DF176'))
+
+
+def legacy_layers(pitch, ax, table):
+    """Chemin historique : un artiste par passe et par touche."""
+    for event in table.events:
+        if event['type']['displayName'] == 'Pass' and 'endX' in event:
+            color = '#6DF176' if event['outcomeType']['displayName'] == 'Successful' else 'red'
+            pitch.arrows(event['x'], event['y'], event['endX'], event['endY'],
+                         width=3, headwidth=3, headlength=3, color=color, ax=ax)
+    zone = table.pass_classes()['zone']
+    for code, color in ZONE_COLORS:
+        for i in np.flatnonzero(zone == code):
+            pitch.scatter(table.x[i], table.y[i], s=100, marker='o', color=color,
+                          alpha=0.3, edgecolor='white', linewidth=0.5, ax=ax)
+
+
+def batched_layers(pitch, ax, table):
+    """Une collection par groupe de style."""
+    passes = table.type_mask('Pass')
+    successful = table.successful()
+    for color, mask in (('#6DF176', passes & successful), ('red', passes & ~successful)):
+        draw_arrow_layer(pitch, ax, table, mask, width=3, headwidth=3, headlength=3, color=color)
+    zone = table.pass_classes()['zone']
+    for code, color in ZONE_COLORS:
+        draw_scatter_layer(pitch, ax, table, zone == code, s=100, marker='o', color=color,
+                           alpha=0.3, edgecolor='white', linewidth=0.5)
+
+
+def render(draw, table):
+    """Figure complète (terrain + couches + savefig PNG) ; retourne (temps en s, nb d'artistes)."""
+    start = time.perf_counter()
+    fig = plt.figure(figsize=(12, 9))
+    pitch = VerticalPitch(pitch_type='opta', pitch_color='none', line_color='white', linewidth=2)
+    ax = fig.add_subplot(1, 1, 1)
+    pitch.draw(ax=ax)
+    n_before = len(ax.get_children())
+    draw(pitch, ax, table)
+    n_artists = len(ax.get_children()) - n_before
+    fig.savefig(io.BytesIO(), format='png')
+    plt.close(fig)
+    return time.perf_counter() - start, n_artists
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du dessin des événements sur le terrain")
+    parser.add_argument('--matches', type=int, nargs='+', default=[1, 38])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with open(SAMPLE, 'r', encoding='utf-8') as f:
+        events = json.load(f)['events']
+
+    print(f"{os.path.basename(SAMPLE)} : {len(events)} événements par match")
+    print(f"  {'matchs':>7}{'événements':>12}{'méthode':>14}{'artistes':>10}{'temps (ms)':>12}")
+    for n_matches in args.matches:
+        table = EventTable(events * n_matches)
+        for label, draw in (("par événement", legacy_layers), ("par couche", batched_layers)):
+            results = [render(draw, table) for _ in range(args.repeat)]
+            best = min(elapsed for elapsed, _ in results)
+            print(f"  {n_matches:>7}{len(table):>12}{label:>14}{results[0][1]:>10}{best * 1000:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
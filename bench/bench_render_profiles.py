@@ -0,0 +1,73 @@
+# bench_render_profiles.py
+# Temps de rendu et taille des 7 figures de match de
+# player_data/Vitinha_1911398.json pour chaque profil de rendu
+# (figure_templates.RENDER_PROFILES). La première passe de chaque profil
+# (gabarits, fonds et vignettes mis en cache) n'est pas comptée.
+#
+# Usage : python3 bench/bench_render_profiles.py [--repeat 3]
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+os.chdir(ROOT)  # Photos et vignettes relues depuis data/photo
+
+from figure_templates import RENDER_PROFILES, pop_saved, set_render_profile  # noqa: E402
+from visualizer import MatchVisualizer  # noqa: E402
+
+SAMPLE = os.path.join('player_data', 'Vitinha_1911398.json')
+FIGURES = (
+    ('plot_passes_heatmap_and_bar_charts', ('MIL', 0)),
+    ('plot_passes_and_bar_charts', ()),
+    ('plot_defensive_activity', ()),
+    ('plot_offensive_activity', ()),
+    ('plot_progressive_actions', ()),
+    ('plot_zone_dominance', ()),
+    ('plot_player_pass_connections', ()),
+)
+
+
+def render_all(visualizer, directory):
+    for method, args in FIGURES:
+        getattr(visualizer, method)(os.path.join(directory, f"{method}.png"), *args)
+    return pop_saved()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des profils de rendu")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    visualizer = MatchVisualizer(SAMPLE, 'Ligue 1', '#000000', '#5a5403', 'Ligue 1', 'PSG vs X')
+    tmp_dir = tempfile.mkdtemp()
+    print(f"{len(FIGURES)} figures de match, meilleur temps sur {args.repeat} passe(s)")
+    print(f"  {'profil':<12}{'total (s)':>10}{'dessin (ms)':>13}{'encodage (ms)':>15}{'taille (Ko)':>13}")
+    try:
+        for profile in RENDER_PROFILES:
+            set_render_profile(profile)
+            render_all(visualizer, tmp_dir)
+            best = None
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                saved = render_all(visualizer, tmp_dir)
+                elapsed = time.perf_counter() - start
+                if best is None or elapsed < best[0]:
+                    best = (elapsed, saved)
+            elapsed, saved = best
+            draw = sum(s[2] for s in saved) * 1000
+            encode = sum(s[3] for s in saved) * 1000
+            size = sum(s[1] for s in saved) / 1024
+            print(f"  {profile:<12}{elapsed:>10.2f}{draw:>13.0f}{encode:>15.0f}{size:>13.0f}")
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == '__main__':
+    main()
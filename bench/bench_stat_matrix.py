@@ -0,0 +1,66 @@
+# bench_stat_matrix.py
+# Compare la somme historique des stats minute par minute (dicts Python, clé par
+# clé) à la réduction NumPy des StatMatrix, sur les lignes joueurs de test.json
+# et whoscored_data.json répétées pour simuler une saison.
+#
+# Usage : python3 bench/bench_stat_matrix.py [--matches 38 380] [--repeat 5]
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from stat_matrix import StatMatrix, sum_matches  # noqa: E402
+
+SAMPLES = ['test.json', 'whoscored_data.json']
+
+
+def legacy_sum(stats_list):
+    """Chemin historique de l'agrégat de saison : un dict par stat, minute par minute."""
+    total = {}
+    for stats in stats_list:
+        for stat_key, stat_value in stats.items():
+            merged = total.setdefault(stat_key, {})
+            for minute, value in stat_value.items():
+                merged[minute] = merged.get(minute, 0) + value
+    return total
+
+
+def best_time(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'agrégation des stats par minute")
+    parser.add_argument('--matches', type=int, nargs='+', default=[38, 380])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    players = []
+    for sample in SAMPLES:
+        with open(os.path.join(ROOT, sample), 'r', encoding='utf-8') as f:
+            match_centre = json.load(f)['matchCentreData']
+        players += [p for team in ('home', 'away') for p in match_centre[team]['players'] if p.get('stats')]
+
+    print(f"  {'matchs':>7}{'dicts (ms)':>12}{'matrices (ms)':>15}{'phases (ms)':>13}")
+    for n_matches in args.matches:
+        rows = [players[i % len(players)] for i in range(n_matches)]
+        stats_list = [p['stats'] for p in rows]
+        matrices = [StatMatrix.from_player(p) for p in rows]  # construites une fois, comme dans un agrégat
+
+        legacy = best_time(lambda: legacy_sum(stats_list), args.repeat)
+        matrix = best_time(lambda: sum_matches(matrices), args.repeat)
+        phases = best_time(lambda: sum_matches(matrices).phases(), args.repeat)
+        print(f"  {n_matches:>7}{legacy * 1000:>12.2f}{matrix * 1000:>15.2f}{phases * 1000:>13.2f}")
+
+
+if __name__ == '__main__':
+    main()
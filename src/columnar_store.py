@@ -0,0 +1,139 @@
+# columnar_store.py
+# Fichier compagnon binaire d'un fichier joueur JSON (<fichier>.json.columns/),
+# ou format colonnaire autonome (<fichier>.columns/, voir player_data_io) :
+# une colonne NumPy de largeur fixe par champ de EventTable (.npy), ouverte en
+# memmap. Les visualizers rechargent ainsi une saison sans parser le JSON ;
+# seules les pages des colonnes réellement lues sont chargées, et plusieurs
+# workers de rendu partagent les mêmes pages du cache système.
+import gzip
+import json
+import os
+import shutil
+
+import numpy as np
+
+from event_table import EventTable, QualifierIndex
+
+SIDECAR_SUFFIX = ".columns"
+SIDECAR_VERSION = 2  # 2 : colonne isTouch
+QUALIFIER_ARRAYS = ('rows', 'row_offsets', 'value_rows', 'value_offsets', 'values')
+EVENTS_FILE = "events.json.gz"  # Événements bruts du format colonnaire autonome
+
+
+def sidecar_path(json_path):
+    return f"{json_path}{SIDECAR_SUFFIX}"
+
+
+def _source_signature(json_path):
+    stat = os.stat(json_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def write_columns(directory, player_data, table=None, source_path=None):
+    """
+    Écrit les colonnes des événements de player_data dans directory.
+    source_path : fichier JSON dont directory est le compagnon (les événements
+    bruts y restent) ; None pour un format colonnaire autonome, où les
+    événements bruts sont conservés compressés dans events.json.gz.
+    """
+    table = table if table is not None else EventTable(player_data.get('events', []))
+    tmp_directory = f"{directory}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_directory, ignore_errors=True)
+    os.makedirs(tmp_directory)
+
+    for name in EventTable.STORED_COLUMNS:
+        np.save(os.path.join(tmp_directory, f"{name}.npy"), np.ascontiguousarray(getattr(table, name)))
+    qualifiers = table.qualifiers.to_arrays()
+    for name in QUALIFIER_ARRAYS:
+        np.save(os.path.join(tmp_directory, f"qualifier_{name}.npy"), qualifiers[name])
+    if source_path is None:
+        with gzip.open(os.path.join(tmp_directory, EVENTS_FILE), 'wt', encoding='utf-8') as f:
+            json.dump(player_data.get('events', []), f, ensure_ascii=False, separators=(',', ':'))
+
+    meta = {
+        "version": SIDECAR_VERSION,
+        "source": _source_signature(source_path) if source_path else None,
+        "n_rows": len(table),
+        "type_codes": table.type_codes,
+        "outcome_codes": table.outcome_codes,
+        "qualifier_names": qualifiers['names'],
+        "qualifier_value_names": qualifiers['value_names'],
+        # Fiche joueur sans les événements (lus dans les colonnes)
+        "player": {key: value for key, value in player_data.items() if key != 'events'},
+    }
+    with open(os.path.join(tmp_directory, "meta.json"), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(tmp_directory, directory)
+    return directory
+
+
+def write_sidecar(json_path, player_data, table=None):
+    """
+    Écrit les colonnes des événements de player_data à côté de json_path
+    (à appeler juste après l'écriture du fichier). Retourne le dossier écrit.
+    """
+    return write_columns(sidecar_path(json_path), player_data, table, source_path=json_path)
+
+
+def read_events(directory):
+    """Événements bruts d'un dossier colonnaire autonome (events.json.gz)."""
+    with gzip.open(os.path.join(directory, EVENTS_FILE), 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def open_columns(directory, source_path=None, read_source=_read_json):
+    """
+    Ouvre un dossier colonnaire en memmap. Retourne (fiche joueur sans
+    événements, EventTable), ou None s'il est absent, illisible ou plus
+    ancien que son fichier source. Les événements bruts (EventTable.events)
+    ne sont relus (read_source(source_path)) que s'ils sont demandés.
+    """
+    try:
+        with open(os.path.join(directory, "meta.json"), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get("version") != SIDECAR_VERSION:
+            return None
+        if meta.get("source") is not None and (
+                source_path is None or meta["source"] != _source_signature(source_path)):
+            return None
+
+        def load(name):
+            return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r')
+
+        columns = {name: load(name) for name in EventTable.STORED_COLUMNS}
+        qualifier_arrays = {name: load(f"qualifier_{name}") for name in QUALIFIER_ARRAYS}
+    except (OSError, ValueError) as e:
+        if os.path.isdir(directory):
+            print(f"Colonnes illisibles dans {directory} ({e}), lecture du fichier source.")
+        return None
+
+    qualifier_arrays['names'] = meta["qualifier_names"]
+    qualifier_arrays['value_names'] = meta["qualifier_value_names"]
+    qualifiers = QualifierIndex.from_arrays(meta["n_rows"], qualifier_arrays)
+
+    if meta.get("source") is None:
+        def load_events():
+            return read_events(directory)
+    else:
+        def load_events():
+            return read_source(source_path).get('events', [])
+
+    table = EventTable.from_columns(columns, meta["type_codes"], meta["outcome_codes"], qualifiers, load_events)
+    return meta["player"], table
+
+
+def open_sidecar(path, read_source=_read_json):
+    """
+    Colonnes memmap d'un fichier joueur : son compagnon <fichier>.columns, ou
+    le dossier lui-même pour le format colonnaire autonome. Voir open_columns.
+    """
+    if path.endswith(SIDECAR_SUFFIX):
+        return open_columns(path)
+    return open_columns(sidecar_path(path), path, read_source)
@@ -0,0 +1,307 @@
+# event_table.py
+import numpy as np
+
+from pass_classifier import classify_passes
+
+# Qualifiers suivis dans le masque de bits qualifier_bits (64 au maximum)
+TRACKED_QUALIFIERS = (
+    'KeyPass', 'BigChance', 'IntentionalAssist', 'Assisted', 'Longball', 'Cross',
+    'HeadPass', 'Throughball', 'Chipped', 'LayOff', 'FreekickTaken', 'CornerTaken',
+    'ThrowIn', 'GoalKick', 'KeeperThrow', 'Penalty', 'Head', 'RightFoot', 'LeftFoot',
+    'OtherBodyPart', 'RegularPlay', 'FastBreak', 'SetPiece', 'FromCorner',
+    'BoxCentre', 'OutOfBoxCentre', 'SmallBoxCentre', 'Blocked', 'OwnGoal', 'Yellow',
+    'Red', 'SecondYellow',
+)
+QUALIFIER_BITS = {name: np.uint64(1) << np.uint64(i) for i, name in enumerate(TRACKED_QUALIFIERS)}
+
+
+class QualifierIndex:
+    """
+    Index des qualifiers d'une EventTable, construit au chargement :
+    - type de qualifier -> lignes qui le portent (bitmap / tableau d'indices) ;
+    - valeurs numériques (PassEndX, GoalMouthY, ...) stockées de façon creuse.
+    "Toutes les passes clés" ou "toutes les valeurs GoalMouthY" deviennent
+    une simple lecture de tableau au lieu d'un parcours des listes de qualifiers.
+    """
+
+    def __init__(self, n_rows):
+        self.n_rows = n_rows
+        self._rows = {}         # nom -> indices des lignes
+        self._value_rows = {}   # nom -> indices des lignes ayant une valeur numérique
+        self._values = {}       # nom -> valeurs numériques (alignées sur _value_rows)
+        self._masks = {}
+        self._columns = {}
+
+    def add(self, row, qualifier):
+        """Enregistre un qualifier de la ligne row (appelé pendant la construction de la table)."""
+        name = qualifier['type']['displayName']
+        rows = self._rows.setdefault(name, [])
+        if rows and rows[-1] == row:
+            return  # Qualifier répété sur le même événement : seule la première valeur compte
+        rows.append(row)
+
+        value = qualifier.get('value')
+        if value is None:
+            return
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return  # Valeur textuelle (ex. Zone = 'Left') : non indexée
+        self._value_rows.setdefault(name, []).append(row)
+        self._values.setdefault(name, []).append(value)
+
+    def freeze(self):
+        """Convertit les listes en tableaux NumPy une fois la table construite."""
+        self._rows = {name: np.asarray(rows, dtype=np.intp) for name, rows in self._rows.items()}
+        self._value_rows = {name: np.asarray(rows, dtype=np.intp) for name, rows in self._value_rows.items()}
+        self._values = {name: np.asarray(values, dtype=float) for name, values in self._values.items()}
+
+    def names(self):
+        return sorted(self._rows)
+
+    def rows(self, name):
+        """Indices des lignes portant le qualifier."""
+        return self._rows.get(name, np.empty(0, dtype=np.intp))
+
+    def mask(self, name):
+        """Bitmap (masque booléen) des lignes portant le qualifier."""
+        if name not in self._masks:
+            mask = np.zeros(self.n_rows, dtype=bool)
+            mask[self.rows(name)] = True
+            self._masks[name] = mask
+        return self._masks[name]
+
+    def values(self, name):
+        """(lignes, valeurs) des occurrences numériques du qualifier."""
+        return (self._value_rows.get(name, np.empty(0, dtype=np.intp)),
+                self._values.get(name, np.empty(0, dtype=float)))
+
+    def column(self, name):
+        """Colonne dense des valeurs du qualifier (NaN pour les lignes sans valeur)."""
+        if name not in self._columns:
+            column = np.full(self.n_rows, np.nan)
+            rows, values = self.values(name)
+            column[rows] = values
+            self._columns[name] = column
+        return self._columns[name]
+
+    def to_arrays(self):
+        """
+        Index sous forme de tableaux plats (format CSR) pour le stockage colonnaire :
+        (noms, indices concaténés, bornes) pour les lignes et pour les valeurs.
+        """
+        names = self.names()
+        value_names = sorted(self._values)
+
+        def concat(arrays, dtype):
+            if not arrays:
+                return np.empty(0, dtype=dtype), np.zeros(1, dtype=np.int64)
+            offsets = np.concatenate(([0], np.cumsum([len(array) for array in arrays])))
+            return np.concatenate(arrays).astype(dtype), offsets.astype(np.int64)
+
+        rows, row_offsets = concat([self._rows[name] for name in names], np.int64)
+        value_rows, value_offsets = concat([self._value_rows[name] for name in value_names], np.int64)
+        values, _ = concat([self._values[name] for name in value_names], float)
+        return {
+            'names': names, 'value_names': value_names,
+            'rows': rows, 'row_offsets': row_offsets,
+            'value_rows': value_rows, 'value_offsets': value_offsets, 'values': values,
+        }
+
+    @classmethod
+    def from_arrays(cls, n_rows, arrays):
+        """Reconstruit l'index à partir de to_arrays (tableaux éventuellement en memmap)."""
+        index = cls(n_rows)
+        row_offsets, value_offsets = arrays['row_offsets'], arrays['value_offsets']
+        for i, name in enumerate(arrays['names']):
+            index._rows[name] = arrays['rows'][row_offsets[i]:row_offsets[i + 1]]
+        for i, name in enumerate(arrays['value_names']):
+            index._value_rows[name] = arrays['value_rows'][value_offsets[i]:value_offsets[i + 1]]
+            index._values[name] = arrays['values'][value_offsets[i]:value_offsets[i + 1]]
+        return index
+
+
+class EventTable:
+    """
+    Table colonnaire (struct-of-arrays) des événements d'un joueur ou d'un match.
+    Construite une seule fois à partir de la liste d'événements WhoScored, puis
+    partagée par toutes les visualisations : les filtres deviennent des masques
+    booléens NumPy au lieu de compréhensions de liste sur les dicts.
+
+    Les codes de type et de résultat sont les codes Opta (type.value,
+    outcomeType.value) ; -1 signale une valeur absente.
+    """
+
+    FLOAT_COLUMNS = ('x', 'y', 'endX', 'endY')
+    INT_COLUMNS = ('minute', 'second', 'expandedMinute', 'type', 'outcome',
+                   'playerId', 'teamId', 'period', 'eventId')
+    BOOL_COLUMNS = ('isTouch',)
+    # Colonnes conservées par le stockage colonnaire (columnar_store)
+    STORED_COLUMNS = FLOAT_COLUMNS + INT_COLUMNS + BOOL_COLUMNS + ('qualifier_bits',)
+
+    def __init__(self, events):
+        self._events = events
+        self._events_loader = None
+        n = len(events)
+
+        self.x = np.full(n, np.nan)
+        self.y = np.full(n, np.nan)
+        self.endX = np.full(n, np.nan)
+        self.endY = np.full(n, np.nan)
+        self.minute = np.full(n, -1, dtype=np.int32)
+        self.second = np.full(n, -1, dtype=np.int32)
+        self.expandedMinute = np.full(n, -1, dtype=np.int32)
+        self.type = np.full(n, -1, dtype=np.int32)
+        self.outcome = np.full(n, -1, dtype=np.int32)
+        self.playerId = np.full(n, -1, dtype=np.int64)
+        self.teamId = np.full(n, -1, dtype=np.int64)
+        self.period = np.full(n, -1, dtype=np.int32)
+        self.eventId = np.full(n, -1, dtype=np.int64)
+        self.isTouch = np.zeros(n, dtype=bool)
+        self.qualifier_bits = np.zeros(n, dtype=np.uint64)
+
+        self.type_codes = {}     # displayName -> code Opta
+        self.outcome_codes = {}  # displayName -> code Opta
+        self.qualifiers = QualifierIndex(n)
+
+        for i, event in enumerate(events):
+            if 'x' in event:
+                self.x[i] = event['x']
+            if 'y' in event:
+                self.y[i] = event['y']
+            if 'endX' in event:
+                self.endX[i] = event['endX']
+            if 'endY' in event:
+                self.endY[i] = event['endY']
+            self.minute[i] = event.get('minute', -1)
+            self.second[i] = event.get('second', -1)
+            self.expandedMinute[i] = event.get('expandedMinute', -1)
+            self.playerId[i] = event.get('playerId', -1)
+            self.teamId[i] = event.get('teamId', -1)
+            self.eventId[i] = event.get('eventId', -1)
+            self.isTouch[i] = bool(event.get('isTouch'))
+
+            event_type = event.get('type')
+            if event_type:
+                self.type[i] = event_type['value']
+                self.type_codes[event_type['displayName']] = event_type['value']
+            outcome = event.get('outcomeType')
+            if outcome:
+                self.outcome[i] = outcome['value']
+                self.outcome_codes[outcome['displayName']] = outcome['value']
+            period = event.get('period')
+            if period:
+                self.period[i] = period['value']
+
+            bits = 0
+            for qualifier in event.get('qualifiers', ()):
+                self.qualifiers.add(i, qualifier)
+                bit = QUALIFIER_BITS.get(qualifier['type']['displayName'])
+                if bit is not None:
+                    bits |= int(bit)
+            self.qualifier_bits[i] = bits
+        self.qualifiers.freeze()
+        self._build_indexes()
+
+    @classmethod
+    def from_columns(cls, columns, type_codes, outcome_codes, qualifiers, events_loader=None):
+        """
+        Table construite à partir de colonnes déjà typées (ex. memmap du stockage
+        colonnaire), sans parcourir les événements. events_loader : fonction
+        retournant la liste des événements bruts, appelée seulement si besoin.
+        """
+        table = cls.__new__(cls)
+        table._events = None
+        table._events_loader = events_loader
+        for name in cls.STORED_COLUMNS:
+            setattr(table, name, columns[name])
+        table.type_codes = dict(type_codes)
+        table.outcome_codes = dict(outcome_codes)
+        table.qualifiers = qualifiers
+        table._build_indexes()
+        return table
+
+    def _build_indexes(self):
+        self.has_x = ~np.isnan(self.x)
+        self.has_end = ~np.isnan(self.endX)
+
+        # Index des lignes par type d'événement, calculés une seule fois
+        order = np.argsort(self.type, kind='stable')
+        codes, starts = np.unique(self.type[order], return_index=True)
+        bounds = list(starts[1:]) + [len(self.type)]
+        self._type_index = {int(code): order[start:end] for code, start, end in zip(codes, starts, bounds)}
+        self._pass_classes = None
+
+    @property
+    def events(self):
+        """Événements bruts (dicts WhoScored), chargés à la demande pour une table colonnaire."""
+        if self._events is None:
+            self._events = self._events_loader() if self._events_loader else []
+        return self._events
+
+    def __len__(self):
+        return len(self.type)
+
+    # ---------- Masques ----------
+    def indices(self, type_name):
+        """Indices (triés) des événements du type donné."""
+        code = self.type_codes.get(type_name)
+        if code is None:
+            return np.empty(0, dtype=np.intp)
+        return self._type_index.get(code, np.empty(0, dtype=np.intp))
+
+    def type_mask(self, *type_names):
+        """Masque des événements dont le type fait partie de type_names."""
+        mask = np.zeros(len(self), dtype=bool)
+        for type_name in type_names:
+            mask[self.indices(type_name)] = True
+        return mask
+
+    def outcome_mask(self, outcome_name):
+        """Masque des événements avec ce résultat (False si outcomeType absent)."""
+        code = self.outcome_codes.get(outcome_name)
+        if code is None:
+            return np.zeros(len(self), dtype=bool)
+        return self.outcome == code
+
+    def successful(self):
+        return self.outcome_mask('Successful')
+
+    def has_outcome(self):
+        return self.outcome >= 0
+
+    def qualifier_mask(self, qualifier_name):
+        """Masque des événements portant le qualifier (n'importe quel type, via l'index)."""
+        return self.qualifiers.mask(qualifier_name)
+
+    def qualifier_column(self, qualifier_name):
+        """Valeurs numériques du qualifier par ligne (NaN si absent)."""
+        return self.qualifiers.column(qualifier_name)
+
+    def mask(self, types=None, outcome=None, qualifier=None):
+        """Combine un filtre de type(s), de résultat et de qualifier."""
+        result = np.ones(len(self), dtype=bool)
+        if types is not None:
+            result &= self.type_mask(*([types] if isinstance(types, str) else types))
+        if outcome is not None:
+            result &= self.outcome_mask(outcome)
+        if qualifier is not None:
+            result &= self.qualifier_mask(qualifier)
+        return result
+
+    def count(self, types=None, outcome=None, qualifier=None):
+        return int(np.count_nonzero(self.mask(types, outcome, qualifier)))
+
+    def pass_classes(self):
+        """
+        Classification (direction, réussite, progression, zone) de toutes les
+        lignes, calculée une fois en un appel vectorisé. À combiner avec
+        type_mask('Pass') pour ne garder que les passes.
+        """
+        if self._pass_classes is None:
+            self._pass_classes = classify_passes(self.x, self.y, self.endX, self.endY, self.successful())
+        return self._pass_classes
+
+    def rows(self, mask):
+        """Événements bruts (dicts) correspondant au masque, dans l'ordre d'origine."""
+        return [self.events[i] for i in np.flatnonzero(mask)]
@@ -0,0 +1,212 @@
+# event_warehouse.py
+# Entrepôt local (SQLite) des événements de tous les matchs récupérés : une
+# ligne par événement avec les colonnes de EventTable, indexée par match,
+# joueur, équipe, type et minute. Les requêtes multi-matchs (ex. toutes les
+# passes d'une équipe sur ses 10 derniers matchs) se font sans réseau et
+# retournent directement des tableaux NumPy ou des événements bruts.
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from event_table import EventTable
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    match_id     INTEGER PRIMARY KEY,
+    start_time   TEXT,
+    home_team_id INTEGER,
+    home_name    TEXT,
+    away_team_id INTEGER,
+    away_name    TEXT,
+    status_code  INTEGER,
+    ingested_at  REAL
+);
+CREATE TABLE IF NOT EXISTS event_types (
+    code INTEGER PRIMARY KEY,
+    name TEXT
+);
+CREATE TABLE IF NOT EXISTS events (
+    match_id        INTEGER NOT NULL,
+    seq             INTEGER NOT NULL,
+    event_id        INTEGER,
+    player_id       INTEGER,
+    team_id         INTEGER,
+    type            INTEGER,
+    outcome         INTEGER,
+    period          INTEGER,
+    minute          INTEGER,
+    second          INTEGER,
+    expanded_minute INTEGER,
+    x               REAL,
+    y               REAL,
+    end_x           REAL,
+    end_y           REAL,
+    raw             TEXT,
+    PRIMARY KEY (match_id, seq)
+);
+CREATE INDEX IF NOT EXISTS events_player ON events (player_id, match_id);
+CREATE INDEX IF NOT EXISTS events_team ON events (team_id, match_id);
+CREATE INDEX IF NOT EXISTS events_type ON events (type, match_id);
+CREATE INDEX IF NOT EXISTS events_minute ON events (match_id, expanded_minute);
+CREATE INDEX IF NOT EXISTS matches_start ON matches (start_time);
+"""
+
+# Colonnes numériques interrogeables -> type NumPy (noms alignés sur EventTable)
+COLUMNS = {
+    'matchId': ('match_id', np.int64),
+    'eventId': ('event_id', np.int64),
+    'playerId': ('player_id', np.int64),
+    'teamId': ('team_id', np.int64),
+    'type': ('type', np.int32),
+    'outcome': ('outcome', np.int32),
+    'period': ('period', np.int32),
+    'minute': ('minute', np.int32),
+    'second': ('second', np.int32),
+    'expandedMinute': ('expanded_minute', np.int32),
+    'x': ('x', float),
+    'y': ('y', float),
+    'endX': ('end_x', float),
+    'endY': ('end_y', float),
+}
+
+
+class EventWarehouse:
+    """
+    Entrepôt SQLite des événements de match (fichier unique, module sqlite3).
+    ingest : (ré)intègre un matchCentreData complet en une transaction.
+    query / events / event_table : filtres par matchs, joueurs, équipes,
+    types (noms ou codes Opta) et minutes étendues.
+    """
+
+    def __init__(self, path="data/events.sqlite"):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Connexion partagée entre les workers de scraping, protégée par un verrou
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")  # Lectures possibles pendant une ingestion
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ---------- Ingestion ----------
+    def ingest(self, match_id, match_data):
+        """Remplace les événements du match par ceux de match_data ; retourne le nombre d'événements."""
+        match_centre = (match_data or {}).get("matchCentreData")
+        if match_id is None or not match_centre:
+            return 0
+        match_id = int(match_id)
+        home = match_centre.get("home", {})
+        away = match_centre.get("away", {})
+
+        rows = []
+        event_types = {}
+        for seq, event in enumerate(match_centre.get("events", [])):
+            event_type = event.get('type') or {}
+            if event_type:
+                event_types[event_type['value']] = event_type['displayName']
+            rows.append((
+                match_id, seq, event.get('eventId'), event.get('playerId'), event.get('teamId'),
+                event_type.get('value'), (event.get('outcomeType') or {}).get('value'),
+                (event.get('period') or {}).get('value'), event.get('minute'), event.get('second'),
+                event.get('expandedMinute'), event.get('x'), event.get('y'), event.get('endX'), event.get('endY'),
+                json.dumps(event, ensure_ascii=False, separators=(',', ':')),
+            ))
+
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM events WHERE match_id = ?", (match_id,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO matches VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (match_id, match_centre.get("startTime"), home.get("teamId"), home.get("name"),
+                 away.get("teamId"), away.get("name"), match_centre.get("statusCode"), time.time()))
+            self._conn.executemany("INSERT OR IGNORE INTO event_types VALUES (?, ?)", event_types.items())
+            self._conn.executemany(f"INSERT INTO events VALUES ({', '.join('?' * 16)})", rows)
+        return len(rows)
+
+    def has_match(self, match_id):
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM matches WHERE match_id = ?", (int(match_id),)).fetchone()
+        return row is not None
+
+    # ---------- Requêtes ----------
+    def recent_matches(self, team_id=None, limit=10):
+        """IDs des derniers matchs (par date de début), éventuellement ceux d'une équipe."""
+        sql = "SELECT match_id FROM matches"
+        params = []
+        if team_id is not None:
+            sql += " WHERE home_team_id = ? OR away_team_id = ?"
+            params += [team_id, team_id]
+        sql += " ORDER BY start_time DESC LIMIT ?"
+        with self._lock:
+            return [row[0] for row in self._conn.execute(sql, params + [limit])]
+
+    def type_codes(self, type_names):
+        """Codes Opta des types d'événements nommés (noms inconnus ignorés)."""
+        names = [type_names] if isinstance(type_names, str) else list(type_names)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT code FROM event_types WHERE name IN ({', '.join('?' * len(names))})", names).fetchall()
+        return [row[0] for row in rows]
+
+    def _where(self, match_ids=None, player_ids=None, team_ids=None, types=None, minutes=None):
+        """Clause WHERE (et paramètres) des filtres communs à query et events."""
+        clauses, params = [], []
+        for column, values in (("match_id", match_ids), ("player_id", player_ids), ("team_id", team_ids)):
+            if values is not None:
+                values = [values] if np.isscalar(values) else list(values)
+                clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params += [int(value) for value in values]
+        if types is not None:
+            types = [types] if isinstance(types, (str, int)) else list(types)
+            codes = [t for t in types if not isinstance(t, str)]
+            codes += self.type_codes([t for t in types if isinstance(t, str)])
+            clauses.append(f"type IN ({', '.join('?' * len(codes))})")
+            params += codes
+        if minutes is not None:
+            start, end = minutes  # Minutes étendues [start, end[
+            clauses.append("expanded_minute >= ? AND expanded_minute < ?")
+            params += [start, end]
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, columns=('matchId', 'playerId', 'teamId', 'type', 'outcome', 'expandedMinute', 'x', 'y', 'endX', 'endY'),
+              match_ids=None, player_ids=None, team_ids=None, types=None, minutes=None):
+        """
+        Colonnes numériques des événements filtrés : {colonne: tableau NumPy},
+        dans l'ordre des matchs puis des événements. Valeurs absentes : NaN
+        (colonnes réelles) ou -1 (colonnes entières), comme dans EventTable.
+        """
+        where, params = self._where(match_ids, player_ids, team_ids, types, minutes)
+        sql_columns = ", ".join(COLUMNS[column][0] for column in columns)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {sql_columns} FROM events{where} ORDER BY match_id, seq", params).fetchall()
+        data = np.array(rows, dtype=float).reshape(len(rows), len(columns))
+        result = {}
+        for i, column in enumerate(columns):
+            dtype = COLUMNS[column][1]
+            values = data[:, i]
+            if dtype is not float:
+                values = np.where(np.isnan(values), -1, values).astype(dtype)
+            result[column] = values
+        return result
+
+    def events(self, match_ids=None, player_ids=None, team_ids=None, types=None, minutes=None):
+        """Événements bruts (dicts WhoScored) filtrés, utilisables tels quels par les visualizers."""
+        where, params = self._where(match_ids, player_ids, team_ids, types, minutes)
+        with self._lock:
+            rows = self._conn.execute(f"SELECT raw FROM events{where} ORDER BY match_id, seq", params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def event_table(self, **filters):
+        """EventTable des événements filtrés (mêmes filtres que events)."""
+        return EventTable(self.events(**filters))
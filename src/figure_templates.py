@@ -0,0 +1,255 @@
+# figure_templates.py
+# Éléments statiques communs à toutes les figures, calculés une fois par
+# processus puis réutilisés : fond dégradé déjà rendu en RGBA (par taille,
+# résolution et couleurs), objets Pitch / VerticalPitch (par paramètres) et
+# vignettes des photos de joueurs à la taille exacte de leur case. Écriture
+# des figures selon le profil de rendu actif (preview / production).
+import os
+import time
+
+import matplotlib.artist as martist
+import matplotlib.pyplot as plt
+import matplotlib.colors as mcolors
+import numpy as np
+from PIL import Image
+
+THUMBNAIL_DIR = "data/photo/thumbs"  # Vignettes RGBA brutes (.npy), par photo et taille en pixels
+
+_backgrounds = {}  # (figsize, dpi, color1, color2) -> tableau RGBA uint8
+_pitches = {}      # (classe, paramètres) -> objet pitch
+_thumbnails = {}   # (photo, largeur, hauteur) -> (mtime de la photo, tableau RGBA uint8)
+_layouts = {}      # (profil, gabarit) -> positions des axes après tight_layout
+
+# Profils de rendu : résolution (None = dpi de la figure), format d'image et
+# options d'encodage Pillow ; fixed_layout réutilise les positions des axes
+# calculées par tight_layout pour la première figure de chaque gabarit.
+RENDER_PROFILES = {
+    'production': {'dpi': None, 'format': 'PNG', 'extension': '.png', 'options': {'compress_level': 6},
+                   'fixed_layout': False},
+    'preview': {'dpi': 50, 'format': 'JPEG', 'extension': '.jpg', 'options': {'quality': 80},
+                'fixed_layout': True},
+}
+DEFAULT_PROFILE = 'production'
+_profile = DEFAULT_PROFILE
+_saved = []        # (chemin, octets, dessin en s, encodage en s) des figures écrites depuis pop_saved
+
+
+def gradient_background(figsize, dpi, color1, color2):
+    """
+    Fond dégradé color1 -> color2 rendu à la taille exacte de la figure (en pixels).
+    Le rendu (imshow rééchantillonné sur toute la figure) n'est fait qu'une fois.
+    """
+    key = (tuple(figsize), dpi, color1, color2)
+    background = _backgrounds.get(key)
+    if background is None:
+        gradient = np.linspace(0, 1, 256).reshape(-1, 1)
+        gradient = np.hstack((gradient, gradient))
+        cmap = mcolors.LinearSegmentedColormap.from_list("", [color1, color2])
+
+        fig = plt.figure(figsize=figsize, dpi=dpi)
+        ax = fig.add_axes([0, 0, 1, 1])
+        ax.axis('off')
+        ax.imshow(gradient, aspect='auto', cmap=cmap, extent=[0, 1, 0, 1])
+        fig.canvas.draw()
+        background = np.asarray(fig.canvas.buffer_rgba()).copy()
+        plt.close(fig)
+        _backgrounds[key] = background
+    return background
+
+
+class BackgroundImage(martist.Artist):
+    """
+    Artiste de fond qui copie directement le tampon RGBA en cache sur le
+    renderer, sans rééchantillonnage. Le tampon est choisi selon la résolution
+    du rendu (savefig à un autre dpi = un autre tampon en cache).
+    """
+
+    def __init__(self, figsize, color1, color2):
+        super().__init__()
+        self.figsize = tuple(figsize)
+        self.color1 = color1
+        self.color2 = color2
+        self.set_zorder(-1)
+
+    def draw(self, renderer):
+        if not self.get_visible():
+            return
+        background = gradient_background(self.figsize, renderer.dpi, self.color1, self.color2)
+        gc = renderer.new_gc()
+        renderer.draw_image(gc, 0, 0, background[::-1])
+        gc.restore()
+        self.stale = False
+
+
+def new_figure(figsize, color1, color2):
+    """
+    Crée une figure avec le fond dégradé (tampon RGBA en cache) et l'axe
+    plein cadre utilisé pour les textes. Retourne (fig, ax).
+    """
+    fig = plt.figure(figsize=figsize)
+    fig.add_artist(BackgroundImage(figsize, color1, color2))
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.axis('off')
+    return fig, ax
+
+
+def get_pitch(pitch_class, **kwargs):
+    """Objet pitch (Pitch, VerticalPitch) partagé pour des paramètres donnés."""
+    key = (pitch_class, tuple(sorted(kwargs.items())))
+    pitch = _pitches.get(key)
+    if pitch is None:
+        pitch = pitch_class(**kwargs)
+        _pitches[key] = pitch
+    return pitch
+
+
+def photo_thumbnail(image_path, width, height):
+    """
+    Photo réduite pour tenir dans width x height pixels (proportions
+    conservées), en RGBA uint8. Le décodage JPEG et le rééchantillonnage
+    n'ont lieu qu'une fois : vignette gardée en mémoire pour le processus et
+    écrite en .npy dans THUMBNAIL_DIR (relue tant que la photo n'a pas changé).
+    """
+    source_mtime = os.stat(image_path).st_mtime_ns
+    key = (image_path, width, height)
+    cached = _thumbnails.get(key)
+    if cached is not None and cached[0] == source_mtime:
+        return cached[1]
+
+    stem = os.path.splitext(os.path.basename(image_path))[0]
+    cache_path = os.path.join(THUMBNAIL_DIR, f"{stem}_{width}x{height}.npy")
+    thumbnail = None
+    if os.path.exists(cache_path) and os.stat(cache_path).st_mtime_ns >= source_mtime:
+        try:
+            thumbnail = np.load(cache_path)
+        except (OSError, ValueError):
+            thumbnail = None
+    if thumbnail is None:
+        with Image.open(image_path) as image:
+            image = image.convert('RGBA')
+            scale = min(width / image.width, height / image.height)
+            size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+            thumbnail = np.asarray(image.resize(size, Image.LANCZOS), dtype=np.uint8)
+        try:
+            os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp.npy"
+            np.save(tmp_path, thumbnail)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"Vignette {cache_path} non écrite ({e}).")
+    _thumbnails[key] = (source_mtime, thumbnail)
+    return thumbnail
+
+
+class PhotoImage(martist.Artist):
+    """
+    Photo de joueur copiée telle quelle sur le renderer dans le cadre de son
+    axe (ancrée à gauche, centrée verticalement), à partir de la vignette en
+    cache à la taille exacte du cadre : ni décodage ni rééchantillonnage par figure.
+    """
+
+    def __init__(self, ax, image_path):
+        super().__init__()
+        self.ax = ax
+        self.image_path = image_path
+
+    def draw(self, renderer):
+        if not self.get_visible():
+            return
+        bbox = self.ax.bbox
+        width, height = int(bbox.width), int(bbox.height)
+        if width < 1 or height < 1:
+            return
+        try:
+            thumbnail = photo_thumbnail(self.image_path, width, height)
+        except (OSError, ValueError) as e:
+            print(f"Photo {self.image_path} illisible ({e}).")
+            return
+        gc = renderer.new_gc()
+        renderer.draw_image(gc, round(bbox.x0), round(bbox.y0 + (height - thumbnail.shape[0]) / 2), thumbnail[::-1])
+        gc.restore()
+        self.stale = False
+
+
+def add_photo(fig, subplot_spec, image_path):
+    """Ajoute la photo image_path dans la case subplot_spec (axe sans graduations) ; retourne l'axe ou None."""
+    if not image_path or not os.path.exists(image_path):
+        return None
+    ax_image = fig.add_subplot(subplot_spec)
+    ax_image.axis('off')
+    ax_image.add_artist(PhotoImage(ax_image, image_path))
+    return ax_image
+
+
+def set_render_profile(name):
+    """Active un profil de RENDER_PROFILES pour les figures suivantes du processus."""
+    global _profile
+    if name not in RENDER_PROFILES:
+        print(f"Profil de rendu inconnu '{name}', utilisation de '{DEFAULT_PROFILE}'.")
+        name = DEFAULT_PROFILE
+    _profile = name
+    return name
+
+
+def render_profile():
+    return _profile
+
+
+def profile_path(save_path, profile=None):
+    """Chemin réellement écrit pour save_path : extension du format du profil."""
+    extension = RENDER_PROFILES[profile or _profile]['extension']
+    root, current = os.path.splitext(save_path)
+    return save_path if current.lower() == extension else root + extension
+
+
+def _apply_layout(fig, layout_key, profile):
+    if not profile['fixed_layout'] or layout_key is None:
+        fig.tight_layout()
+        return
+    key = (_profile, layout_key)
+    positions = _layouts.get(key)
+    if positions is not None and len(positions) == len(fig.axes):
+        for ax, position in zip(fig.axes, positions):
+            ax.set_position(position)
+        return
+    fig.tight_layout()
+    _layouts[key] = [ax.get_position() for ax in fig.axes]
+
+
+def save_figure(fig, save_path, layout_key=None, tight_layout=True):
+    """
+    Mise en page, écriture et fermeture de fig selon le profil actif.
+    layout_key : gabarit de la figure (ex. nom de la méthode) dont la mise en
+    page est réutilisée par les profils à mise en page fixe.
+    Retourne (chemin écrit, octets, temps de dessin en s, temps d'encodage en s).
+    """
+    profile = RENDER_PROFILES[_profile]
+    path = profile_path(save_path)
+    if tight_layout:
+        _apply_layout(fig, layout_key, profile)
+    if profile['dpi']:
+        fig.set_dpi(profile['dpi'])
+
+    start = time.perf_counter()
+    fig.canvas.draw()
+    pixels = np.asarray(fig.canvas.buffer_rgba())
+    drawn = time.perf_counter()
+    image = Image.fromarray(pixels, 'RGBA')
+    if profile['format'] == 'JPEG':
+        image = image.convert('RGB')
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    image.save(tmp_path, format=profile['format'], **profile['options'])
+    os.replace(tmp_path, path)
+    encoded = time.perf_counter()
+    plt.close(fig)
+
+    saved = (path, os.path.getsize(path), drawn - start, encoded - drawn)
+    _saved.append(saved)
+    return saved
+
+
+def pop_saved():
+    """Figures écrites par save_figure depuis le dernier appel (puis liste vidée)."""
+    saved = list(_saved)
+    _saved.clear()
+    return saved
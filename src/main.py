@@ -2,135 +2,176 @@
 import sys
 import os
 import traceback
-import json
 import re
-from whoscored_data_extractor import WhoScoredDataExtractor
+from whoscored_data_extractor import WhoScoredDataExtractor, RateLimiter
 from visualizer import MatchVisualizer, SeasonVisualizer, PlayerDuelVisualizer, PlayerDuoVisualizer, TeamPassNetworkVisualizer
+from render_scheduler import RenderScheduler
+from player_data_io import OUTPUT_FORMATS, read_player_data
+from pass_network import PassPairings
+from player_image_downloader import start_photo_prefetch
+from figure_templates import DEFAULT_PROFILE, RENDER_PROFILES, set_render_profile
 
-def run_analysis(url, player_name, poste, nb_passe_d, extractor):
+def _load_player_data(player_data_file):
+    return read_player_data(player_data_file)
+
+def schedule_analysis(url, player_name, poste, nb_passe_d, extractor, scheduler, extracted=None, season_files=None):
     """
-    La logique d'analyse et de visualisation.
+    Extrait les données du joueur et ajoute ses figures au RenderScheduler.
+    extracted : résultat de extractor.extract_players_stats_and_events (extraction
+    groupée d'un match) ; le joueur y est repris sans nouvelle extraction.
+    season_files : agrégats d'autres saisons cumulés avec la saison extraite
+    (figures multi-saison / carrière à la place des figures de saison).
+    Retourne True si des figures ont été planifiées.
     """
     is_aggregate = "/players/" in url
+    player_slug = player_name.replace(" ", "_")
     
     if is_aggregate:
         print("Analyse de données agrégées (saison)...")
-        player_folder = os.path.join('./viz_data/aggregated/', player_name.replace(" ", "_"))
-        match_name = "season_summary"
+        player_folder = os.path.join('./viz_data/aggregated/', player_slug)
+        match_name = "career_summary" if season_files else "season_summary"
         if not os.path.exists(player_folder): os.makedirs(player_folder)
         match_folder = os.path.join(player_folder, match_name)
         if not os.path.exists(match_folder): os.makedirs(match_folder)
         
         player_data_file = extractor.extract_player_aggregate_stats(player_name, player_folder)
+        season_label = "Saison 2024/2025"
+        if player_data_file and season_files:
+            player_data_file = extractor.extract_player_career_stats(player_name, [player_data_file] + season_files, player_folder)
+            season_label = f"Cumul de {len(season_files) + 1} saisons"
 
         if not player_data_file:
             print(f"Impossible de générer le fichier de données pour {player_name}.")
-            return
+            return False
 
-        visualizer = SeasonVisualizer(player_data_file, None, "#000000", "#5a5403", "Saison 2024/2025","(WhoScored)")
-        
-        # Génération des 3 visualisations de saison
-        save_path_events = os.path.join(match_folder, f'{player_name.replace(" ", "_")}_season_events_{poste}.png')
-        save_path_progressive = os.path.join(match_folder, f'{player_name.replace(" ", "_")}_season_progressive_{poste}.png')
-        save_path_dominance = os.path.join(match_folder, f'{player_name.replace(" ", "_")}_season_dominance_{poste}.png')
-        
-        print("📊 Génération des 3 visualisations de saison...")
-        visualizer.plot_passes_heatmap_and_bar_charts(save_path_events, poste, nb_passe_d)
-        print(f"✅ 1/3 Événements réussis")
-        
-        visualizer.plot_progressive_actions(save_path_progressive)
-        print(f"✅ 2/3 Actions progressives")
+        # Données non chargées ici : chaque worker ouvre les colonnes memmap du fichier
+        scheduler.add_player(player_name, 'season', None,
+                             (player_data_file, None, "#000000", "#5a5403", season_label, "(WhoScored)"))
         
-        visualizer.plot_zone_dominance(save_path_dominance)
-        print(f"✅ 3/3 Dominance terrain")
+        # Les 3 visualisations de saison
+        save_path_events = os.path.join(match_folder, f'{player_slug}_season_events_{poste}.png')
+        save_path_progressive = os.path.join(match_folder, f'{player_slug}_season_progressive_{poste}.png')
+        save_path_dominance = os.path.join(match_folder, f'{player_slug}_season_dominance_{poste}.png')
         
-        print(f"Visualisations de saison générées dans : {match_folder}")
-            
+        scheduler.add_figure(player_name, "Événements réussis", 'plot_passes_heatmap_and_bar_charts', save_path_events, poste, nb_passe_d)
+        scheduler.add_figure(player_name, "Actions progressives", 'plot_progressive_actions', save_path_progressive)
+        scheduler.add_figure(player_name, "Dominance terrain", 'plot_zone_dominance', save_path_dominance)
+        print(f"📊 3 visualisations de saison planifiées dans : {match_folder}")
+        return True
+
+    # Logique pour un match unique
+    print("Analyse de match unique...")
+    
+    if extracted is not None:
+        player_data_file, player_data = extracted.get(player_name, (None, None))
     else:
-        # Logique pour un match unique
-        print("Analyse de match unique...")
-        
         player_data_file = extractor.extract_player_stats_and_events(player_name, "player_data")
+        player_data = _load_player_data(player_data_file) if player_data_file else None
+    
+    if not player_data_file:
+        print(f"Impossible de générer le fichier de données pour {player_name}.")
+        return False
+
+    match = re.search(r"/matches/(\d+)/", url, re.IGNORECASE)
+    if match:
+        match_id = match.group(1)
+        match_name = f"match_{match_id}"
+    else:
+        match_name = "match_unknown"
+
+    player_folder = os.path.join('./viz_data/', player_slug)
+    if not os.path.exists(player_folder): os.makedirs(player_folder)
+    match_folder = os.path.join(player_folder, match_name)
+    if not os.path.exists(match_folder): os.makedirs(match_folder)
+
+    try:
+        competition, color1, color2 = extractor.get_competition_and_colors()
+        match_teams = extractor.extract_match_teams()
+        match_name_comp = extractor.get_competition_from_filename()
+        print(f"✅ Infos extraites : {competition}, {match_teams}, {color1}, {color2}")
         
-        if not player_data_file:
-            print(f"Impossible de générer le fichier de données pour {player_name}.")
-            return
+    except Exception as comp_e:
+        print(f"⚠️ Erreur lors de l'extraction des infos de compétition : {comp_e}")
+        competition = "Unknown Competition"
+        color1, color2 = "#000000", "#333333"
+        match_teams = "Team vs Team"
+        match_name_comp = "Unknown Match"
 
-        match = re.search(r"/matches/(\d+)/", url, re.IGNORECASE)
-        if match:
-            match_id = match.group(1)
-            match_name = f"match_{match_id}"
-        else:
-            match_name = "match_unknown"
+    scheduler.add_player(player_name, 'match', player_data,
+                         (player_data_file, competition, color1, color2, match_name_comp, match_teams))
 
-        player_folder = os.path.join('./viz_data/', player_name.replace(" ", "_"))
-        if not os.path.exists(player_folder): os.makedirs(player_folder)
-        match_folder = os.path.join(player_folder, match_name)
-        if not os.path.exists(match_folder): os.makedirs(match_folder)
+    # Les 7 visualisations de match
+    base_name = f'{player_slug}_match'
+    figures = [
+        ("Heatmap + passes", 'plot_passes_heatmap_and_bar_charts', 'heatmap', (poste, nb_passe_d)),
+        ("Classification passes", 'plot_passes_and_bar_charts', 'passes', ()),
+        ("Activité défensive", 'plot_defensive_activity', 'defensive', ()),
+        ("Activité offensive", 'plot_offensive_activity', 'offensive', ()),
+        ("Actions progressives", 'plot_progressive_actions', 'progressive', ()),
+        ("Dominance zones", 'plot_zone_dominance', 'dominance', ()),
+        ("Connexions de passes", 'plot_player_pass_connections', 'connections', ()),
+    ]
+    for label, method, suffix, extra_args in figures:
+        save_path = os.path.join(match_folder, f'{base_name}_{suffix}_{poste}.png')
+        scheduler.add_figure(player_name, label, method, save_path, *extra_args)
+    print(f"📊 7 visualisations de match planifiées dans : {match_folder}")
+    return True
 
-        try:
-            competition, color1, color2 = extractor.get_competition_and_colors()
-            match_teams = extractor.extract_match_teams()
-            match_name_comp = extractor.get_competition_from_filename()
-            print(f"✅ Infos extraites : {competition}, {match_teams}, {color1}, {color2}")
-            
-        except Exception as comp_e:
-            print(f"⚠️ Erreur lors de l'extraction des infos de compétition : {comp_e}")
-            competition = "Unknown Competition"
-            color1, color2 = "#000000", "#333333"
-            match_teams = "Team vs Team"
-            match_name_comp = "Unknown Match"
+def run_analysis(url, player_name, poste, nb_passe_d, extractor, scheduler=None):
+    """
+    La logique d'analyse et de visualisation pour un joueur.
+    """
+    scheduler = scheduler or RenderScheduler()
+    if schedule_analysis(url, player_name, poste, nb_passe_d, extractor, scheduler):
+        scheduler.run()
 
-        # Initialisation du visualizer de match
-        try:
-            visualizer = MatchVisualizer(player_data_file, competition, color1, color2, match_name_comp, match_teams)
+def ask_render_profile():
+    """Profil de rendu choisi (preview : brouillons rapides et légers ; production : images finales)."""
+    profile_input = input(f"Profil de rendu ({', '.join(RENDER_PROFILES)} ; laisser vide pour {DEFAULT_PROFILE}) : ").strip().lower()
+    return profile_input if profile_input in RENDER_PROFILES else DEFAULT_PROFILE
 
-            # Définir les 7 chemins de sauvegarde pour les 7 visualisations
-            base_name = f'{player_name.replace(" ", "_")}_match'
-            save_path_heatmap = os.path.join(match_folder, f'{base_name}_heatmap_{poste}.png')
-            save_path_passes = os.path.join(match_folder, f'{base_name}_passes_{poste}.png')
-            save_path_defensive = os.path.join(match_folder, f'{base_name}_defensive_{poste}.png')
-            save_path_offensive = os.path.join(match_folder, f'{base_name}_offensive_{poste}.png')
-            save_path_progressive = os.path.join(match_folder, f'{base_name}_progressive_{poste}.png')
-            save_path_dominance = os.path.join(match_folder, f'{base_name}_dominance_{poste}.png')
-            save_path_connections = os.path.join(match_folder, f'{base_name}_connections_{poste}.png')
+def run_team_networks(url, extractor, competition, color1, color2):
+    """
+    Réseaux de passes des deux équipes du match (viz_data/networks/), calculés
+    sur un seul appariement des passes. Fenêtre par défaut : avant le premier
+    remplacement de chaque équipe.
+    """
+    match_data = extractor.get_full_match_data()
+    match_centre = (match_data or {}).get("matchCentreData")
+    if not match_centre:
+        print("Impossible de récupérer les données complètes du match.")
+        return
 
-            print("📊 Génération des 7 visualisations de match...")
-            
-            # 1. Heatmap + passes
-            visualizer.plot_passes_heatmap_and_bar_charts(save_path_heatmap, poste, nb_passe_d)
-            print(f"✅ 1/7 Heatmap + passes")
-            
-            # 2. Classification des passes
-            visualizer.plot_passes_and_bar_charts(save_path_passes)
-            print(f"✅ 2/7 Classification passes")
-            
-            # 3. Activité défensive
-            visualizer.plot_defensive_activity(save_path_defensive)
-            print(f"✅ 3/7 Activité défensive")
-            
-            # 4. Activité offensive
-            visualizer.plot_offensive_activity(save_path_offensive)
-            print(f"✅ 4/7 Activité offensive")
-            
-            # 5. Actions progressives
-            visualizer.plot_progressive_actions(save_path_progressive)
-            print(f"✅ 5/7 Actions progressives")
-            
-            # 6. Dominance zones
-            visualizer.plot_zone_dominance(save_path_dominance)
-            print(f"✅ 6/7 Dominance zones")
-            
-            # 7. Connexions de passes
-            save_path_connections = os.path.join(match_folder, f'{base_name}_connections_{poste}.png')
-            visualizer.plot_player_pass_connections(save_path_connections)
-            print(f"✅ 7/7 Connexions de passes")
-            
-        except Exception as viz_e:
-            print(f"\n❌ ERREUR lors de la génération des visualisations:")
-            print(f"   Type d'erreur: {type(viz_e).__name__}")
-            print(f"   Message: {str(viz_e)}")
-            print(f"\n📋 STACK TRACE:")
+    window_input = input("Fenêtre de minutes (ex. 0-45 ; laisser vide pour avant le 1er remplacement) : ").strip()
+    start, end = 0, None
+    window = re.fullmatch(r"(\d+)\s*-\s*(\d+)", window_input)
+    if window:
+        start, end = int(window.group(1)), int(window.group(2))
+    elif window_input:
+        print("Fenêtre invalide, utilisation de la période avant le 1er remplacement.")
+    min_passes_input = input("Nombre minimal de passes par lien (laisser vide pour 3) : ").strip()
+    min_passes = int(min_passes_input) if min_passes_input.isdigit() else 3
+    set_render_profile(ask_render_profile())
+
+    match = re.search(r"/matches/(\d+)/", url, re.IGNORECASE)
+    match_name = f"match_{match.group(1)}" if match else "match_unknown"
+    networks_folder = os.path.join('./viz_data/networks/', match_name)
+    if not os.path.exists(networks_folder): os.makedirs(networks_folder)
+
+    pairings = PassPairings.from_events(match_centre.get("events", []))
+    for side in ("home", "away"):
+        team_name = match_centre.get(side, {}).get("name")
+        if not team_name:
+            continue
+        save_path = os.path.join(networks_folder, f"{team_name.replace(' ', '_')}_pass_network.png")
+        try:
+            visualizer = TeamPassNetworkVisualizer(match_data, team_name, competition, color1, color2, pairings)
+            saved = visualizer.plot_pass_network(save_path, start, end, min_passes)
+            if saved:
+                path, size, _, encode_time = saved
+                print(f"✅ Réseau de passes {team_name} : {path} ({size / 1024:.0f} Ko, encodage {encode_time * 1000:.0f} ms)")
+        except Exception as e:
+            print(f"❌ Erreur lors du réseau de passes de {team_name}: {str(e)}")
             traceback.print_exc()
 
 def display_player_list(player_list):
@@ -231,14 +272,26 @@ def interactive_main():
     # 2. Traitement selon le mode
     if mode == "1":
         # === MODE 1: ANALYSE INDIVIDUELLE (EXISTANT) ===
+        season_files = None
         if "/players/" in url:
             print("URL de saison détectée. L'analyse agrégée nécessite le nom du joueur.")
             player_names = [input("Nom du joueur pour l'analyse de saison : ")]
+            pool_size_input = input("Nombre de navigateurs en parallèle (laisser vide pour 1) : ").strip()
+            extractor.pool_size = int(pool_size_input) if pool_size_input.isdigit() and int(pool_size_input) > 0 else 1
+            interval_input = input("Délai minimal entre deux pages, en secondes (laisser vide pour 1) : ").strip()
+            try:
+                extractor.rate_limiter = RateLimiter(float(interval_input) if interval_input else 1.0)
+            except ValueError:
+                extractor.rate_limiter = RateLimiter(1.0)
+            seasons_input = input("Agrégats d'autres saisons à cumuler (chemins séparés par des virgules ; laisser vide pour aucun) : ").strip()
+            season_files = [path.strip() for path in seasons_input.split(",") if path.strip()]
         else:
             player_list = extractor.get_player_list()
             if not player_list:
                 print("Impossible de récupérer la liste des joueurs. Vérifiez l'URL.")
                 return
+            # Photos de tout l'effectif téléchargées en arrière-plan pendant l'extraction
+            start_photo_prefetch(extractor.get_player_ids())
             display_player_list(player_list)
             player_names = get_player_choice(player_list)
             print(f"✅ Joueur(s) choisi(s) : {', '.join(player_names)}")
@@ -254,6 +307,21 @@ def interactive_main():
         except ValueError:
             nb_passe_d = 0
         
+        workers_input = input("Nombre de processus de rendu (laisser vide pour tous les cœurs) : ").strip()
+        force_input = input("Re-rendre aussi les figures inchangées ? (o/N) : ").strip().lower()
+        profile = ask_render_profile()
+        scheduler = RenderScheduler(int(workers_input) if workers_input.isdigit() and int(workers_input) > 0 else None,
+                                    use_cache=force_input not in ("o", "oui", "y", "yes"), profile=profile)
+
+        format_input = input(f"Format des fichiers joueur ({', '.join(OUTPUT_FORMATS)} ; laisser vide pour json) : ").strip().lower()
+        extractor.output_format = format_input if format_input in OUTPUT_FORMATS else "json"
+
+        # Match : fiches de tous les joueurs choisis construites en une passe
+        extracted = None
+        if "/players/" not in url and len(player_names) > 1:
+            extracted = extractor.extract_players_stats_and_events(player_names, "player_data")
+
+        # Extraction joueur par joueur, puis rendu de toutes les figures (joueurs x figures) en parallèle
         total_players = len(player_names)
         for idx, player_name in enumerate(player_names, 1):
             print(f"\n{'='*60}")
@@ -261,24 +329,37 @@ def interactive_main():
             print(f"{'='*60}")
             
             try:
-                run_analysis(url, player_name, poste, nb_passe_d, extractor)
-                print(f"✅ Analyse terminée pour {player_name}")
+                if schedule_analysis(url, player_name, poste, nb_passe_d, extractor, scheduler, extracted, season_files):
+                    print(f"✅ Données prêtes pour {player_name}")
             except Exception as e:
                 print(f"❌ Erreur lors de l'analyse de {player_name}: {str(e)}")
                 traceback.print_exc()
+
+        print(f"\n{'='*60}")
+        print(f"🖼️ GÉNÉRATION DES VISUALISATIONS")
+        print(f"{'='*60}")
+        try:
+            scheduler.run()
+            scheduler.print_report()
+        except Exception as e:
+            print(f"❌ Erreur lors du rendu des visualisations: {str(e)}")
+            traceback.print_exc()
         
         print(f"\n{'='*60}")
         print(f"🎉 TOUTES LES ANALYSES TERMINÉES ({total_players} joueur(s))")
         print(f"{'='*60}")
     
-    elif mode in ["2", "3", "4"]:
-        # === MODES 2, 3, 4: NON IMPLÉMENTÉS ===
+    elif mode == "4":
+        # === MODE 4: RÉSEAU DE PASSES DES DEUX ÉQUIPES ===
+        run_team_networks(url, extractor, competition, color1, color2)
+
+    elif mode in ["2", "3"]:
+        # === MODES 2, 3: NON IMPLÉMENTÉS ===
         print(f"\n⚠️ MODE {mode} NON IMPLÉMENTÉ")
         print("Les visualiseurs suivants sont actuellement en stub:")
         print("  - Mode 2: PlayerDuelVisualizer (Duel 1v1)")
         print("  - Mode 3: PlayerDuoVisualizer (Duo)")
-        print("  - Mode 4: TeamPassNetworkVisualizer (Réseau d'équipe)")
-        print("\nVeuillez utiliser le Mode 1 pour l'analyse individuelle.")
+        print("\nVeuillez utiliser le Mode 1 (analyse individuelle) ou le Mode 4 (réseau d'équipe).")
     
     else:
         print("❌ Mode invalide. Veuillez choisir entre 1 et 4.")
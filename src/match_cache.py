@@ -0,0 +1,126 @@
+# match_cache.py
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+# statusCode WhoScored d'un match terminé (elapsed == 'FIN')
+FINISHED_STATUS_CODES = {6}
+
+
+class MatchCache:
+    """
+    Stockage local des données brutes de match WhoScored (JSON compressé),
+    indexé par l'ID de match présent dans l'URL (/matches/<id>/).
+    Un match terminé est servi indéfiniment depuis le disque ; un match
+    en cours n'est réutilisé que pendant live_ttl secondes.
+    """
+
+    def __init__(self, cache_dir="data/match_cache", live_ttl=300):
+        self.cache_dir = cache_dir
+        self.live_ttl = live_ttl
+
+    @staticmethod
+    def match_id_from_url(url):
+        """Extrait l'ID du match d'une URL WhoScored (None si absent)."""
+        if not url:
+            return None
+        match = re.search(r"/matches/(\d+)/", url, re.IGNORECASE)
+        return match.group(1) if match else None
+
+    @staticmethod
+    def is_finished(data):
+        """Indique si les données correspondent à un match terminé."""
+        match_centre = (data or {}).get("matchCentreData") or {}
+        return (match_centre.get("statusCode") in FINISHED_STATUS_CODES
+                or match_centre.get("elapsed") == "FIN")
+
+    def _path(self, match_id):
+        return os.path.join(self.cache_dir, f"{match_id}.json.gz")
+
+    def _read_entry(self, match_id):
+        path = self._path(match_id)
+        if not os.path.exists(path):
+            return None
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Entrée de cache illisible pour le match {match_id} ({e}), elle sera ignorée.")
+            return None
+
+    def get(self, match_id):
+        """Retourne les données du match si elles sont en cache et encore valides, sinon None."""
+        if match_id is None:
+            return None
+        entry = self._read_entry(match_id)
+        if not entry:
+            return None
+
+        if entry.get("finished"):
+            return entry.get("data")
+
+        age = time.time() - entry.get("fetched_at", 0)
+        if age < self.live_ttl:
+            return entry.get("data")
+        return None
+
+    def put(self, match_id, data):
+        """Enregistre les données brutes d'un match (écriture atomique)."""
+        if match_id is None or not data:
+            return None
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        match_centre = data.get("matchCentreData") or {}
+        entry_header = {
+            "matchId": match_id,
+            "fetched_at": time.time(),
+            "status_code": match_centre.get("statusCode"),
+            "finished": self.is_finished(data),
+            "sha256": hashlib.sha256(payload.encode('utf-8')).hexdigest(),
+        }
+        # L'enveloppe est écrite à la main pour ne pas re-sérialiser le payload
+        header_txt = json.dumps(entry_header, ensure_ascii=False)[:-1]
+
+        return self._write_atomic(self._path(match_id), (header_txt, ', "data": ', payload, '}'))
+
+    @staticmethod
+    def _write_atomic(path, chunks):
+        """Écrit les morceaux de texte dans un fichier gzip temporaire puis le renomme."""
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp_path, path)
+        return path
+
+    # ---------- Agrégats partiels par match (voir season_aggregator) ----------
+    def _partials_path(self, match_id):
+        return os.path.join(self.cache_dir, f"{match_id}.partials.json.gz")
+
+    def get_partials(self, match_id):
+        """Agrégats partiels {playerId: fiche} d'un match terminé, ou None s'ils ne sont pas en cache."""
+        if match_id is None:
+            return None
+        path = self._partials_path(match_id)
+        if not os.path.exists(path):
+            return None
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return json.load(f).get("players")
+        except (OSError, ValueError) as e:
+            print(f"Agrégats partiels illisibles pour le match {match_id} ({e}), ils seront recalculés.")
+            return None
+
+    def put_partials(self, match_id, partials):
+        """Enregistre les agrégats partiels d'un match à côté de ses données brutes."""
+        if match_id is None or partials is None:
+            return None
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry = {"matchId": match_id, "computed_at": time.time(), "players": partials}
+        return self._write_atomic(self._partials_path(match_id),
+                                  (json.dumps(entry, ensure_ascii=False, separators=(',', ':')),))
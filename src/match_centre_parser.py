@@ -0,0 +1,148 @@
+# match_centre_parser.py
+# Lecture en une passe de require.config.params["args"] : les clés JS non quotées
+# sont lues une à une et chaque valeur est décodée en place (raw_decode), sans
+# copie de la page. On peut ne décoder que certaines sections.
+import json
+import re
+from json.decoder import scanstring
+
+ARGS_PATTERN = re.compile(r'require\.config\.params\["args"\]\s*=\s*')
+_WS = re.compile(r'\s*')
+_KEY = re.compile(r'(?:"((?:[^"\\]|\\.)*)"|([A-Za-z_$][\w$]*))\s*:\s*')
+_STRUCTURAL = re.compile(r'[{}\[\]"]')
+_SCALAR = re.compile(r'[^,}\]\s]*')
+
+_decoder = json.JSONDecoder()
+
+# Sections nécessaires à WhoScoredDataExtractor.get_player_list
+PLAYER_LIST_SECTIONS = (
+    'matchId',
+    'matchCentreData.playerIdNameDictionary',
+    'matchCentreData.home',
+    'matchCentreData.away',
+)
+
+
+class MatchArgsParseError(ValueError):
+    """Levée quand l'objet args est absent ou mal formé."""
+
+
+def _sections_tree(sections):
+    """('a', 'b.c', 'b.d') -> {'a': None, 'b': {'c': None, 'd': None}} ; None = tout décoder."""
+    if sections is None:
+        return None
+    tree = {}
+    for path in sections:
+        node = tree
+        parts = path.split('.')
+        for part in parts[:-1]:
+            child = node.get(part, {})
+            if child is None:  # Section parente déjà demandée en entier
+                break
+            node = node.setdefault(part, child)
+        else:
+            node[parts[-1]] = None
+    return tree
+
+
+def _skip_ws(text, pos):
+    return _WS.match(text, pos).end()
+
+
+def _skip_value(text, pos):
+    """Avance après la valeur JSON qui commence à pos, sans la construire."""
+    char = text[pos]
+    if char == '"':
+        return scanstring(text, pos + 1)[1]
+    if char not in '{[':
+        return _SCALAR.match(text, pos).end()
+
+    depth = 0
+    search = _STRUCTURAL.search
+    while True:
+        match = search(text, pos)
+        if match is None:
+            raise MatchArgsParseError("Fin de page atteinte dans une valeur non terminée")
+        char = match.group()
+        pos = match.end()
+        if char == '"':
+            pos = scanstring(text, pos)[1]
+        elif char in '{[':
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return pos
+
+
+def _parse_object(text, pos, wanted, can_stop=True):
+    """
+    Décode l'objet qui commence à pos (clés JS ou JSON). wanted est l'arbre
+    des sections à garder (None = tout). Retourne (dict, position de fin).
+    can_stop : l'objet peut s'arrêter dès que ses sections sont lues (la
+    position retournée n'est alors plus fiable). Vrai pour l'objet args, et
+    pour un objet imbriqué seulement s'il est la dernière section attendue
+    de parents eux-mêmes arrêtables ; sinon l'objet est lu jusqu'à son '}'
+    pour que le parent reprenne juste après.
+    """
+    result = {}
+    remaining = None if wanted is None else set(wanted)
+    pos = _skip_ws(text, pos + 1)
+
+    while text[pos] != '}':
+        key_match = _KEY.match(text, pos)
+        if not key_match:
+            raise MatchArgsParseError(f"Clé attendue à la position {pos}")
+        key = key_match.group(1)
+        if key is None:
+            key = key_match.group(2)
+        elif '\\' in key:
+            key = json.loads(f'"{key}"')
+        pos = key_match.end()
+
+        if wanted is None or key in wanted:
+            sub_wanted = None if wanted is None else wanted[key]
+            if sub_wanted is not None and text[pos] == '{':
+                last_section = can_stop and remaining == {key}
+                result[key], pos = _parse_object(text, pos, sub_wanted, last_section)
+            else:
+                result[key], pos = _decoder.raw_decode(text, pos)
+            if remaining is not None:
+                remaining.discard(key)
+                if not remaining:
+                    if can_stop:
+                        # Tout ce qui était demandé est lu : inutile de parcourir la suite
+                        return result, pos
+                    # Le parent attend d'autres clés : les clés restantes sont sautées jusqu'à la fin de l'objet
+                    wanted = {}
+        else:
+            pos = _skip_value(text, pos)
+
+        pos = _skip_ws(text, pos)
+        if text[pos] == ',':
+            pos = _skip_ws(text, pos + 1)
+        elif text[pos] != '}':
+            raise MatchArgsParseError(f"',' ou '}}' attendu à la position {pos}")
+
+    return result, pos + 1
+
+
+def parse_match_args(html, sections=None):
+    """
+    Retourne le dict require.config.params["args"] d'une page de match.
+    sections : chemins pointés à décoder (ex. PLAYER_LIST_SECTIONS), None pour tout.
+    Lève MatchArgsParseError si l'objet est introuvable ou invalide.
+    """
+    marker = ARGS_PATTERN.search(html)
+    if not marker:
+        raise MatchArgsParseError("require.config.params[\"args\"] introuvable dans la page")
+
+    pos = marker.end()
+    if html[pos:pos + 1] != '{':
+        raise MatchArgsParseError(f"Objet attendu après require.config.params[\"args\"] (position {pos})")
+
+    try:
+        data, _ = _parse_object(html, pos, _sections_tree(sections))
+    except (IndexError, json.JSONDecodeError) as e:
+        raise MatchArgsParseError(f"Objet args invalide : {e}") from e
+    return data
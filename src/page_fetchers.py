@@ -0,0 +1,153 @@
+# page_fetchers.py
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from match_centre_parser import parse_match_args, MatchArgsParseError
+
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/85.0.4183.121 Safari/537.36')
+
+# Marqueurs des pages anti-bot (Incapsula / Cloudflare) renvoyées à la place du match
+CHALLENGE_MARKERS = (
+    '_Incapsula_Resource',
+    'Incapsula incident',
+    'cf-challenge',
+    'cf-browser-verification',
+    'Just a moment...',
+    'Request unsuccessful',
+)
+# Refus explicites (403 Forbidden / 429 Too Many Requests) : le backend HTTP
+# n'est abandonné qu'après REFUSALS_BEFORE_BLOCK refus consécutifs
+REFUSAL_STATUS_CODES = {403, 429}
+REFUSALS_BEFORE_BLOCK = 2
+
+
+def is_challenge_page(html):
+    """Détecte une page de challenge anti-bot (marqueurs Incapsula / Cloudflare)."""
+    if not html:
+        return False
+    head = html[:20000]
+    return any(marker in head for marker in CHALLENGE_MARKERS)
+
+
+def parse_match_page(html, url="", sections=None):
+    """
+    Extrait l'objet require.config.params["args"] d'une page de match WhoScored.
+    sections : chemins pointés à décoder uniquement (voir match_centre_parser).
+    Retourne le dict Python, ou None si la page ne contient pas les données.
+    """
+    try:
+        data_json = parse_match_args(html, sections)
+    except MatchArgsParseError as e:
+        print(f"Impossible d'extraire les données de {url}: {e}")
+        return None
+    print("Données JSON extraites avec succès.")
+    return data_json
+
+
+class HttpFetcher:
+    """
+    Backend HTTP simple (requests.Session) : connexions keep-alive et cookies
+    partagés entre toutes les pages. Retourne None pour une page en échec
+    (Selenium prend le relais pour cette URL) ; après un challenge ou des refus
+    répétés, blocked passe à True et le backend HTTP n'est plus sollicité.
+    """
+
+    def __init__(self, timeout=20, pool_maxsize=10, session=None):
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'fr-FR,fr;q=0.9,en;q=0.8',
+        })
+        self.blocked = False  # Passe à True après un challenge ou des refus répétés : inutile d'insister
+        self._refusals = 0    # Refus (403 / 429) consécutifs
+        self._lock = threading.Lock()
+
+    def get_html(self, url):
+        """
+        Télécharge une page ; None en cas d'erreur HTTP ou de challenge. Une
+        erreur serveur (5xx) ou une page vide ne concerne que cette URL ; seul
+        un challenge, ou des refus répétés, désactivent le backend HTTP.
+        """
+        if self.blocked:
+            return None
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            print(f"Erreur HTTP pour {url}: {e}")
+            return None
+
+        html = response.text
+        if is_challenge_page(html):
+            print(f"Page de challenge détectée pour {url} (HTTP {response.status_code}), bascule sur Selenium.")
+            with self._lock:
+                self.blocked = True
+            return None
+        if response.status_code in REFUSAL_STATUS_CODES:
+            with self._lock:
+                self._refusals += 1
+                if self._refusals >= REFUSALS_BEFORE_BLOCK:
+                    self.blocked = True
+            print(f"Accès refusé pour {url} (HTTP {response.status_code})"
+                  + (", bascule sur Selenium." if self.blocked else "."))
+            return None
+        if response.status_code != 200:
+            print(f"Réponse HTTP {response.status_code} pour {url}.")
+            return None
+        if not html.strip():
+            print(f"Page vide pour {url}.")
+            return None
+        with self._lock:
+            self._refusals = 0
+        return html
+
+    def fetch_match(self, url, sections=None):
+        """Retourne les données du match (même dict que le backend Selenium) ou None."""
+        print(f"Chargement HTTP de la page WhoScored {url}...")
+        html = self.get_html(url)
+        if html is None:
+            return None
+        return parse_match_page(html, url, sections)
+
+    def close(self):
+        self.session.close()
+
+
+class SeleniumFetcher:
+    """Backend Selenium : charge la page dans un navigateur déjà démarré."""
+
+    def __init__(self, driver, timeout=20):
+        self.driver = driver
+        self.timeout = timeout
+
+    def get_html(self, url, wait_for_id="layout-wrapper"):
+        """Charge la page et attend l'élément wait_for_id ; None en cas de timeout."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
+        self.driver.get(url)
+        try:
+            WebDriverWait(self.driver, self.timeout).until(EC.presence_of_element_located((By.ID, wait_for_id)))
+        except Exception as e:
+            print(f"Erreur d'attente pour {url}: {e}")
+            return None
+
+        print("Récupération du contenu HTML...")
+        return self.driver.page_source
+
+    def fetch_match(self, url, sections=None):
+        """Retourne les données du match ou None."""
+        print(f"Chargement de la page WhoScored {url}...")
+        html = self.get_html(url)
+        if html is None:
+            return None
+        print("Extraction des données de la page...")
+        return parse_match_page(html, url, sections)
@@ -0,0 +1,57 @@
+# pass_classifier.py
+import numpy as np
+
+# Angles (degrés) mesurés par rapport à l'axe du jeu : arctan2(endX - x, endY - y),
+# soit 90° pour une passe plein axe vers le but adverse (convention de la carte des passes)
+FORWARD_ANGLES = (30, 150)
+BACKWARD_ANGLES = (-150, -30)
+PROGRESSIVE_MIN_GAIN = 10      # Gain minimal en x (coordonnées Opta) pour une passe progressive
+ZONE_BOUNDS = (33, 66)         # Limites défensive / médiane / offensive sur l'axe x
+
+ZONE_NONE, ZONE_DEFENSIVE, ZONE_MIDDLE, ZONE_OFFENSIVE = -1, 0, 1, 2
+
+
+def classify_passes(x, y, end_x, end_y, successful,
+                    forward_angles=FORWARD_ANGLES, backward_angles=BACKWARD_ANGLES,
+                    progressive_min_gain=PROGRESSIVE_MIN_GAIN, zone_bounds=ZONE_BOUNDS):
+    """
+    Classe toutes les lignes en un seul appel vectorisé.
+    Les coordonnées absentes valent NaN. Retourne un dict de tableaux :
+    angle, forward / lateral / backward, successful / failed, progressive
+    (masques booléens) et zone (ZONE_DEFENSIVE, ZONE_MIDDLE, ZONE_OFFENSIVE,
+    ou ZONE_NONE sans coordonnée x).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    end_x = np.asarray(end_x, dtype=float)
+    end_y = np.asarray(end_y, dtype=float)
+    successful = np.asarray(successful, dtype=bool)
+
+    has_x = ~np.isnan(x)
+    has_end = has_x & ~np.isnan(y) & ~np.isnan(end_x) & ~np.isnan(end_y)
+
+    with np.errstate(invalid='ignore'):
+        angle = np.degrees(np.arctan2(end_x - x, end_y - y))
+        forward = has_end & (angle >= forward_angles[0]) & (angle <= forward_angles[1])
+        backward = has_end & (angle >= backward_angles[0]) & (angle <= backward_angles[1])
+        lateral = has_end & ~forward & ~backward
+
+        # endX absent : la passe est considérée sans progression
+        gain = np.where(np.isnan(end_x), 0.0, end_x - x)
+        progressive = has_x & (gain >= progressive_min_gain) & successful
+
+        zone = np.full(x.shape, ZONE_NONE, dtype=np.int8)
+        zone[x < zone_bounds[0]] = ZONE_DEFENSIVE
+        zone[(x >= zone_bounds[0]) & (x < zone_bounds[1])] = ZONE_MIDDLE
+        zone[x >= zone_bounds[1]] = ZONE_OFFENSIVE
+
+    return {
+        'angle': angle,
+        'forward': forward,
+        'lateral': lateral,
+        'backward': backward,
+        'successful': successful,
+        'failed': ~successful,
+        'progressive': progressive,
+        'zone': zone,
+    }
@@ -0,0 +1,174 @@
+# pass_network.py
+# Receveurs des passes d'un match, inférés en une passe vectorisée sur TOUS
+# les événements du match (matchCentreData.events) : le receveur d'une passe
+# réussie est l'auteur de la touche suivante de la même équipe, dans l'ordre
+# chronologique (période, expandedMinute, seconde, eventId).
+# La table d'appariement sert aux connexions d'un joueur, aux duos et au
+# réseau de passes d'équipe sans reparcourir les événements.
+import numpy as np
+
+from event_table import EventTable
+
+
+class PassPairings:
+    """
+    Table (struct-of-arrays) des passes réussies d'un match et de leur receveur :
+    row (ligne dans la EventTable du match), passer, receiver (-1 si inconnu),
+    team, x / y (départ), end_x / end_y (arrivée déclarée), receive_x /
+    receive_y (position de la touche du receveur), period, minute (étendue).
+    """
+
+    def __init__(self, table):
+        self.table = table
+
+        # Touches de joueurs dans l'ordre chronologique
+        order = np.lexsort((table.eventId, table.second, table.expandedMinute, table.period))
+        touches = order[np.asarray(table.isTouch)[order] & (table.playerId[order] >= 0) & (table.teamId[order] >= 0)]
+        team = table.teamId[touches]
+
+        # Index (dans touches) de la touche suivante de la même équipe, -1 s'il n'y en a pas
+        next_same_team = np.full(len(touches), -1, dtype=np.intp)
+        for team_id in np.unique(team):
+            positions = np.flatnonzero(team == team_id)
+            next_same_team[positions[:-1]] = positions[1:]
+
+        pass_code = table.type_codes.get('Pass', -2)
+        successful_code = table.outcome_codes.get('Successful', -2)
+        is_pass = (table.type[touches] == pass_code) & (table.outcome[touches] == successful_code)
+        passes = np.flatnonzero(is_pass)
+        following = next_same_team[passes]
+
+        rows = touches[passes]
+        receiver_rows = np.where(following >= 0, touches[np.maximum(following, 0)], -1)
+        found = following >= 0
+        # Même période et joueur différent : sinon receveur inconnu
+        found &= table.period[np.maximum(receiver_rows, 0)] == table.period[rows]
+        found &= table.playerId[np.maximum(receiver_rows, 0)] != table.playerId[rows]
+        receiver_rows = np.where(found, receiver_rows, -1)
+
+        self.row = rows
+        self.receiver_row = receiver_rows
+        self.passer = table.playerId[rows]
+        self.receiver = np.where(found, table.playerId[np.maximum(receiver_rows, 0)], -1)
+        self.team = table.teamId[rows]
+        self.x = table.x[rows]
+        self.y = table.y[rows]
+        self.end_x = table.endX[rows]
+        self.end_y = table.endY[rows]
+        self.receive_x = np.where(found, table.x[np.maximum(receiver_rows, 0)], np.nan)
+        self.receive_y = np.where(found, table.y[np.maximum(receiver_rows, 0)], np.nan)
+        self.period = table.period[rows]
+        self.minute = table.expandedMinute[rows]
+
+    @classmethod
+    def from_events(cls, events):
+        """Appariement à partir de la liste complète des événements du match."""
+        return cls(EventTable(events))
+
+    def __len__(self):
+        return len(self.row)
+
+    def mask(self, passer=None, receiver=None, team=None):
+        """Masque des passes filtrées par passeur, receveur et / ou équipe."""
+        result = self.receiver >= 0
+        if passer is not None:
+            result &= self.passer == passer
+        if receiver is not None:
+            result &= self.receiver == receiver
+        if team is not None:
+            result &= self.team == team
+        return result
+
+    def between(self, player_a, player_b):
+        """Masque des passes échangées entre deux joueurs (dans les deux sens)."""
+        return self.mask(passer=player_a, receiver=player_b) | self.mask(passer=player_b, receiver=player_a)
+
+    def pair_counts(self, mask=None):
+        """
+        Passes par couple (passeur, receveur) pour les lignes du masque :
+        (passeurs, receveurs, nombre de passes, x / y moyens de réception),
+        triés par nombre de passes décroissant.
+        """
+        keep = self.receiver >= 0 if mask is None else mask & (self.receiver >= 0)
+        passers, receivers = self.passer[keep], self.receiver[keep]
+        if len(passers) == 0:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty, np.empty(0), np.empty(0)
+        pairs, inverse, counts = np.unique(np.stack([passers, receivers], axis=1), axis=0,
+                                           return_inverse=True, return_counts=True)
+        inverse = inverse.ravel()
+        mean_x = np.bincount(inverse, weights=self.receive_x[keep]) / counts
+        mean_y = np.bincount(inverse, weights=self.receive_y[keep]) / counts
+        order = np.argsort(-counts, kind='stable')
+        return pairs[order, 0], pairs[order, 1], counts[order], mean_x[order], mean_y[order]
+
+    def connections(self, player_id, names=None, limit=None):
+        """
+        Receveurs des passes réussies de player_id : liste de dicts
+        {playerId, name, count, x, y} (position moyenne de réception), du plus
+        fréquent au moins fréquent. names : dictionnaire playerId (str) -> nom.
+        """
+        _, receivers, counts, mean_x, mean_y = self.pair_counts(self.mask(passer=player_id))
+        connections = []
+        for receiver, count, x, y in zip(receivers[:limit], counts[:limit], mean_x[:limit], mean_y[:limit]):
+            connections.append({
+                "playerId": int(receiver),
+                "name": (names or {}).get(str(int(receiver))),
+                "count": int(count),
+                "x": float(x),
+                "y": float(y),
+            })
+        return connections
+
+    def pass_matrix(self, player_ids, team=None, start=0, end=None):
+        """
+        Matrice (passeur x receveur) du nombre de passes entre les joueurs de
+        player_ids, sur les minutes étendues [start, end[ (group-by vectorisé).
+        """
+        player_ids = np.asarray(player_ids, dtype=np.int64)
+        n = len(player_ids)
+        keep = self.mask(team=team) & (self.minute >= start)
+        if end is not None:
+            keep &= self.minute < end
+        passer = _positions(player_ids, self.passer[keep])
+        receiver = _positions(player_ids, self.receiver[keep])
+        valid = (passer >= 0) & (receiver >= 0)
+        counts = np.bincount(passer[valid] * n + receiver[valid], minlength=n * n)
+        return counts.reshape(n, n)
+
+    def average_positions(self, player_ids, team=None, start=0, end=None):
+        """
+        Position moyenne (x, y) et nombre de touches de chaque joueur de
+        player_ids sur les minutes étendues [start, end[ ; NaN sans touche.
+        """
+        table = self.table
+        player_ids = np.asarray(player_ids, dtype=np.int64)
+        keep = np.asarray(table.isTouch) & table.has_x & (table.expandedMinute >= start)
+        if end is not None:
+            keep &= table.expandedMinute < end
+        if team is not None:
+            keep &= table.teamId == team
+        index = _positions(player_ids, table.playerId[keep])
+        valid = index >= 0
+        index = index[valid]
+        touches = np.bincount(index, minlength=len(player_ids))
+        with np.errstate(invalid='ignore'):
+            mean_x = np.bincount(index, weights=table.x[keep][valid], minlength=len(player_ids)) / touches
+            mean_y = np.bincount(index, weights=table.y[keep][valid], minlength=len(player_ids)) / touches
+        return mean_x, mean_y, touches
+
+    def first_substitution(self, team):
+        """Minute étendue du premier remplacement de l'équipe (None s'il n'y en a pas)."""
+        table = self.table
+        minutes = table.expandedMinute[table.type_mask('SubstitutionOff') & (table.teamId == team)]
+        return int(minutes.min()) if len(minutes) else None
+
+
+def _positions(player_ids, values):
+    """Indice de chaque valeur de values dans player_ids (-1 si absente), par recherche dichotomique."""
+    if len(player_ids) == 0:
+        return np.full(len(values), -1, dtype=np.intp)
+    order = np.argsort(player_ids)
+    sorted_ids = player_ids[order]
+    found = np.minimum(np.searchsorted(sorted_ids, values), len(sorted_ids) - 1)
+    return np.where(sorted_ids[found] == values, order[found], -1)
@@ -0,0 +1,140 @@
+# photo_index.py
+# Index persistant des photos de joueurs (data/photo/photo_index.json) : pour
+# chaque joueur (clé playerId WhoScored, ou nom normalisé à défaut ; une entrée
+# par nom n'est jamais utilisée pour un playerId), le profil
+# Transfermarkt résolu, le fichier image et son empreinte, ou l'absence de
+# photo avec une date de nouvel essai. Un joueur déjà connu, avec ou sans
+# photo, ne déclenche plus aucune requête réseau.
+import json
+import os
+import threading
+import time
+
+from player_index import normalize_name
+
+PHOTO_INDEX_PATH = "data/photo/photo_index.json"
+MISSING_RETRY = 14 * 24 * 3600  # Aucun profil / aucune image : nouvel essai après 14 jours
+ERROR_RETRY = 3600              # Erreur réseau (timeout, HTTP 5xx...) : nouvel essai après 1 heure
+
+
+def _key(player_id, name):
+    return f"id:{player_id}" if player_id is not None else f"name:{normalize_name(name)}"
+
+
+class PhotoIndex:
+    """
+    Entrées {names, player_id, status ('found' / 'missing'), path,
+    profile_url, image_url, sha1, checked_at, retry_after}, retrouvées par
+    playerId ou par n'importe quel nom déjà rencontré (alias normalisés).
+    path : fichier JSON de l'index (None pour un index en mémoire seulement).
+    """
+
+    def __init__(self, path=PHOTO_INDEX_PATH):
+        self.path = path
+        self.entries = {}     # clé -> entrée
+        self.aliases = {}     # nom normalisé -> clé
+        self._changed = set()  # Clés modifiées par ce processus (fusionnées à l'écriture)
+        self._lock = threading.Lock()
+        if path:
+            self.entries = self._read()
+            self._rebuild_aliases()
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f).get("players", {})
+        except (OSError, ValueError) as e:
+            print(f"Index des photos illisible ({e}), il sera reconstruit.")
+            return {}
+
+    def _rebuild_aliases(self):
+        self.aliases = {}
+        for key, entry in self.entries.items():
+            for name in entry.get("names", []):
+                self.aliases[normalize_name(name)] = key
+
+    def lookup(self, player_id=None, name=None):
+        """Entrée du joueur (par playerId, sinon par nom), ou None s'il est inconnu."""
+        with self._lock:
+            if player_id is not None:
+                entry = self.entries.get(_key(player_id, name))
+                if entry is not None:
+                    return entry
+            entry = self.entries.get(self.aliases.get(normalize_name(name)))
+            # Avec un playerId, un alias ne vaut que pour ce même joueur (jamais un homonyme ni une entrée sans ID)
+            if entry is not None and player_id is not None and entry.get("player_id") != str(player_id):
+                return None
+            return entry
+
+    def is_known(self, player_id=None, name=None, now=None):
+        """True si aucune requête réseau n'est nécessaire pour ce joueur."""
+        entry = self.lookup(player_id, name)
+        if entry is None:
+            return False
+        if entry.get("status") == "found":
+            return os.path.exists(entry.get("path") or "")
+        return (now or time.time()) < entry.get("retry_after", 0)
+
+    def _record(self, player_id, name, **fields):
+        player_id = str(player_id) if player_id is not None else None
+        with self._lock:
+            key = _key(player_id, name)
+            entry = self.entries.pop(key, None) or {}
+            entry.update(fields, player_id=player_id or entry.get("player_id"), checked_at=time.time())
+            if name and name not in entry.setdefault("names", []):
+                entry["names"].append(name)
+            self.entries[key] = entry
+            for alias in entry["names"]:
+                self.aliases[normalize_name(alias)] = key
+            self._changed.add(key)
+        self.save()
+        return entry
+
+    def record_found(self, player_id, name, path, profile_url=None, image_url=None, sha1=None):
+        return self._record(player_id, name, status="found", path=path, profile_url=profile_url,
+                            image_url=image_url, sha1=sha1, retry_after=None)
+
+    def record_missing(self, player_id, name, retry_after, profile_url=None):
+        return self._record(player_id, name, status="missing", path=None, profile_url=profile_url,
+                            retry_after=retry_after)
+
+    def save(self):
+        """
+        Écrit l'index (écriture atomique) en fusionnant les entrées modifiées
+        ici avec celles écrites entre-temps par d'autres processus.
+        """
+        if not self.path:
+            return None
+        with self._lock:
+            if not self._changed:
+                return None
+            entries = self._read()
+            for key in self._changed:
+                if key in self.entries:
+                    entries[key] = self.entries[key]
+                else:
+                    entries.pop(key, None)
+            self._changed = set()
+            self.entries = entries
+            self._rebuild_aliases()
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"players": entries}, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        return self.path
+
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+
+def default_photo_index():
+    """Index des photos partagé par tous les scrapers du processus (chargé une fois)."""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = PhotoIndex()
+        return _default_index
@@ -0,0 +1,123 @@
+# player_data_io.py
+# Formats d'écriture des fichiers joueur (player_data/<nom>_<matchId>,
+# <nom>_aggregated) et lecture transparente quel que soit le format présent.
+import gzip
+import json
+import os
+
+try:
+    import zstandard
+except ImportError:  # Dépendance optionnelle : repli sur gzip
+    zstandard = None
+
+from columnar_store import SIDECAR_SUFFIX, open_sidecar, read_events, write_columns, write_sidecar
+
+# Format -> extension du fichier écrit
+OUTPUT_FORMATS = {
+    'json': '.json',          # JSON indenté (format historique)
+    'compact': '.json',       # JSON sans indentation ni espaces
+    'gzip': '.json.gz',
+    'zstd': '.json.zst',
+    'columnar': SIDECAR_SUFFIX,  # Colonnes NumPy + événements bruts compressés
+}
+# Ordre de recherche quand le fichier demandé n'existe pas sous ce nom
+READ_ORDER = (SIDECAR_SUFFIX, '.json.zst', '.json.gz', '.json')
+
+
+def _check_format(output_format):
+    if output_format not in OUTPUT_FORMATS:
+        print(f"Format de sortie inconnu '{output_format}', utilisation de 'json'.")
+        return 'json'
+    if output_format == 'zstd' and zstandard is None:
+        print("Module 'zstandard' absent, utilisation de 'gzip'.")
+        return 'gzip'
+    return output_format
+
+
+def base_path(path):
+    """Chemin sans l'extension d'un format connu (player_data/Vitinha_1911398)."""
+    for extension in READ_ORDER:
+        if path.endswith(extension):
+            return path[:-len(extension)]
+    return path
+
+
+def write_player_data(base, data, output_format='json', sidecar=False):
+    """
+    Écrit la fiche joueur data sous base + extension du format ; retourne le chemin écrit.
+    sidecar : ajoute les colonnes memmap (columnar_store) à côté d'un fichier JSON.
+    """
+    output_format = _check_format(output_format)
+    path = base + OUTPUT_FORMATS[output_format]
+    if output_format == 'columnar':
+        return write_columns(path, data)
+
+    if output_format == 'json':
+        payload = json.dumps(data, ensure_ascii=False, indent=4)
+    else:
+        payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if output_format == 'gzip':
+        with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+            f.write(payload)
+    elif output_format == 'zstd':
+        with open(tmp_path, 'wb') as f:
+            f.write(zstandard.ZstdCompressor(level=9).compress(payload.encode('utf-8')))
+    else:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+    os.replace(tmp_path, path)
+
+    if sidecar:
+        try:
+            write_sidecar(path, data)
+        except OSError as e:
+            print(f"Avertissement: colonnes de {path} non écrites ({e}).")
+    return path
+
+
+def resolve_player_data_path(path):
+    """Fichier joueur existant pour path, sous n'importe quel format (None si aucun)."""
+    if os.path.exists(path):
+        return path
+    base = base_path(path)
+    for extension in READ_ORDER:
+        if os.path.exists(base + extension):
+            return base + extension
+    return None
+
+
+def read_player_data(path):
+    """Lit une fiche joueur complète, quel que soit son format (None si introuvable)."""
+    resolved = resolve_player_data_path(path)
+    if resolved is None:
+        print(f"Fichier joueur introuvable : {path}")
+        return None
+    if resolved.endswith(SIDECAR_SUFFIX):
+        with open(os.path.join(resolved, "meta.json"), 'r', encoding='utf-8') as f:
+            data = json.load(f)["player"]
+        data['events'] = read_events(resolved)
+        return data
+    if resolved.endswith('.gz'):
+        with gzip.open(resolved, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+    if resolved.endswith('.zst'):
+        if zstandard is None:
+            print(f"Module 'zstandard' absent : impossible de lire {resolved}.")
+            return None
+        with open(resolved, 'rb') as f:
+            return json.loads(zstandard.ZstdDecompressor().decompressobj().decompress(f.read()))
+    with open(resolved, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def open_player_table(path):
+    """
+    (fiche joueur sans événements, EventTable memmap) si le fichier a des
+    colonnes à jour (format colonnaire ou compagnon), sinon None.
+    """
+    resolved = resolve_player_data_path(path)
+    if resolved is None:
+        return None
+    return open_sidecar(resolved, read_player_data)
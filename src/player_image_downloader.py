@@ -1,26 +1,97 @@
 # player_image_downloader.py
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
 import requests
 from bs4 import BeautifulSoup
-import os
+from requests.adapters import HTTPAdapter
+
+from photo_index import ERROR_RETRY, MISSING_RETRY, default_photo_index
+
+REQUEST_TIMEOUT = 15      # secondes, par requête (recherche, profil, image)
+HOST_CONCURRENCY = 4      # requêtes simultanées maximum par hôte
+PREFETCH_WORKERS = 8      # joueurs traités en parallèle par le préchargement
+
+_session = None
+_session_lock = threading.Lock()
+_host_slots = {}          # hôte -> Semaphore(HOST_CONCURRENCY)
+_host_slots_lock = threading.Lock()
+_photo_locks = {}         # chemin de la photo -> Lock (un seul téléchargement par joueur)
+_photo_locks_lock = threading.Lock()
+
+
+def shared_session():
+    """Session HTTP keep-alive partagée par tous les scrapers de photos (thread-safe pour des GET)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=max(PREFETCH_WORKERS, HOST_CONCURRENCY))
+            _session.mount('https://', adapter)
+            _session.mount('http://', adapter)
+        return _session
+
+
+@contextmanager
+def _host_slot(url):
+    """Limite le nombre de requêtes simultanées vers l'hôte de url."""
+    host = urlsplit(url).netloc
+    with _host_slots_lock:
+        slot = _host_slots.setdefault(host, threading.Semaphore(HOST_CONCURRENCY))
+    with slot:
+        yield
+
+
+def _photo_lock(path):
+    with _photo_locks_lock:
+        return _photo_locks.setdefault(path, threading.Lock())
+
+
+def photo_file_path(full_name, player_id=None):
+    """
+    Fichier de la photo : propre au playerId quand il est connu (deux
+    homonymes n'ont jamais le même fichier), sinon au nom (ancien format).
+    """
+    slug = full_name.replace(' ', '_')
+    if player_id is not None:
+        return f"data/photo/{slug}_{player_id}_profile_image.jpg"
+    return f"data/photo/{slug}_profile_image.jpg"
+
 
 class PlayerProfileScraper:
-    def __init__(self, full_name):
+    def __init__(self, full_name, session=None, player_id=None, photo_index=None):
         self.full_name = full_name
+        self.player_id = player_id  # playerId WhoScored : clé de l'index des photos
+        self.session = session or shared_session()
+        self.photo_index = photo_index or default_photo_index()
+        self.network_error = False  # Échec réseau (à réessayer bientôt) plutôt qu'absence de photo
+        self.image_sha1 = None
         self.full_name_for_url = full_name.replace(' ', '+')
         self.base_url = f"https://www.transfermarkt.com/schnellsuche/ergebnis/schnellsuche?query={self.full_name_for_url}"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'
         }
-        self.image_save_path = f"data/photo/{self.full_name.replace(' ', '_')}_profile_image.jpg"
+        self.image_save_path = photo_file_path(full_name, player_id)
+
+    def _get(self, url, headers=None):
+        """GET via la session partagée, avec timeout et limite de concurrence par hôte."""
+        with _host_slot(url):
+            return self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
 
     def fetch_search_results(self):
         """Effectue la requête HTTP pour obtenir les résultats de la recherche."""
         try:
-            response = requests.get(self.base_url, headers=self.headers)
+            response = self._get(self.base_url, headers=self.headers)
             response.raise_for_status()  # Lève une exception pour les codes d'erreur HTTP
             return response.text
         except requests.exceptions.RequestException as e:
             print(f"Erreur lors de la requête HTTP: {e}")
+            self.network_error = True
             return None
 
     def parse_profile_url(self, html_content):
@@ -49,7 +120,7 @@ class PlayerProfileScraper:
     def scrape_profile_info(self, profile_url):
         """Scrape l'URL de l'image à partir du profil du joueur."""
         try:
-            response = requests.get(profile_url, headers=self.headers)
+            response = self._get(profile_url, headers=self.headers)
             response.raise_for_status()
             soup = BeautifulSoup(response.text, 'html.parser')
             
@@ -66,40 +137,126 @@ class PlayerProfileScraper:
 
         except requests.exceptions.RequestException as e:
             print(f"Erreur lors de la requête HTTP vers le profil: {e}")
+            self.network_error = True
             return None
 
     def download_image(self, image_url, file_name):
         """Télécharge l'image à partir de l'URL et la sauvegarde localement."""
         try:
-            image_response = requests.get(image_url)
+            image_response = self._get(image_url, headers=self.headers)
             image_response.raise_for_status()
             
             os.makedirs(os.path.dirname(file_name), exist_ok=True)
-            with open(file_name, 'wb') as file:
+            tmp_name = f"{file_name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_name, 'wb') as file:
                 file.write(image_response.content)
+            self.image_sha1 = hashlib.sha1(image_response.content).hexdigest()
+            os.replace(tmp_name, file_name)  # Jamais de photo partielle lue par un rendu
             print(f"Image téléchargée et enregistrée sous: {file_name}")
         except requests.exceptions.RequestException as e:
             print(f"Erreur lors du téléchargement de l'image : {e}")
+            self.network_error = True
+
+    def _known_photo(self):
+        """
+        Résultat connu de l'index sans requête réseau : chemin de la photo,
+        False si le joueur n'a pas de photo (avant la date de nouvel essai),
+        None s'il faut interroger Transfermarkt.
+        """
+        entry = self.photo_index.lookup(self.player_id, self.full_name)
+        if entry is not None and entry.get("status") == "found" and os.path.exists(entry.get("path") or ""):
+            return entry["path"]
+        if entry is not None and entry.get("status") == "missing" and time.time() < entry.get("retry_after", 0):
+            return False
+        # Photo déjà sur disque sans entrée d'index (fichier du playerId, ou du nom faute d'ID) : enregistrée telle quelle
+        if (entry is None or entry.get("status") == "found") and os.path.exists(self.image_save_path):
+            with open(self.image_save_path, 'rb') as f:
+                sha1 = hashlib.sha1(f.read()).hexdigest()
+            self.photo_index.record_found(self.player_id, self.full_name, self.image_save_path, sha1=sha1)
+            return self.image_save_path
+        return None
 
     def save_player_profile(self):
         """Méthode principale pour rechercher et télécharger la photo du joueur."""
-        # Vérifie si l'image existe déjà
-        if os.path.exists(self.image_save_path):
-            print(f"L'image pour {self.full_name} existe déjà. Utilisation du cache.")
-            return self.image_save_path
+        known = self._known_photo()
+        if known is None:
+            # Un préchargement concurrent du même joueur : attendre son résultat plutôt que refaire les requêtes
+            with _photo_lock(self.image_save_path):
+                known = self._known_photo()
+                if known is None:
+                    return self._download_profile()
+        if known is False:
+            print(f"Aucune photo connue pour {self.full_name} (index des photos). Nouvel essai plus tard.")
+            return None
+        print(f"L'image pour {self.full_name} existe déjà. Utilisation du cache.")
+        return known
+
+    def _download_profile(self):
+        """Recherche Transfermarkt (sauf profil déjà connu), page de profil puis image ; résultat indexé."""
+        entry = self.photo_index.lookup(self.player_id, self.full_name) or {}
+        profile_url = entry.get("profile_url")
+        image_url = None
+        if profile_url:
+            print(f"Profil Transfermarkt connu pour {self.full_name}: {profile_url}")
+        else:
+            print(f"Recherche de la photo de profil pour {self.full_name}...")
+            html_content = self.fetch_search_results()
+            if html_content:
+                profile_url = self.parse_profile_url(html_content)
+                if profile_url:
+                    print(f"Profil Transfermarkt trouvé: {profile_url}")
+                else:
+                    print(f"Aucun profil Transfermarkt trouvé pour {self.full_name}.")
+        if profile_url:
+            image_url = self.scrape_profile_info(profile_url)
 
-        print(f"Recherche de la photo de profil pour {self.full_name}...")
-        html_content = self.fetch_search_results()
-        if html_content:
-            profile_url = self.parse_profile_url(html_content)
-            if profile_url:
-                print(f"Profil Transfermarkt trouvé: {profile_url}")
-                self.scrape_profile_info(profile_url)
-            else:
-                print(f"Aucun profil Transfermarkt trouvé pour {self.full_name}.")
-        
         if not os.path.exists(self.image_save_path):
             print(f"AVERTISSEMENT: La photo de {self.full_name} n'a pas pu être téléchargée.")
+            retry = ERROR_RETRY if self.network_error else MISSING_RETRY
+            self.photo_index.record_missing(self.player_id, self.full_name, time.time() + retry, profile_url)
             return None # Retourne None si echec total
-            
-        return self.image_save_path
\ No newline at end of file
+
+        self.photo_index.record_found(self.player_id, self.full_name, self.image_save_path,
+                                      profile_url, image_url, self.image_sha1)
+        return self.image_save_path
+
+def _player_key(player):
+    """(nom, playerId ou None) d'un élément de liste de joueurs : nom seul ou tuple (nom, playerId)."""
+    return (player, None) if isinstance(player, str) else (player[0], player[1])
+
+
+def _fetch_photo(player_name, player_id=None):
+    try:
+        return PlayerProfileScraper(player_name, player_id=player_id).save_player_profile()
+    except Exception as e:
+        print(f"⚠️ Photo indisponible pour {player_name}: {e}")
+        return None
+
+
+def start_photo_prefetch(players, max_workers=PREFETCH_WORKERS):
+    """
+    Lance en arrière-plan la recherche et le téléchargement des photos de
+    players (noms, ou tuples (nom, playerId) ; ex. l'effectif complet de
+    get_player_list), en parallèle sur la session partagée. Les joueurs déjà
+    dans l'index des photos (avec ou sans photo) ne font aucune requête.
+    Retourne {nom: Future du chemin de la photo ou None} ; le scraping du
+    match peut se poursuivre pendant ce temps.
+    """
+    index = default_photo_index()
+    keys = {}
+    for player in players:
+        name, player_id = _player_key(player)
+        if name and name not in keys and not index.is_known(player_id, name):
+            keys[name] = player_id
+    if not keys:
+        return {}
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(keys))), thread_name_prefix="photo")
+    futures = {name: executor.submit(_fetch_photo, name, player_id) for name, player_id in keys.items()}
+    executor.shutdown(wait=False)  # Les threads se terminent d'eux-mêmes une fois la file vidée
+    return futures
+
+
+def prefetch_player_photos(players, max_workers=PREFETCH_WORKERS):
+    """Télécharge en parallèle les photos manquantes ; retourne {nom: chemin ou None} (joueurs interrogés)."""
+    futures = start_photo_prefetch(players, max_workers)
+    return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,137 @@
+# player_index.py
+import json
+import os
+import threading
+import unicodedata
+
+
+def normalize_name(name):
+    """Nom de joueur sans accents ni casse, espaces normalisés ('Luka Modrić' -> 'luka modric')."""
+    decomposed = unicodedata.normalize('NFKD', name or "")
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+class PlayerIndex:
+    """
+    Index persistant des joueurs rencontrés dans les matchs ingérés :
+    playerId <-> nom normalisé (accents et casse ignorés), et pour chaque
+    joueur les matchs joués avec le côté (home / away, None si inconnu).
+    Les recherches par nom ou par match sont des accès dictionnaire.
+    path : fichier JSON de l'index (None pour un index en mémoire seulement).
+    """
+
+    def __init__(self, path="data/match_cache/player_index.json"):
+        self.path = path
+        self.names = {}        # playerId (str) -> nom WhoScored
+        self.ids_by_name = {}  # nom normalisé -> [playerId]
+        self.appearances = {}  # playerId -> {matchId: côté}
+        self.matches = set()   # Matchs déjà indexés
+        self.dirty = False
+        self._lock = threading.Lock()
+        if path:
+            self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Index des joueurs illisible ({e}), il sera reconstruit.")
+            return
+        for player_id, player in data.get("players", {}).items():
+            self._add_name(player_id, player.get("name"))
+            self.appearances[player_id] = dict(player.get("matches", {}))
+        self.matches.update(data.get("matches", []))
+
+    def _add_name(self, player_id, name):
+        """Associe le nom au playerId ; retourne True si l'index a changé."""
+        if not name or self.names.get(player_id) == name:
+            return False
+        self.names[player_id] = name
+        player_ids = self.ids_by_name.setdefault(normalize_name(name), [])
+        if player_id not in player_ids:
+            player_ids.append(player_id)
+        return True
+
+    def add_players(self, match_id, players):
+        """Indexe les joueurs d'un match : players = [(playerId, nom, côté ou None)]."""
+        match_id = str(match_id)
+        with self._lock:
+            changed = match_id not in self.matches
+            for player_id, name, side in players:
+                player_id = str(player_id)
+                changed |= self._add_name(player_id, name)
+                matches = self.appearances.setdefault(player_id, {})
+                if matches.get(match_id) is None and (match_id not in matches or side is not None):
+                    matches[match_id] = side
+                    changed = True
+            self.matches.add(match_id)
+            self.dirty |= changed
+
+    def add_match(self, match_id, match_data):
+        """Indexe un match brut WhoScored (une passe sur les listes home / away)."""
+        match_centre = (match_data or {}).get("matchCentreData")
+        if match_id is None or not match_centre:
+            return
+        names = match_centre.get("playerIdNameDictionary", {})
+        players = []
+        for side in ["home", "away"]:
+            for player in match_centre.get(side, {}).get("players", []):
+                player_id = str(player.get("playerId"))
+                players.append((player_id, names.get(player_id) or player.get("name"), side))
+        self.add_players(match_id, players)
+
+    def add_partials(self, match_id, partials):
+        """Indexe un match à partir de ses agrégats partiels (côtés inconnus)."""
+        if match_id is None or partials is None:
+            return
+        self.add_players(match_id, [(player_id, partial.get("player_name"), None)
+                                    for player_id, partial in partials.items()])
+
+    def knows_match(self, match_id):
+        return str(match_id) in self.matches
+
+    def player_ids(self, name):
+        """playerIds portant ce nom (après normalisation)."""
+        return list(self.ids_by_name.get(normalize_name(name), []))
+
+    def name_of(self, player_id):
+        return self.names.get(str(player_id))
+
+    def player_in_match(self, match_id, name):
+        """(playerId, côté) du joueur dans ce match, ou None s'il n'y figure pas."""
+        match_id = str(match_id)
+        for player_id in self.ids_by_name.get(normalize_name(name), []):
+            matches = self.appearances.get(player_id, {})
+            if match_id in matches:
+                return player_id, matches[match_id]
+        return None
+
+    def matches_of(self, name):
+        """{matchId: (playerId, côté)} de tous les matchs indexés du joueur."""
+        matches = {}
+        for player_id in self.ids_by_name.get(normalize_name(name), []):
+            for match_id, side in self.appearances.get(player_id, {}).items():
+                matches.setdefault(match_id, (player_id, side))
+        return matches
+
+    def save(self):
+        """Écrit l'index sur disque (écriture atomique) s'il a changé."""
+        if not self.path or not self.dirty:
+            return None
+        with self._lock:
+            data = {
+                "players": {player_id: {"name": self.names.get(player_id), "matches": matches}
+                            for player_id, matches in self.appearances.items()},
+                "matches": sorted(self.matches),
+            }
+            self.dirty = False
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        return self.path
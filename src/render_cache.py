@@ -0,0 +1,122 @@
+# render_cache.py
+# Cache de rendu : chaque figure planifiée porte une empreinte de ses entrées
+# (fichier joueur, photo, arguments du visualizer et de la figure, version du
+# code de rendu). Les empreintes des figures écrites sont gardées dans un
+# manifeste à côté des PNG (.render_manifest.json) ; une figure dont
+# l'empreinte n'a pas changé et dont le fichier existe n'est pas re-rendue.
+import hashlib
+import json
+import os
+import sys
+import threading
+
+import matplotlib
+
+MANIFEST_NAME = ".render_manifest.json"
+# Modules dont le code détermine le rendu : une modification invalide toutes les figures
+RENDER_MODULES = ('visualizer', 'figure_templates', 'event_table', 'pass_classifier', 'pass_network',
+                  'player_data_io', 'columnar_store')
+
+_code_version = None
+_digests = {}  # (chemin, taille, mtime) -> empreinte du contenu
+
+
+def code_version():
+    """Empreinte du code de rendu (sources de RENDER_MODULES, versions de matplotlib et mplsoccer)."""
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.sha1()
+        for name in RENDER_MODULES:
+            module = sys.modules.get(name)
+            path = getattr(module, '__file__', None)
+            if path and os.path.exists(path):
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+        digest.update(matplotlib.__version__.encode())
+        mplsoccer = sys.modules.get('mplsoccer')
+        digest.update(getattr(mplsoccer, '__version__', '').encode())
+        _code_version = digest.hexdigest()
+    return _code_version
+
+
+def content_digest(path):
+    """
+    Empreinte du contenu d'un fichier, ou de tous les fichiers d'un dossier
+    (format colonnaire) ; None si path n'existe pas. Mise en cache tant que
+    taille et date de modification sont inchangées.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    if os.path.isdir(path):
+        digest = hashlib.sha1()
+        for name in sorted(os.listdir(path)):
+            digest.update(name.encode())
+            digest.update((content_digest(os.path.join(path, name)) or '').encode())
+        return digest.hexdigest()
+
+    stat = os.stat(path)
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    if key not in _digests:
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        _digests[key] = digest.hexdigest()
+    return _digests[key]
+
+
+def figure_digest(*inputs):
+    """Empreinte d'une figure : inputs (valeurs JSON) + version du code de rendu."""
+    payload = json.dumps([code_version(), *inputs], sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class RenderManifest:
+    """
+    Manifestes {nom du PNG: empreinte} des dossiers de sortie, chargés à la
+    demande et réécrits (écriture atomique) par save.
+    """
+
+    def __init__(self):
+        self._manifests = {}  # dossier -> {fichier: empreinte}
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+    def _manifest(self, directory):
+        manifest = self._manifests.get(directory)
+        if manifest is None:
+            manifest = {}
+            path = os.path.join(directory, MANIFEST_NAME)
+            if os.path.exists(path):
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        manifest = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"Manifeste de rendu illisible ({path} : {e}), figures re-rendues.")
+            self._manifests[directory] = manifest
+        return manifest
+
+    def is_fresh(self, save_path, digest):
+        """True si save_path existe et a été rendu avec cette empreinte."""
+        directory, name = os.path.split(os.path.abspath(save_path))
+        with self._lock:
+            return self._manifest(directory).get(name) == digest and os.path.exists(save_path)
+
+    def record(self, save_path, digest):
+        directory, name = os.path.split(os.path.abspath(save_path))
+        with self._lock:
+            self._manifest(directory)[name] = digest
+            self._dirty.add(directory)
+
+    def save(self):
+        with self._lock:
+            for directory in self._dirty:
+                path = os.path.join(directory, MANIFEST_NAME)
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                try:
+                    with open(tmp_path, 'w', encoding='utf-8') as f:
+                        json.dump(self._manifests[directory], f, ensure_ascii=False, indent=1, sort_keys=True)
+                    os.replace(tmp_path, path)
+                except OSError as e:
+                    print(f"Manifeste de rendu {path} non écrit ({e}).")
+            self._dirty = set()
@@ -0,0 +1,200 @@
+# render_scheduler.py
+import multiprocessing
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+
+from figure_templates import DEFAULT_PROFILE, RENDER_PROFILES, pop_saved, profile_path, set_render_profile
+from visualizer import MatchVisualizer, SeasonVisualizer
+from player_data_io import resolve_player_data_path
+from player_image_downloader import photo_file_path, prefetch_player_photos
+from render_cache import RenderManifest, content_digest, figure_digest
+
+VISUALIZERS = {
+    'match': MatchVisualizer,
+    'season': SeasonVisualizer,
+}
+
+# État de chaque worker : données des joueurs reçues une fois à l'initialisation,
+# puis visualizers (et leur EventTable) construits à la première figure du joueur
+_worker_players = {}
+_worker_visualizers = {}
+
+
+def _init_worker(players, profile=DEFAULT_PROFILE):
+    """Initialise un worker avec les données déjà chargées de tous les joueurs et le profil de rendu."""
+    matplotlib.use('Agg')
+    set_render_profile(profile)
+    _worker_players.clear()
+    _worker_players.update(players)
+    _worker_visualizers.clear()
+
+
+def _get_visualizer(player_key):
+    visualizer = _worker_visualizers.get(player_key)
+    if visualizer is None:
+        kind, player_data, visualizer_args = _worker_players[player_key]
+        visualizer = VISUALIZERS[kind](*visualizer_args, player_data=player_data)
+        _worker_visualizers[player_key] = visualizer
+    return visualizer
+
+
+def _render_job(job):
+    """
+    Rend une figure ; retourne (joueur, figure, durée en s, erreur ou None,
+    fichiers écrits [(chemin, octets, dessin en s, encodage en s)]).
+    """
+    player_key, label, method, args = job
+    start = time.perf_counter()
+    error = None
+    pop_saved()
+    try:
+        getattr(_get_visualizer(player_key), method)(*args)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}\n{traceback.format_exc()}"
+    return player_key, label, time.perf_counter() - start, error, pop_saved()
+
+
+class RenderScheduler:
+    """
+    Répartit le rendu des figures (joueurs x figures) sur un pool de processus.
+    Les données de chaque joueur sont chargées une fois dans le processus
+    principal et transmises aux workers à leur démarrage : aucun worker ne
+    relit le JSON. Chaque figure est un job indépendant (rendu Agg, CPU).
+    use_cache : les figures dont les entrées n'ont pas changé depuis leur
+    dernier rendu (voir render_cache) ne sont pas re-rendues.
+    profile : profil de rendu (figure_templates.RENDER_PROFILES), ex. 'preview'
+    pour des brouillons rapides et légers, 'production' pour les images finales.
+    """
+
+    def __init__(self, max_workers=None, prefetch_photos=True, use_cache=True, profile=DEFAULT_PROFILE):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.prefetch_photos = prefetch_photos
+        self.use_cache = use_cache
+        if profile not in RENDER_PROFILES:
+            print(f"Profil de rendu inconnu '{profile}', utilisation de '{DEFAULT_PROFILE}'.")
+            profile = DEFAULT_PROFILE
+        self.profile = profile
+        self.players = {}  # clé -> (type de visualizer, données du joueur, arguments du visualizer)
+        self.jobs = []     # (clé du joueur, libellé, méthode, arguments)
+        self.manifest = RenderManifest()
+        self.report = {"reused": [], "rebuilt": []}  # (joueur, figure, chemin) du dernier run
+
+    def add_player(self, player_key, kind, player_data, visualizer_args):
+        """
+        Enregistre les données d'un joueur.
+        kind : 'match' ou 'season' ; visualizer_args : arguments positionnels du
+        visualizer (player_data_path, competition, color1, color2, match_name, match_teams).
+        player_data None : chaque worker charge le fichier player_data_path (colonnes memmap si présentes).
+        """
+        self.players[player_key] = (kind, player_data, tuple(visualizer_args))
+
+    def add_figure(self, player_key, label, method, *args):
+        """Ajoute une figure à rendre : visualizer.<method>(*args), args[0] étant le chemin du PNG."""
+        self.jobs.append((player_key, label, method, args))
+
+    def _job_digest(self, job):
+        """Empreinte des entrées d'une figure : fichier joueur, photo, arguments, code de rendu."""
+        player_key, _, method, args = job
+        kind, player_data, visualizer_args = self.players[player_key]
+        player_name = player_data['player_name'] if player_data else player_key
+        player_id = (player_data.get('playerId') or player_data.get('player_id')) if player_data else None
+        data_path = resolve_player_data_path(visualizer_args[0]) if visualizer_args[0] else None
+        photo_path = photo_file_path(player_name, player_id)
+        return figure_digest(self.profile, kind, list(visualizer_args[1:]), content_digest(data_path),
+                             content_digest(photo_path), method, [os.path.basename(str(args[0]))] + list(args[1:]))
+
+    def _skip_unchanged(self, jobs):
+        """Sépare les figures à rendre des figures inchangées ; retourne (jobs à rendre, {(joueur, figure): empreinte})."""
+        pending, digests = [], {}
+        for job in jobs:
+            player_key, label, _, args = job
+            digest = self._job_digest(job)
+            save_path = profile_path(args[0], self.profile)
+            if self.use_cache and self.manifest.is_fresh(save_path, digest):
+                self.report["reused"].append((player_key, label, save_path))
+            else:
+                pending.append(job)
+                digests[(player_key, label)] = digest
+        return pending, digests
+
+    def _prefetch_photos(self):
+        # Photos téléchargées une fois ici (en parallèle) plutôt que par plusieurs workers en même temps ;
+        # attend aussi les téléchargements déjà lancés par start_photo_prefetch
+        prefetch_player_photos([(player_data['player_name'], player_data.get('playerId') or player_data.get('player_id'))
+                                if player_data else player_key
+                                for player_key, (_, player_data, _) in self.players.items()])
+
+    def run(self):
+        """Rend toutes les figures en attente ; retourne la liste des résultats de _render_job."""
+        self.report = {"reused": [], "rebuilt": []}
+        if not self.jobs:
+            return []
+
+        if self.prefetch_photos:
+            self._prefetch_photos()
+
+        jobs, digests = self._skip_unchanged(self.jobs)
+        self.jobs = []
+        if self.report["reused"]:
+            print(f"♻️ {len(self.report['reused'])} figure(s) inchangée(s), non re-rendue(s).")
+        if not jobs:
+            return []
+        workers = min(self.max_workers, len(jobs))
+        print(f"🖼️ Rendu de {len(jobs)} figure(s) sur {workers} processus...")
+        start = time.perf_counter()
+        results = []
+
+        if workers <= 1:
+            _init_worker(self.players, self.profile)
+            for job in jobs:
+                results.append(self._report(_render_job(job)))
+        else:
+            # spawn plutôt que fork : des threads (préchargement des photos, scraping) peuvent tenir
+            # un verrou (index des photos, hôte, session) au moment du fork et bloquer les workers
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_init_worker, initargs=(self.players, self.profile)) as executor:
+                futures = [executor.submit(_render_job, job) for job in jobs]
+                for future in as_completed(futures):
+                    results.append(self._report(future.result()))
+
+        self._print_timings(results, time.perf_counter() - start)
+        for player_key, label, _, error, saved in results:
+            # Seules les figures réellement écrites (une méthode peut s'arrêter sans rien sauvegarder)
+            for save_path, *_ in ([] if error else saved):
+                self.manifest.record(save_path, digests[(player_key, label)])
+                self.report["rebuilt"].append((player_key, label, save_path))
+        self.manifest.save()
+        return results
+
+    def print_report(self):
+        """Liste des figures réutilisées et reconstruites lors du dernier run."""
+        for status, title in (("rebuilt", "Reconstruites"), ("reused", "Réutilisées (inchangées)")):
+            print(f"{title} : {len(self.report[status])}")
+            for player_key, label, save_path in self.report[status]:
+                print(f"  {str(player_key)[:27]:<28}{label[:33]:<34}{save_path}")
+
+    def _report(self, result):
+        player_key, label, elapsed, error, _ = result
+        if error:
+            print(f"❌ {player_key} - {label} : {error}")
+        else:
+            print(f"✅ {player_key} - {label} ({elapsed:.2f}s)")
+        return result
+
+    def _print_timings(self, results, wall_time):
+        cpu_time = sum(result[2] for result in results)
+        n_errors = sum(1 for result in results if result[3])
+        n_bytes = sum(size for result in results for _, size, _, _ in result[4])
+        print(f"\n{'figure':<34}{'joueur':<28}{'temps (s)':>10}{'encodage (ms)':>15}{'taille (Ko)':>13}")
+        for player_key, label, elapsed, error, saved in sorted(results, key=lambda r: -r[2]):
+            status = " (erreur)" if error else ""
+            encode = sum(encode for _, _, _, encode in saved)
+            size = sum(size for _, size, _, _ in saved)
+            print(f"{label[:33]:<34}{str(player_key)[:27]:<28}{elapsed:>10.2f}{encode * 1000:>15.0f}"
+                  f"{size / 1024:>13.1f}{status}")
+        print(f"Total ({self.profile}) : {len(results)} figure(s), {n_errors} erreur(s), "
+              f"{cpu_time:.1f}s de rendu en {wall_time:.1f}s, {n_bytes / 1024:.0f} Ko écrits")
@@ -0,0 +1,211 @@
+# season_aggregator.py
+import sys
+from collections import defaultdict
+
+from player_data_io import read_player_data
+from player_index import normalize_name
+from stat_matrix import StatMatrix
+
+try:
+    import resource
+except ImportError:  # Windows : pas de getrusage
+    resource = None
+
+
+def peak_rss_mb():
+    """Pic de mémoire résidente du processus en Mo (None si indisponible)."""
+    if resource is None:
+        return None
+    # ru_maxrss est en octets sous macOS, en Ko ailleurs (Linux, BSD)
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+class PlayerSeasonAccumulator:
+    """
+    Agrégat (saison, multi-saison, carrière) des matchs d'un joueur.
+    - add_partials : intègre un match à partir de ses agrégats partiels
+      (match_partials), le match brut pouvant être libéré aussitôt ;
+    - merge : fusion associative de deux agrégats portant sur des matchs
+      distincts (agrégats partiels par match, saisons...).
+    match_ids liste les matchs terminés déjà intégrés, pour les mises à jour
+    incrémentales ; live_match_ids les matchs en cours, recalculés à chaque mise à jour.
+    Les stats minute par minute sont additionnées dans une StatMatrix (stat x minute).
+    """
+
+    def __init__(self, player_name):
+        self.player_name = player_name
+        self.player_id = None  # Premier ID trouvé
+        self.events = []
+        self.positions_count = {}
+        self.first_eleven_count = 0
+        self.motm_count = 0
+        self.stat_matrix = StatMatrix()
+        self.height = self.weight = self.age = None
+        self.total_matches = 0
+        self.match_ids = []    # Matchs terminés intégrés (joueur présent ou non)
+        self.live_match_ids = []  # Matchs en cours intégrés (chiffres provisoires)
+
+    @property
+    def matches_seen(self):
+        return len(self.match_ids) + len(self.live_match_ids)
+
+    @property
+    def stats(self):
+        """Stats cumulées au format WhoScored ({stat: {minute: valeur}})."""
+        return self.stat_matrix.to_stats()
+
+    def _add_player_match(self, player_id, player_stats, player_events):
+        """Intègre la ligne de stats et les événements du joueur pour un match."""
+        if not self.player_id: # Sauvegarde du premier ID trouvé
+            self.player_id = player_id
+        self.events.extend(player_events)
+
+        self.total_matches += 1
+        pos = player_stats.get("position")
+        if pos:
+            self.positions_count[pos] = self.positions_count.get(pos, 0) + 1
+
+        if player_stats.get("isFirstEleven"):
+            self.first_eleven_count += 1
+        if player_stats.get("isManOfTheMatch"):
+            self.motm_count += 1
+        if not self.height: self.height = player_stats.get("height")
+        if not self.weight: self.weight = player_stats.get("weight")
+        if not self.age: self.age = player_stats.get("age")
+
+        self.stat_matrix.add(StatMatrix.from_stats(player_stats.get("stats", {})))
+
+    def add_partials(self, match_id, partials, player_id=None, finished=True):
+        """
+        Intègre un match à partir de ses agrégats partiels (voir match_partials).
+        player_id : ID du joueur s'il est connu (PlayerIndex), sinon recherche par nom.
+        finished : False pour un match en cours (rangé dans live_match_ids).
+        Des agrégats vides enregistrent seulement le match (joueur absent).
+        """
+        (self.match_ids if finished else self.live_match_ids).append(str(match_id))
+        if player_id is not None:
+            partial = partials.get(str(player_id))
+        else:
+            wanted = normalize_name(self.player_name)
+            partial = next((partial for partial in partials.values()
+                            if normalize_name(partial.get("player_name")) == wanted), None)
+        if partial is None:
+            return False
+        self.merge(PlayerSeasonAccumulator.from_record(partial), count_matches=False)
+        return True
+
+    def merge(self, other, count_matches=True):
+        """Fusionne other (matchs distincts) dans cet agrégat ; retourne self."""
+        if count_matches:
+            known = set(self.match_ids)
+            overlap = [match_id for match_id in other.match_ids if match_id in known]
+            if overlap:
+                print(f"⚠️ {len(overlap)} match(s) présent(s) dans les deux agrégats : ils seront comptés deux fois.")
+            self.match_ids.extend(other.match_ids)
+            self.live_match_ids.extend(other.live_match_ids)
+
+        if not self.player_id:
+            self.player_id = other.player_id
+        self.events.extend(other.events)
+        for pos, count in other.positions_count.items():
+            self.positions_count[pos] = self.positions_count.get(pos, 0) + count
+        self.first_eleven_count += other.first_eleven_count
+        self.motm_count += other.motm_count
+        self.total_matches += other.total_matches
+        if not self.height: self.height = other.height
+        if not self.weight: self.weight = other.weight
+        if not self.age: self.age = other.age
+        self.stat_matrix.add(other.stat_matrix)
+        return self
+
+    def to_record(self):
+        """Fiche agrégée du joueur, ou None s'il n'a été trouvé dans aucun match."""
+        if not self.player_id:
+            return None
+        return {
+            "player_name": self.player_name,
+            "player_id": self.player_id,
+            "position": self.positions_count, # Dict des positions jouées
+            "height": self.height,
+            "weight": self.weight,
+            "age": self.age,
+            "total_matches": self.total_matches,
+            "isFirstEleven_count": self.first_eleven_count,
+            "isManOfTheMatch_count": self.motm_count,
+            "stats": self.stats,
+            "match_ids": self.match_ids,
+            "live_match_ids": self.live_match_ids,
+            "events": self.events
+        }
+
+    @classmethod
+    def from_record(cls, record):
+        """Reconstruit un agrégat à partir d'une fiche to_record (fichier *_aggregated.json)."""
+        accumulator = cls(record.get("player_name"))
+        accumulator.player_id = record.get("player_id")
+        accumulator.events = list(record.get("events", []))
+        accumulator.positions_count = dict(record.get("position") or {})
+        accumulator.first_eleven_count = record.get("isFirstEleven_count", 0)
+        accumulator.motm_count = record.get("isManOfTheMatch_count", 0)
+        accumulator.stat_matrix = StatMatrix.from_stats(record.get("stats", {}))
+        accumulator.height = record.get("height")
+        accumulator.weight = record.get("weight")
+        accumulator.age = record.get("age")
+        accumulator.total_matches = record.get("total_matches", 0)
+        accumulator.match_ids = [str(match_id) for match_id in record.get("match_ids", [])]
+        accumulator.live_match_ids = [str(match_id) for match_id in record.get("live_match_ids", [])]
+        return accumulator
+
+
+def match_partials(match_data):
+    """
+    Agrégats partiels de TOUS les joueurs d'un match, en une passe sur les
+    événements : {playerId (str): fiche to_record d'un seul match}.
+    """
+    match_centre = (match_data or {}).get("matchCentreData")
+    if not match_centre:
+        return {}
+    names = match_centre.get("playerIdNameDictionary", {})
+
+    events_by_player = defaultdict(list)
+    for event in match_centre.get("events", []):
+        events_by_player[event.get('playerId')].append(event)
+
+    partials = {}
+    for team_type in ["home", "away"]:
+        for player in match_centre.get(team_type, {}).get("players", []):
+            player_id = str(player.get("playerId"))
+            if player_id in partials or player_id not in names:
+                continue
+            accumulator = PlayerSeasonAccumulator(names[player_id])
+            accumulator._add_player_match(player_id, player, events_by_player.get(player.get("playerId"), []))
+            accumulator.match_ids.append(str(match_data.get("matchId")))
+            partials[player_id] = accumulator.to_record()
+    return partials
+
+
+def rollup_aggregate_files(paths, player_name=None):
+    """
+    Fusionne plusieurs agrégats joueur (saisons, tout format de player_data_io)
+    en un agrégat multi-saison / carrière. Les agrégats contenant des matchs en
+    cours (chiffres provisoires) sont ignorés. Retourne le PlayerSeasonAccumulator
+    (None si aucun fichier utilisable).
+    """
+    rollup = None
+    for path in paths:
+        try:
+            record = read_player_data(path)
+        except (OSError, ValueError) as e:
+            print(f"Agrégat illisible {path}: {e}")
+            continue
+        if not record:
+            continue
+        if record.get("live_match_ids"):
+            print(f"Agrégat {path} ignoré : {len(record['live_match_ids'])} match(s) encore en cours.")
+            continue
+        accumulator = PlayerSeasonAccumulator.from_record(record)
+        if rollup is None:
+            rollup = PlayerSeasonAccumulator(player_name or accumulator.player_name)
+        rollup.merge(accumulator)
+    return rollup
@@ -1,22 +1,66 @@
 # visualizer.py - Version avec visualisations de l'ancien projet
-import json
-import os
 from mplsoccer import Pitch, VerticalPitch
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import numpy as np
 from matplotlib.gridspec import GridSpec
 import matplotlib.colors as mcolors
-import matplotlib.image as mpimg
 from scipy.ndimage import gaussian_filter
 from player_image_downloader import PlayerProfileScraper
 from collections import defaultdict, Counter
+from event_table import EventTable
+from player_data_io import open_player_table, read_player_data
+from pass_classifier import ZONE_DEFENSIVE, ZONE_MIDDLE, ZONE_OFFENSIVE
+from figure_templates import new_figure, get_pitch, add_photo, save_figure
+from pass_network import PassPairings
+from player_index import normalize_name
+
+
+# ==================== DESSIN PAR COUCHES ====================
+# Un appel pitch.scatter / pitch.arrows par groupe de style (couleur, marqueur,
+# résultat) au lieu d'un artiste matplotlib par événement : le rendu et le
+# savefig ne dépendent plus du nombre d'événements tracés.
+def draw_scatter_layer(pitch, ax, table, mask, **style):
+    """Une seule collection de points pour les lignes du masque ayant une position."""
+    rows = np.flatnonzero(mask & table.has_x)
+    if len(rows) == 0:
+        return None
+    return pitch.scatter(table.x[rows], table.y[rows], ax=ax, **style)
+
+
+def draw_arrow_layer(pitch, ax, table, mask, end_x=None, end_y=None, **style):
+    """
+    Une seule collection de flèches pour les lignes du masque. Par défaut les
+    flèches vont de (x, y) à (endX, endY) ; end_x / end_y permettent de donner
+    d'autres colonnes d'arrivée (NaN = ligne ignorée).
+    """
+    end_x = table.endX if end_x is None else end_x
+    end_y = table.endY if end_y is None else end_y
+    rows = np.flatnonzero(mask & table.has_x & ~np.isnan(end_x) & ~np.isnan(end_y))
+    if len(rows) == 0:
+        return None
+    return pitch.arrows(table.x[rows], table.y[rows], end_x[rows], end_y[rows], ax=ax, **style)
+
+
+# ==================== PHOTOS ====================
+def player_photo_path(player_data):
+    """Photo du joueur via l'index des photos (playerId des fiches match ou saison) ; None si absente."""
+    player_id = player_data.get('playerId') or player_data.get('player_id')
+    return PlayerProfileScraper(player_data['player_name'], player_id=player_id).save_player_profile()
 
 
 class MatchVisualizer:
-    def __init__(self, player_data_path, competition, color1, color2, match_name, match_teams):
+    def __init__(self, player_data_path, competition, color1, color2, match_name, match_teams, player_data=None):
         self.player_data_path = player_data_path
-        self.player_data = self._load_player_data()
+        # player_data : données déjà chargées (ex. partagées par render_scheduler), sinon
+        # colonnes memmap (format colonnaire ou fichier compagnon), à défaut lecture du fichier
+        opened = open_player_table(player_data_path) if player_data is None and player_data_path else None
+        if opened:
+            self.player_data, self.events_table = opened
+        else:
+            self.player_data = player_data if player_data is not None else self._load_player_data()
+            # Table colonnaire construite une fois et partagée par toutes les visualisations
+            self.events_table = EventTable(self.player_data.get('events', []))
         self.competition = competition
         self.color1 = color1
         self.color2 = color2
@@ -24,35 +68,16 @@ class MatchVisualizer:
         self.match_teams = match_teams
 
     def _load_player_data(self):
-        with open(self.player_data_path, 'r') as file:
-            data = json.load(file)
-        return data
-
-    def _classify_passes(self, passes):
-        """Classification complète des passes"""
-        forward_passes, lateral_passes, backward_passes = [], [], []
-        successful_passes, failed_passes = [], []
-
-        for pas in passes:
-            x_start, y_start = pas['x'], pas['y']
-            x_end, y_end = pas['endX'], pas['endY']
-            
-            # Calcul de l'angle
-            angle = np.degrees(np.arctan2(y_end - y_start, x_end - x_start))
-            
-            if 30 <= angle <= 150:
-                forward_passes.append(pas)
-            elif -150 <= angle <= -30:  
-                backward_passes.append(pas)
-            else:
-                lateral_passes.append(pas)
-                
-            if pas['outcomeType']['displayName'] == 'Successful':
-                successful_passes.append(pas)
-            else:
-                failed_passes.append(pas)
+        # JSON, JSON compressé ou colonnaire selon le fichier présent
+        return read_player_data(self.player_data_path)
 
-        return forward_passes, lateral_passes, backward_passes, successful_passes, failed_passes
+    def _classify_passes(self):
+        """Classification complète des passes (masques sur self.events_table)"""
+        table = self.events_table
+        passes = table.type_mask('Pass')
+        classes = table.pass_classes()
+        return {name: passes & classes[name]
+                for name in ('forward', 'lateral', 'backward', 'successful', 'failed', 'progressive')}
 
     def _plot_semi_circular_gauge(self, ax, label, successful_passes, total_passes):
         """Jauge semi-circulaire"""
@@ -108,68 +133,38 @@ class MatchVisualizer:
     # ==================== VISUALISATION 1: PASSES + HEATMAP ====================
     def plot_passes_heatmap_and_bar_charts(self, save_path, type_data, nb_passe_d):
         """Passes avec heatmap et statistiques"""
-        events = self.player_data.get('events', [])
-        passes = [event for event in events if event['type']['displayName'] == 'Pass']
+        table = self.events_table
+        successful = table.successful()
 
-        forward_passes, lateral_passes, backward_passes, successful_passes, failed_passes = self._classify_passes(passes)
-        total_passes = len(passes)
+        passes_mask = table.type_mask('Pass')
+        total_passes = int(np.count_nonzero(passes_mask))
+        successful_passes = int(np.count_nonzero(passes_mask & successful))
 
         # Événements offensifs
-        offensive_events = [
-            event for event in events if event['type']['displayName'] in ['TakeOn', 'MissedShots', 'SavedShot', 'Goal', 'Foul', 'Pass']
-        ]
-
-        takeons = [event for event in offensive_events if event['type']['displayName'] == 'TakeOn']
-        successful_takeons = [event for event in takeons if event.get('outcomeType', {}).get('displayName') == 'Successful']
-        missed_shots = [event for event in offensive_events if event['type']['displayName'] == 'MissedShots']
-        saved_shots = [event for event in offensive_events if event['type']['displayName'] == 'SavedShot']
-        goals = [event for event in offensive_events if event['type']['displayName'] == 'Goal']
+        takeons = table.type_mask('TakeOn')
+        n_takeons = int(np.count_nonzero(takeons))
+        n_successful_takeons = int(np.count_nonzero(takeons & successful))
+        n_missed_shots = len(table.indices('MissedShots'))
+        n_saved_shots = len(table.indices('SavedShot'))
+        n_goals = len(table.indices('Goal'))
 
         # Événements défensifs
-        defensive_events = [
-            event for event in events if event['type']['displayName'] in ['BallRecovery', 'Interception', 'Tackle', 'Foul']
-        ]
-
-        ball_recoveries = [event for event in defensive_events if event['type']['displayName'] == 'BallRecovery']
-        successful_ball_recoveries = [event for event in ball_recoveries if event.get('outcomeType', {}).get('displayName') == 'Successful']
-        interceptions = [event for event in defensive_events if event['type']['displayName'] == 'Interception']
-        successful_interceptions = [event for event in interceptions if event.get('outcomeType', {}).get('displayName') == 'Successful']
-        tackles = [event for event in defensive_events if event['type']['displayName'] == 'Tackle']
-        successful_tackles = [event for event in tackles if event.get('outcomeType', {}).get('displayName') == 'Successful']
-        fouls = [event for event in defensive_events if event['type']['displayName'] == 'Foul']
-        committed_fouls = [event for event in fouls if event.get('outcomeType', {}).get('displayName') == 'Unsuccessful']
-        submitted_fouls = [event for event in fouls if event.get('outcomeType', {}).get('displayName') == 'Successful']
-
-        key_passes = [
-            event for event in offensive_events if event['type']['displayName'] == 'Pass' and
-            any(q['type']['displayName'] == 'KeyPass' for q in event.get('qualifiers', []))
-        ]
-        key_passes_successful = [
-            event for event in key_passes if event.get('outcomeType', {}).get('displayName') == 'Successful'
-        ]
+        ball_recoveries = table.type_mask('BallRecovery')
+        interceptions = table.type_mask('Interception')
+        tackles = table.type_mask('Tackle')
+        fouls = table.type_mask('Foul')
+        n_committed_fouls = int(np.count_nonzero(fouls & table.outcome_mask('Unsuccessful')))
+        n_submitted_fouls = int(np.count_nonzero(fouls & successful))
+
+        key_passes = passes_mask & table.qualifier_mask('KeyPass')
     
         # Setup visuel
-        gradient = np.linspace(0, 1, 256).reshape(-1, 1)
-        gradient = np.hstack((gradient, gradient))
-        cmap = mcolors.LinearSegmentedColormap.from_list("", [self.color1, self.color2])
-
-        fig = plt.figure(figsize=(16, 16))
-        ax = fig.add_axes([0, 0, 1, 1])
-        ax.axis('off')
-        ax.imshow(gradient, aspect='auto', cmap=cmap, extent=[0, 1, 0, 1])
+        fig, ax = new_figure((16, 16), self.color1, self.color2)
         gs = GridSpec(7, 2, height_ratios=[1, 1, 1, 1, 4, 4, 4])
 
         # Photo joueur
-        PlayerProfileScraper(self.player_data['player_name']).save_player_profile()
-        image_path = f"data/photo/{self.player_data['player_name'].replace(' ', '_')}_profile_image.jpg"
-        try:
-            player_photo = mpimg.imread(image_path)
-            ax_image = fig.add_subplot(gs[:4, 0])
-            ax_image.imshow(player_photo, aspect='equal')
-            ax_image.set_anchor('W')
-            ax_image.axis('off')
-        except:
-            pass
+        image_path = player_photo_path(self.player_data)
+        add_photo(fig, gs[:4, 0], image_path)
 
         # Infos joueur
         if self.player_data["isFirstEleven"]:
@@ -191,7 +186,7 @@ class MatchVisualizer:
             f"{status_text} ",
             f"{self.match_teams}",
             f"Temps de jeu: {playing_time} minutes",
-            f"{len(goals)} but(s)" if len(goals) >= 1 else None,
+            f"{n_goals} but(s)" if n_goals >= 1 else None,
             f"{nb_passe_d} passe(s) décisive(s)" if nb_passe_d >= 1 else None,
         ]
 
@@ -210,15 +205,15 @@ class MatchVisualizer:
         ax_bar4 = fig.add_subplot(gs[3, 1])
 
         all_stats = [
-            ("Passes clés", len(key_passes_successful), len(key_passes)),
-            ('Récuperations', len(successful_ball_recoveries), len(ball_recoveries)),
-            ('Tacles réussis', len(successful_tackles), len(tackles)),
-            ('Interceptions réussies', len(successful_interceptions), len(interceptions)),
-            ('Passes réussies', len(successful_passes), total_passes),
-            ('Dribbles réussis', len(successful_takeons), len(takeons)),
-            ('Tirs cadrés', len(saved_shots) + len(goals), len(missed_shots) + len(saved_shots) + len(goals)),
-            ('Fautes commises', len(committed_fouls), len(committed_fouls)),
-            ('Fautes subies', len(submitted_fouls), len(submitted_fouls))
+            ("Passes clés", int(np.count_nonzero(key_passes & successful)), int(np.count_nonzero(key_passes))),
+            ('Récuperations', int(np.count_nonzero(ball_recoveries & successful)), int(np.count_nonzero(ball_recoveries))),
+            ('Tacles réussis', int(np.count_nonzero(tackles & successful)), int(np.count_nonzero(tackles))),
+            ('Interceptions réussies', int(np.count_nonzero(interceptions & successful)), int(np.count_nonzero(interceptions))),
+            ('Passes réussies', successful_passes, total_passes),
+            ('Dribbles réussis', n_successful_takeons, n_takeons),
+            ('Tirs cadrés', n_saved_shots + n_goals, n_missed_shots + n_saved_shots + n_goals),
+            ('Fautes commises', n_committed_fouls, n_committed_fouls),
+            ('Fautes subies', n_submitted_fouls, n_submitted_fouls)
         ]
 
         priorities = {
@@ -254,25 +249,19 @@ class MatchVisualizer:
             self._add_horizontal_bar(ax_bars[i], label, value, total)
 
         # Terrain gauche - Passes
-        pitch = VerticalPitch(pitch_type='opta', pitch_color='none', line_color='white', linewidth=2)
+        pitch = get_pitch(VerticalPitch, pitch_type='opta', pitch_color='none', line_color='white', linewidth=2)
         ax_pitch_left = fig.add_subplot(gs[4:, 0], aspect=1)
         pitch.draw(ax=ax_pitch_left)
 
-        for pas in passes:
-            y_start = pas['x']
-            x_start = pas['y']
-            y_end = pas['endX']
-            x_end = pas['endY']
-            color = '#6DF176' if pas['outcomeType']['displayName'] == 'Successful' else 'red'
-            pitch.arrows(y_start, x_start, y_end, x_end, width=3, headwidth=3, headlength=3, color=color, ax=ax_pitch_left)
+        for color, mask in (('#6DF176', passes_mask & successful), ('red', passes_mask & ~successful)):
+            draw_arrow_layer(pitch, ax_pitch_left, table, mask, width=3, headwidth=3, headlength=3, color=color)
             
         # Terrain droit - Heatmap
         ax_pitch_right = fig.add_subplot(gs[4:, 1], aspect=1)
         pitch.draw(ax=ax_pitch_right)
     
-        touchs = [event for event in events]
-        x_coords = [t['x'] for t in touchs]
-        y_coords = [t['y'] for t in touchs]
+        x_coords = table.x[table.has_x]
+        y_coords = table.y[table.has_x]
     
         bin_statistic = pitch.bin_statistic(x_coords, y_coords, statistic='count', bins=(20, 20))
         bin_statistic['statistic'] = gaussian_filter(bin_statistic['statistic'], 1)
@@ -284,68 +273,42 @@ class MatchVisualizer:
         )
         pitch.heatmap(bin_statistic, ax=ax_pitch_right, cmap=el_greco_cmap)
     
-        plt.tight_layout()
-        plt.savefig(save_path, facecolor=fig.get_facecolor(), edgecolor='none')
-        plt.close(fig)
+        save_figure(fig, save_path, 'MatchVisualizer.plot_passes_heatmap_and_bar_charts')
 
     # ==================== VISUALISATION 2: PASSES COLORÉES ====================
     def plot_passes_and_bar_charts(self, save_path):
         """Passes colorées par direction"""
-        events = self.player_data.get('events', [])
-        passes = [event for event in events if event['type']['displayName'] == 'Pass']
+        table = self.events_table
+        passes_mask = table.type_mask('Pass')
         
-        if not passes:
+        if not passes_mask.any():
             print(f"Pas de passes trouvées pour {self.player_data['player_name']}. Aucun visuel généré.")
             return
     
-        forward_passes, lateral_passes, backward_passes, successful_passes, failed_passes = self._classify_passes(passes)
-        total_passes = len(passes)
+        classes = self._classify_passes()
+        successful_passes = np.flatnonzero(classes['successful'])
+        total_passes = int(np.count_nonzero(passes_mask))
 
         # Setup visuel
-        gradient = np.linspace(0, 1, 256).reshape(-1, 1)
-        gradient = np.hstack((gradient, gradient))
-        cmap = mcolors.LinearSegmentedColormap.from_list("", [self.color1, self.color2])
-    
-        fig = plt.figure(figsize=(12, 9))
-        ax = fig.add_axes([0, 0, 1, 1])
-        ax.axis('off')
-        ax.imshow(gradient, aspect='auto', cmap=cmap, extent=[0, 1, 0, 1])
+        fig, ax = new_figure((12, 9), self.color1, self.color2)
         gs = GridSpec(6, 2, width_ratios=[2, 2])
     
         # Terrain
-        pitch = VerticalPitch(pitch_type='opta', pitch_color='none', line_color='white', linewidth=2)
+        pitch = get_pitch(VerticalPitch, pitch_type='opta', pitch_color='none', line_color='white', linewidth=2)
         ax_pitch = fig.add_subplot(gs[:, 0])
         pitch.draw(ax=ax_pitch)
     
         ax_pitch.annotate('', xy=(-0.05, 0.75), xytext=(-0.05, 0.25), xycoords='axes fraction',
                           arrowprops=dict(edgecolor='white', facecolor='none', width=10, headwidth=25, headlength=25))
 
-        forward_count = 0 
-        lateral_count = 0 
-        backward_count = 0
+        forward_count = int(np.count_nonzero(classes['forward'] & classes['successful']))
+        lateral_count = int(np.count_nonzero(classes['lateral'] & classes['successful']))
+        backward_count = int(np.count_nonzero(classes['backward'] & classes['successful']))
 
-        for pas in successful_passes:
-            y_start = pas['x']
-            x_start = pas['y']
-            y_end = pas['endX']
-            x_end = pas['endY']
-            alpha_pass = 1
-            
-            angle = np.degrees(np.arctan2(y_end - y_start, x_end - x_start))
-    
-            if 30 <= angle <= 150:
-                color = '#78ff00'
-                forward_count += 1
-            elif -150 <= angle <= -30:
-                alpha_pass = 0.5
-                color = '#ff3600'
-                backward_count += 1
-            else:
-                color = '#ffb200'
-                alpha_pass = 0.8
-                lateral_count += 1
-
-            pitch.arrows(y_start, x_start, y_end, x_end, width=2, headwidth=3, headlength=3, color=color, ax=ax_pitch, alpha=alpha_pass)
+        # Une couche de flèches par direction
+        for color, alpha_pass, direction in (('#78ff00', 1, 'forward'), ('#ff3600', 0.5, 'backward'), ('#ffb200', 0.8, 'lateral')):
+            draw_arrow_layer(pitch, ax_pitch, table, classes['successful'] & classes[direction],
+                             width=2, headwidth=3, headlength=3, color=color, alpha=alpha_pass)
 
         p_1 = mpatches.Patch(color='#78ff00', label='Passes vers l\'avant')
         p_2 = mpatches.Patch(color='#ffb200', label='Passes latérales')
@@ -367,33 +330,27 @@ class MatchVisualizer:
         self._add_horizontal_bar(ax_bar2, 'Passes latérales', lateral_count, total_passes)
         self._add_horizontal_bar(ax_bar3, 'Passes vers l\'arrière', backward_count, total_passes)
     
-        plt.tight_layout()
-        plt.savefig(save_path, facecolor=fig.get_facecolor(), edgecolor='none')
-        plt.close(fig)
+        save_figure(fig, save_path, 'MatchVisualizer.plot_passes_and_bar_charts')
 
     # ==================== VISUALISATION 3: ACTIVITÉ DÉFENSIVE ====================
     def plot_defensive_activity(self, save_path):
         """Activité défensive"""
-        events = self.player_data.get('events', [])
+        table = self.events_table
+        successful = table.successful()
 
-        defensive_events = [
-            event for event in events if event['type']['displayName'] in ['BallRecovery', 'Interception', 'Tackle', 'Foul']
-        ]
+        defensive_mask = table.type_mask('BallRecovery', 'Interception', 'Tackle', 'Foul')
 
-        if not defensive_events:
+        if not defensive_mask.any():
             print(f"Aucune activité défensive trouvée pour {self.player_data['player_name']}. Aucun visuel généré.")
             return
 
-        ball_recoveries = [event for event in defensive_events if event['type']['displayName'] == 'BallRecovery']
-        successful_ball_recoveries = [event for event in ball_recoveries if event.get('outcomeType', {}).get('displayName') == 'Successful']
-        interceptions = [event for event in defensive_events if event['type']['displayName'] == 'Interception']
-        successful_interceptions = [event for event in interceptions if event.get('outcomeType', {}).get('displayName') == 'Successful']
-        tackles = [event for event in defensive_events if event['type']['displayName'] == 'Tackle']
-        successful_tackles = [event for event in tackles if event.get('outcomeType', {}).get('displayName') == 'Successful']
+        ball_recoveries = table.type_mask('BallRecovery')
+        interceptions = table.type_mask('Interception')
+        tackles = table.type_mask('Tackle')
 
-        passes = [event for event in events if event['type']['displayName'] == 'Pass']
-        forward_passes, lateral_passes, backward_passes, successful_passes, failed_passes = self._classify_passes(passes)
-        total_passes = len(passes)
+        passes_mask = table.type_mask('Pass')
+        n_successful_passes = int(np.count_nonzero(passes_mask & successful))
+        total_passes = int(np.count_nonzero(passes_mask))
 
         symbol_map = {
             'BallRecovery': 'o',
@@ -401,44 +358,31 @@ class MatchVisualizer:
             'Tackle': '^',
             'Foul': '*'
         }
-        color_map = {
-            'Successful': '#6DF176',
-            'Unsuccessful': 'red'
-        }
 
         # Setup visuel
-        gradient = np.linspace(0, 1, 256).reshape(-1, 1)
-        gradient = np.hstack((gradient, gradient))
-        cmap = mcolors.LinearSegmentedColormap.from_list("", [self.color1, self.color2])
-
-        fig = plt.figure(figsize=(12, 9))
-        ax = fig.add_axes([0, 0, 1, 1])
-        ax.axis('off')
-        ax.imshow(gradient, aspect='auto', cmap=cmap, extent=[0, 1, 0, 1])
+        fig, ax = new_figure((12, 9), self.color1, self.color2)
         gs = GridSpec(6, 2, width_ratios=[2, 2])
 
         # Terrain
-        pitch = VerticalPitch(pitch_type='opta', pitch_color='none', line_color='white', linewidth=2)
+        pitch = get_pitch(VerticalPitch, pitch_type='opta', pitch_color='none', line_color='white', linewidth=2)
         ax_pitch = fig.add_subplot(gs[:, 0])
         pitch.draw(ax=ax_pitch)
 
         ax_pitch.annotate('', xy=(-0.05, 0.75), xytext=(-0.05, 0.25), xycoords='axes fraction',
                           arrowprops=dict(edgecolor='white', facecolor='none', width=10, headwidth=25, headlength=25))
         
-        for event in defensive_events:
-            x, y = event['x'], event['y']
-            event_type = event['type']['displayName']
-            outcome = event['outcomeType']['displayName'] if 'outcomeType' in event else 'Successful'
-            marker = symbol_map[event_type]
-
-            if event_type == 'Foul':
-                if outcome == 'Successful':
-                    continue
-                color = 'red'
-            else:
-                color = color_map.get(outcome, '#6DF176')
-            
-            pitch.scatter(x, y, s=200, marker=marker, color=color, edgecolor='white', linewidth=1.5, ax=ax_pitch)
+        # Une couche par (type, couleur) ; sans outcomeType l'action compte comme réussie
+        failed = table.outcome_mask('Unsuccessful')
+        layers = []
+        for event_type in ('BallRecovery', 'Interception', 'Tackle'):
+            type_mask = table.type_mask(event_type)
+            layers.append((symbol_map[event_type], '#6DF176', type_mask & ~failed))
+            layers.append((symbol_map[event_type], 'red', type_mask & failed))
+        # Fautes : seules les fautes commises (non réussies) sont tracées
+        layers.append((symbol_map['Foul'], 'red', table.type_mask('Foul') & table.has_outcome() & ~successful))
+
+        for marker, color, mask in layers:
+            draw_scatter_layer(pitch, ax_pitch, table, mask, s=200, marker=marker, color=color, edgecolor='white', linewidth=1.5)
 
         legend_handles = [
             plt.Line2D([0], [0], marker='o', color='w', label='Récupération', markerfacecolor='black', markersize=15),
@@ -453,105 +397,73 @@ class MatchVisualizer:
 
         # Jauge et barres
         ax_gauge = fig.add_subplot(gs[1:5, 1], polar=True)
-        self._plot_semi_circular_gauge(ax_gauge, "Taux de passes réussies", len(successful_passes), total_passes)
+        self._plot_semi_circular_gauge(ax_gauge, "Taux de passes réussies", n_successful_passes, total_passes)
 
         ax_bar1 = fig.add_subplot(gs[3, 1])
         ax_bar2 = fig.add_subplot(gs[4, 1])
         ax_bar3 = fig.add_subplot(gs[5, 1])
 
-        self._add_horizontal_bar(ax_bar1, 'Interceptions réussies', len(successful_interceptions), len(interceptions))
-        self._add_horizontal_bar(ax_bar2, 'Tacles réussis', len(successful_tackles), len(tackles))
-        self._add_horizontal_bar(ax_bar3, 'Récupérations réussies', len(successful_ball_recoveries), len(ball_recoveries))
+        self._add_horizontal_bar(ax_bar1, 'Interceptions réussies', int(np.count_nonzero(interceptions & successful)), int(np.count_nonzero(interceptions)))
+        self._add_horizontal_bar(ax_bar2, 'Tacles réussis', int(np.count_nonzero(tackles & successful)), int(np.count_nonzero(tackles)))
+        self._add_horizontal_bar(ax_bar3, 'Récupérations réussies', int(np.count_nonzero(ball_recoveries & successful)), int(np.count_nonzero(ball_recoveries)))
 
-        plt.tight_layout()
-        plt.savefig(save_path, facecolor=fig.get_facecolor(), edgecolor='none')
-        plt.close(fig)
+        save_figure(fig, save_path, 'MatchVisualizer.plot_defensive_activity')
 
     # ==================== VISUALISATION 4: ACTIVITÉ OFFENSIVE ====================
     def plot_offensive_activity(self, save_path_pitch):
         """Activité offensive"""
-        events = self.player_data.get('events', [])
+        table = self.events_table
+        successful = table.successful()
     
-        offensive_events = [
-            event for event in events if event['type']['displayName'] in ['TakeOn', 'MissedShots', 'SavedShot', 'Goal', 'Foul', 'Pass']
-        ]
-    
-        if not offensive_events:
+        if not table.type_mask('TakeOn', 'MissedShots', 'SavedShot', 'Goal', 'Foul', 'Pass').any():
             print(f"Aucune activité offensive trouvée pour {self.player_data['player_name']}. Aucun visuel généré.")
             return
+
+        passes_mask = table.type_mask('Pass')
+        key_passes = passes_mask & table.qualifier_mask('KeyPass')
+        key_passes_successful = np.flatnonzero(key_passes & successful)
     
-        key_passes = [
-            event for event in offensive_events if event['type']['displayName'] == 'Pass' and
-            any(q['type']['displayName'] == 'KeyPass' for q in event.get('qualifiers', []))
-        ]
-        key_passes_successful = [
-            event for event in key_passes if event.get('outcomeType', {}).get('displayName') == 'Successful'
-        ]
-    
-        takeons = [event for event in offensive_events if event['type']['displayName'] == 'TakeOn']
-        successful_takeons = [event for event in takeons if event.get('outcomeType', {}).get('displayName') == 'Successful']
-    
-        missed_shots = [event for event in offensive_events if event['type']['displayName'] == 'MissedShots']
-        saved_shots = [event for event in offensive_events if event['type']['displayName'] == 'SavedShot']
-        goals = [event for event in offensive_events if event['type']['displayName'] == 'Goal']
+        takeons = table.type_mask('TakeOn')
+        n_missed_shots = len(table.indices('MissedShots'))
+        n_saved_shots = len(table.indices('SavedShot'))
+        n_goals = len(table.indices('Goal'))
     
-        passes = [event for event in events if event['type']['displayName'] == 'Pass']
-        forward_passes, lateral_passes, backward_passes, successful_passes, failed_passes = self._classify_passes(passes)
-        total_passes = len(passes)
+        n_successful_passes = int(np.count_nonzero(passes_mask & successful))
+        total_passes = int(np.count_nonzero(passes_mask))
     
         # Setup visuel
-        gradient = np.linspace(0, 1, 256).reshape(-1, 1)
-        gradient = np.hstack((gradient, gradient))
-        cmap = mcolors.LinearSegmentedColormap.from_list("", [self.color1, self.color2])
-    
-        fig = plt.figure(figsize=(12, 9))
-        ax = fig.add_axes([0, 0, 1, 1])
-        ax.axis('off')
-        ax.imshow(gradient, aspect='auto', cmap=cmap, extent=[0, 1, 0, 1])
+        fig, ax = new_figure((12, 9), self.color1, self.color2)
         gs = GridSpec(6, 2, width_ratios=[2, 2])
     
         # Terrain
-        pitch = VerticalPitch(pitch_type='opta', pitch_color='none', line_color='white', linewidth=2)
+        pitch = get_pitch(VerticalPitch, pitch_type='opta', pitch_color='none', line_color='white', linewidth=2)
         ax_pitch = fig.add_subplot(gs[:, 0])
         pitch.draw(ax=ax_pitch)
     
         ax_pitch.annotate('', xy=(-0.05, 0.75), xytext=(-0.05, 0.25), xycoords='axes fraction',
                           arrowprops=dict(edgecolor='white', facecolor='none', width=10, headwidth=25, headlength=25))
     
-        for event in offensive_events:
-            x, y = event['x'], event['y']
-            event_type = event['type']['displayName']
-            outcome = event['outcomeType']['displayName']
-    
-            if event_type == 'TakeOn':
-                marker = 's'
-                color = '#6DF176' if outcome == 'Successful' else 'red'
-                pitch.scatter(x, y, s=200, marker=marker, color=color, edgecolor='white', linewidth=1.5, ax=ax_pitch)
-    
-            elif event_type in ['MissedShots', 'SavedShot', 'Goal']:
-                marker = 'o'
-                color = '#6DF176' if event_type == 'Goal' else 'red'
-                pitch.scatter(x, y, s=200, marker=marker, color=color, edgecolor='white', linewidth=1.5, ax=ax_pitch)
-    
-                goalmouth_y = next((float(q['value']) for q in event['qualifiers'] if q['type']['displayName'] == 'GoalMouthY'), None)
-                if goalmouth_y is not None:
-                    end_x = 100
-                    end_y = (goalmouth_y / 100) * pitch.dim.pitch_length
-                    pitch.arrows(x, y, end_x, end_y, width=2, headwidth=3, headlength=3, color=color, ax=ax_pitch)
-    
-            elif event_type == 'Foul':
-                marker = '*'
-                color = '#6DF176'
-                if outcome == 'Successful':
-                    pitch.scatter(x, y, s=200, marker=marker, color=color, edgecolor='white', linewidth=1.5, ax=ax_pitch)
-    
-        for pass_event in key_passes_successful:
-            x_start, y_start = pass_event['x'], pass_event['y']
-            x_end = next((float(q['value']) for q in pass_event['qualifiers'] if q['type']['displayName'] == 'PassEndX'), None)
-            y_end = next((float(q['value']) for q in pass_event['qualifiers'] if q['type']['displayName'] == 'PassEndY'), None)
-    
-            if x_end is not None and y_end is not None:
-                pitch.arrows(x_start, y_start, x_end, y_end, width=2, headwidth=3, headlength=3, color='#6DF176', ax=ax_pitch)
+        # Tirs : flèche vers le point d'arrivée dans le but (qualifier GoalMouthY)
+        goals_mask = table.type_mask('Goal')
+        missed_or_saved = table.type_mask('MissedShots', 'SavedShot')
+        shot_end_x = np.full(len(table), 100.0)
+        shot_end_y = table.qualifier_column('GoalMouthY') / 100 * pitch.dim.pitch_length
+
+        marker_style = dict(s=200, edgecolor='white', linewidth=1.5)
+        draw_scatter_layer(pitch, ax_pitch, table, takeons & successful, marker='s', color='#6DF176', **marker_style)
+        draw_scatter_layer(pitch, ax_pitch, table, takeons & ~successful, marker='s', color='red', **marker_style)
+        draw_scatter_layer(pitch, ax_pitch, table, goals_mask, marker='o', color='#6DF176', **marker_style)
+        draw_scatter_layer(pitch, ax_pitch, table, missed_or_saved, marker='o', color='red', **marker_style)
+        draw_scatter_layer(pitch, ax_pitch, table, table.type_mask('Foul') & successful, marker='*', color='#6DF176', **marker_style)
+
+        arrow_style = dict(width=2, headwidth=3, headlength=3)
+        for color, shots in (('#6DF176', goals_mask), ('red', missed_or_saved)):
+            draw_arrow_layer(pitch, ax_pitch, table, shots, end_x=shot_end_x, end_y=shot_end_y, color=color, **arrow_style)
+
+        # Passes clés réussies : arrivée lue dans les qualifiers PassEndX / PassEndY
+        draw_arrow_layer(pitch, ax_pitch, table, key_passes & successful,
+                         end_x=table.qualifier_column('PassEndX'), end_y=table.qualifier_column('PassEndY'),
+                         color='#6DF176', **arrow_style)
     
         legend_handles = [
             plt.Line2D([0], [0], marker='s', color='w', label='Dribble', markerfacecolor='black', markersize=15),
@@ -566,59 +478,42 @@ class MatchVisualizer:
 
         # Jauge et barres
         ax_gauge = fig.add_subplot(gs[1:5, 1], polar=True)
-        self._plot_semi_circular_gauge(ax_gauge, "Taux de passes réussies", len(successful_passes), total_passes)
+        self._plot_semi_circular_gauge(ax_gauge, "Taux de passes réussies", n_successful_passes, total_passes)
     
         ax_bar1 = fig.add_subplot(gs[3, 1])
         ax_bar2 = fig.add_subplot(gs[4, 1])
         ax_bar3 = fig.add_subplot(gs[5, 1])
     
-        self._add_horizontal_bar(ax_bar1, 'Dribbles réussis', len(successful_takeons), len(takeons))
-        self._add_horizontal_bar(ax_bar2, 'Passes clés', len(key_passes_successful), len(key_passes))      
-        self._add_horizontal_bar(ax_bar3, 'Tirs cadrés', len(saved_shots) + len(goals), len(missed_shots) + len(goals) + len(saved_shots))
+        self._add_horizontal_bar(ax_bar1, 'Dribbles réussis', int(np.count_nonzero(takeons & successful)), int(np.count_nonzero(takeons)))
+        self._add_horizontal_bar(ax_bar2, 'Passes clés', len(key_passes_successful), int(np.count_nonzero(key_passes)))      
+        self._add_horizontal_bar(ax_bar3, 'Tirs cadrés', n_saved_shots + n_goals, n_missed_shots + n_goals + n_saved_shots)
 
-        plt.tight_layout()
-        plt.savefig(save_path_pitch, facecolor=fig.get_facecolor(), edgecolor='none')
-        plt.close(fig)
+        save_figure(fig, save_path_pitch, 'MatchVisualizer.plot_offensive_activity')
 
     # ==================== VISUALISATION 5: ACTIONS PROGRESSIVES ====================
     def plot_progressive_actions(self, save_path):
         """Passes progressives et courses progressives"""
-        events = self.player_data.get('events', [])
-        
-        progressive_passes = []
-        progressive_carries = []
+        table = self.events_table
+        successful = table.successful()
         
-        # Détection passes progressives (progression >= 10m vers l'avant)
-        for e in events:
-            if e.get('type', {}).get('displayName') == 'Pass' and 'x' in e:
-                x_start = e.get('x', 0)
-                x_end = e.get('endX', x_start)
-                
-                if x_end - x_start >= 10 and e.get('outcomeType', {}).get('displayName') == 'Successful':
-                    progressive_passes.append(e)
+        # Passes progressives (progression >= 10m vers l'avant, voir pass_classifier)
+        progressive_passes = table.type_mask('Pass') & table.pass_classes()['progressive']
+        n_progressive_passes = int(np.count_nonzero(progressive_passes))
         
-        # Détection courses progressives (dribbles réussis)
-        for e in events:
-            if e.get('type', {}).get('displayName') == 'TakeOn' and 'x' in e:
-                if e.get('outcomeType', {}).get('displayName') == 'Successful':
-                    progressive_carries.append(e)
+        # Courses progressives (dribbles réussis)
+        progressive_carries = table.type_mask('TakeOn') & table.has_x & successful
+        n_progressive_carries = int(np.count_nonzero(progressive_carries))
         
-        passes = [event for event in events if event['type']['displayName'] == 'Pass']
-        forward_passes, lateral_passes, backward_passes, successful_passes, failed_passes = self._classify_passes(passes)
+        passes_mask = table.type_mask('Pass')
+        n_passes = int(np.count_nonzero(passes_mask))
+        n_successful_passes = int(np.count_nonzero(passes_mask & successful))
         
         # Setup visuel
-        gradient = np.linspace(0, 1, 256).reshape(-1, 1)
-        gradient = np.hstack((gradient, gradient))
-        cmap = mcolors.LinearSegmentedColormap.from_list("", [self.color1, self.color2])
-        
-        fig = plt.figure(figsize=(12, 9))
-        ax = fig.add_axes([0, 0, 1, 1])
-        ax.axis('off')
-        ax.imshow(gradient, aspect='auto', cmap=cmap, extent=[0, 1, 0, 1])
+        fig, ax = new_figure((12, 9), self.color1, self.color2)
         gs = GridSpec(6, 2, width_ratios=[2, 2])
         
         # Terrain
-        pitch = VerticalPitch(pitch_type='opta', pitch_color='none', line_color='white', linewidth=2)
+        pitch = get_pitch(VerticalPitch, pitch_type='opta', pitch_color='none', line_color='white', linewidth=2)
         ax_pitch = fig.add_subplot(gs[:, 0])
         pitch.draw(ax=ax_pitch)
         
@@ -626,21 +521,12 @@ class MatchVisualizer:
                           arrowprops=dict(edgecolor='white', facecolor='none', width=10, headwidth=25, headlength=25))
         
         # Passes progressives (flèches dorées - même taille que les autres plots)
-        for pas in progressive_passes:
-            if 'x' in pas and 'endX' in pas:
-                y_start = pas['x']
-                x_start = pas['y']
-                y_end = pas['endX']
-                x_end = pas['endY']
-                pitch.arrows(y_start, x_start, y_end, x_end, width=3, headwidth=5, headlength=5, 
-                           color='#FFD700', alpha=0.8, ax=ax_pitch, zorder=3)
+        draw_arrow_layer(pitch, ax_pitch, table, progressive_passes, width=3, headwidth=5, headlength=5,
+                         color='#FFD700', alpha=0.8, zorder=3)
         
         # Courses progressives (triangles cyan plus gros)
-        for carry in progressive_carries:
-            y = carry['x']
-            x = carry['y']
-            pitch.scatter(y, x, s=600, marker='>', color='#00FFFF', edgecolor='white', 
-                        linewidth=2, ax=ax_pitch, zorder=3)
+        draw_scatter_layer(pitch, ax_pitch, table, progressive_carries, s=600, marker='>', color='#00FFFF',
+                           edgecolor='white', linewidth=2, zorder=3)
         
         legend_handles = [
             plt.Line2D([0], [0], color='#FFD700', lw=4, label='Passe progressive'),
@@ -657,60 +543,50 @@ class MatchVisualizer:
         # Jauge et barres
         ax_gauge = fig.add_subplot(gs[1:5, 1], polar=True)
         self._plot_semi_circular_gauge(ax_gauge, "Taux de passes réussies", 
-                                      len(successful_passes), len(passes))
+                                      n_successful_passes, n_passes)
         
         ax_bar1 = fig.add_subplot(gs[3, 1])
         ax_bar2 = fig.add_subplot(gs[4, 1])
         ax_bar3 = fig.add_subplot(gs[5, 1])
         
-        total_progressive = len(progressive_passes) + len(progressive_carries)
+        total_progressive = n_progressive_passes + n_progressive_carries
         
-        self._add_horizontal_bar(ax_bar1, 'Passes progressives', len(progressive_passes), len(successful_passes))
-        self._add_horizontal_bar(ax_bar2, 'Courses progressives', len(progressive_carries), len(progressive_carries))
+        self._add_horizontal_bar(ax_bar1, 'Passes progressives', n_progressive_passes, n_successful_passes)
+        self._add_horizontal_bar(ax_bar2, 'Courses progressives', n_progressive_carries, n_progressive_carries)
         self._add_horizontal_bar(ax_bar3, 'Total progressions', total_progressive, total_progressive)
         
-        plt.tight_layout()
-        plt.savefig(save_path, facecolor=fig.get_facecolor(), edgecolor='none')
-        plt.close(fig)
+        save_figure(fig, save_path, 'MatchVisualizer.plot_progressive_actions')
 
     # ==================== VISUALISATION 6: DOMINANCE TERRAIN ====================
     def plot_zone_dominance(self, save_path):
         """Dominance par zone du terrain"""
-        events = self.player_data.get('events', [])
+        table = self.events_table
+        successful = table.successful()
         
         # Calcul des touches par zone
-        zones = {'defensive': [], 'middle': [], 'offensive': []}
-        
-        for e in events:
-            if 'x' in e:
-                if e['x'] < 33:
-                    zones['defensive'].append(e)
-                elif e['x'] < 66:
-                    zones['middle'].append(e)
-                else:
-                    zones['offensive'].append(e)
+        zone = table.pass_classes()['zone']
+        zones = {
+            'defensive': zone == ZONE_DEFENSIVE,
+            'middle': zone == ZONE_MIDDLE,
+            'offensive': zone == ZONE_OFFENSIVE,
+        }
+        counts = {name: int(np.count_nonzero(mask)) for name, mask in zones.items()}
         
-        total_touches = len(events)
-        defensive_pct = (len(zones['defensive']) / total_touches * 100) if total_touches > 0 else 0
-        middle_pct = (len(zones['middle']) / total_touches * 100) if total_touches > 0 else 0
-        offensive_pct = (len(zones['offensive']) / total_touches * 100) if total_touches > 0 else 0
+        total_touches = len(table)
+        defensive_pct = (counts['defensive'] / total_touches * 100) if total_touches > 0 else 0
+        middle_pct = (counts['middle'] / total_touches * 100) if total_touches > 0 else 0
+        offensive_pct = (counts['offensive'] / total_touches * 100) if total_touches > 0 else 0
         
-        passes = [event for event in events if event['type']['displayName'] == 'Pass']
-        forward_passes, lateral_passes, backward_passes, successful_passes, failed_passes = self._classify_passes(passes)
+        passes_mask = table.type_mask('Pass')
+        n_passes = int(np.count_nonzero(passes_mask))
+        n_successful_passes = int(np.count_nonzero(passes_mask & successful))
         
         # Setup visuel
-        gradient = np.linspace(0, 1, 256).reshape(-1, 1)
-        gradient = np.hstack((gradient, gradient))
-        cmap = mcolors.LinearSegmentedColormap.from_list("", [self.color1, self.color2])
-        
-        fig = plt.figure(figsize=(12, 9))
-        ax = fig.add_axes([0, 0, 1, 1])
-        ax.axis('off')
-        ax.imshow(gradient, aspect='auto', cmap=cmap, extent=[0, 1, 0, 1])
+        fig, ax = new_figure((12, 9), self.color1, self.color2)
         gs = GridSpec(6, 2, width_ratios=[2, 2])
         
         # Terrain avec zones colorées
-        pitch = VerticalPitch(pitch_type='opta', pitch_color='none', line_color='white', linewidth=2)
+        pitch = get_pitch(VerticalPitch, pitch_type='opta', pitch_color='none', line_color='white', linewidth=2)
         ax_pitch = fig.add_subplot(gs[:, 0])
         pitch.draw(ax=ax_pitch)
         
@@ -718,21 +594,10 @@ class MatchVisualizer:
         pitch.lines(33, 0, 33, 100, lw=3, color='white', alpha=0.5, linestyle='--', ax=ax_pitch)
         pitch.lines(66, 0, 66, 100, lw=3, color='white', alpha=0.5, linestyle='--', ax=ax_pitch)
         
-        # Afficher les touches avec un code couleur par zone
-        for e in zones['defensive']:
-            if 'x' in e:
-                pitch.scatter(e['x'], e['y'], s=100, marker='o', color='#FF6B6B', 
-                            alpha=0.3, edgecolor='white', linewidth=0.5, ax=ax_pitch)
-        
-        for e in zones['middle']:
-            if 'x' in e:
-                pitch.scatter(e['x'], e['y'], s=100, marker='o', color='#FFD93D', 
-                            alpha=0.3, edgecolor='white', linewidth=0.5, ax=ax_pitch)
-        
-        for e in zones['offensive']:
-            if 'x' in e:
-                pitch.scatter(e['x'], e['y'], s=100, marker='o', color='#6DF176', 
-                            alpha=0.3, edgecolor='white', linewidth=0.5, ax=ax_pitch)
+        # Afficher les touches avec un code couleur par zone (une couche par zone)
+        for name, color in (('defensive', '#FF6B6B'), ('middle', '#FFD93D'), ('offensive', '#6DF176')):
+            draw_scatter_layer(pitch, ax_pitch, table, zones[name], s=100, marker='o', color=color,
+                               alpha=0.3, edgecolor='white', linewidth=0.5)
         
         # Annotations des zones (utiliser pitch.text() pour VerticalPitch)
         pitch.text(16.5, 50, f'ZONE\nDÉFENSIVE\n{defensive_pct:.1f}%', 
@@ -765,78 +630,54 @@ class MatchVisualizer:
         # Jauge et barres
         ax_gauge = fig.add_subplot(gs[1:5, 1], polar=True)
         self._plot_semi_circular_gauge(ax_gauge, "Taux de passes réussies", 
-                                      len(successful_passes), len(passes))
+                                      n_successful_passes, n_passes)
         
         ax_bar1 = fig.add_subplot(gs[3, 1])
         ax_bar2 = fig.add_subplot(gs[4, 1])
         ax_bar3 = fig.add_subplot(gs[5, 1])
         
-        self._add_horizontal_bar(ax_bar1, 'Zone défensive', len(zones['defensive']), total_touches)
-        self._add_horizontal_bar(ax_bar2, 'Zone médiane', len(zones['middle']), total_touches)
-        self._add_horizontal_bar(ax_bar3, 'Zone offensive', len(zones['offensive']), total_touches)
+        self._add_horizontal_bar(ax_bar1, 'Zone défensive', counts['defensive'], total_touches)
+        self._add_horizontal_bar(ax_bar2, 'Zone médiane', counts['middle'], total_touches)
+        self._add_horizontal_bar(ax_bar3, 'Zone offensive', counts['offensive'], total_touches)
         
-        plt.tight_layout()
-        plt.savefig(save_path, facecolor=fig.get_facecolor(), edgecolor='none')
-        plt.close(fig)
+        save_figure(fig, save_path, 'MatchVisualizer.plot_zone_dominance')
 
     def plot_player_pass_connections(self, save_path):
-        """Connexions de passes du joueur vers ses partenaires principaux"""
-        events = self.player_data.get('events', [])
-        
-        # Extraire toutes les passes
-        passes = [e for e in events if e.get('type', {}).get('displayName') == 'Pass']
-        
-        if not passes:
+        """
+        Connexions de passes du joueur vers ses partenaires principaux.
+        Les receveurs viennent de pass_connections, calculé à l'extraction sur
+        tous les événements du match (voir pass_network.PassPairings).
+        """
+        table = self.events_table
+        passes = table.type_mask('Pass')
+        
+        if not passes.any():
             print("Aucune passe trouvée")
             return
         
         # Position moyenne du joueur
-        player_x = np.mean([p['x'] for p in passes if 'x' in p])
-        player_y = np.mean([p['y'] for p in passes if 'y' in p])
-        
-        # Analyser les récepteurs (via événement suivant)
-        receivers = {}  # {playerId: {'count': int, 'successful': int, 'positions': [(x,y)]}}
+        player_x = np.nanmean(table.x[passes])
+        player_y = np.nanmean(table.y[passes])
         
-        for i, pas in enumerate(passes):
-            if pas.get('outcomeType', {}).get('displayName') != 'Successful':
-                continue
-                
-            # Chercher l'événement suivant (même équipe)
-            for next_event in events[i+1:i+5]:  # Regarder les 5 prochains événements
-                if (next_event.get('teamId') == pas.get('teamId') and 
-                    next_event.get('playerId') != pas.get('playerId') and
-                    'x' in next_event):
-                    
-                    receiver_id = next_event['playerId']
-                    
-                    if receiver_id not in receivers:
-                        receivers[receiver_id] = {'count': 0, 'successful': 0, 'positions': []}
-                    
-                    receivers[receiver_id]['count'] += 1
-                    receivers[receiver_id]['successful'] += 1
-                    receivers[receiver_id]['positions'].append((next_event['x'], next_event['y']))
-                    break
+        connections = self.player_data.get('pass_connections')
+        if connections is None:
+            print("Receveurs des passes absents du fichier joueur (extraction antérieure) : relancer l'extraction.")
+            return
         
         # Top 5 récepteurs
-        top_receivers = sorted(receivers.items(), key=lambda x: x[1]['count'], reverse=True)[:5]
+        top_receivers = [(c['playerId'], {'count': c['count'], 'x': c['x'], 'y': c['y'], 'name': c.get('name')})
+                         for c in connections[:5]]
         
         if not top_receivers:
             print("Aucune connexion trouvée")
             return
         
         # Setup visuel
-        gradient = np.linspace(0, 1, 256).reshape(-1, 1)
-        gradient = np.hstack((gradient, gradient))
-        cmap_bg = mcolors.LinearSegmentedColormap.from_list("", [self.color1, self.color2])
-        
-        fig = plt.figure(figsize=(12, 9))
-        ax = fig.add_axes([0, 0, 1, 1])
-        ax.axis('off')
-        ax.imshow(gradient, aspect='auto', cmap=cmap_bg, extent=[0, 1, 0, 1])
+        fig, ax = new_figure((12, 9), self.color1, self.color2)
         gs = GridSpec(6, 2, width_ratios=[2, 2])
         
         # Terrain
-        pitch = VerticalPitch(pitch_type='opta', pitch_color='none', line_color='white', linewidth=2)
+        pitch = get_pitch(VerticalPitch, pitch_type='opta', pitch_color='none', line_color='white', linewidth=2)
         ax_pitch = fig.add_subplot(gs[:, 0])
         pitch.draw(ax=ax_pitch)
         
@@ -856,11 +697,9 @@ class MatchVisualizer:
         # Flèches vers les récepteurs
         for idx, (receiver_id, data) in enumerate(top_receivers):
             count = data['count']
-            positions = data['positions']
             
-            # Position moyenne du récepteur
-            rec_x = np.mean([p[0] for p in positions])
-            rec_y = np.mean([p[1] for p in positions])
+            # Position moyenne de réception
+            rec_x, rec_y = data['x'], data['y']
             
             # Couleur selon le rang (1er = vert, 5e = rouge)
             color = cmap_arrows(1 - idx / 5)
@@ -888,8 +727,8 @@ class MatchVisualizer:
                ha='left', transform=ax.transAxes, alpha=0.8)
         
         # Stats à droite
-        total_passes = len(passes)
-        successful_passes = len([p for p in passes if p.get('outcomeType', {}).get('displayName') == 'Successful'])
+        total_passes = int(np.count_nonzero(passes))
+        successful_passes = int(np.count_nonzero(passes & table.successful()))
         success_rate = (successful_passes / total_passes * 100) if total_passes > 0 else 0
         
         # Jauge semi-circulaire
@@ -906,22 +745,28 @@ class MatchVisualizer:
             receiver_id, data = top_receivers[i]
             count = data['count']
             max_count = top_receivers[0][1]['count']
-            self._add_horizontal_bar(bars[i], f"Partenaire #{i+1}", count, max_count)
+            self._add_horizontal_bar(bars[i], data['name'] or f"Partenaire #{i+1}", count, max_count)
         
         # Remplir les barres vides si < 3 récepteurs
         for i in range(len(top_receivers), 3):
             bars[i].axis('off')
         
-        plt.tight_layout()
-        plt.savefig(save_path, facecolor=fig.get_facecolor(), edgecolor='none')
-        plt.close(fig)
+        save_figure(fig, save_path, 'MatchVisualizer.plot_player_pass_connections')
 
 
 # ==================== SEASON VISUALIZER ====================
 class SeasonVisualizer:
-    def __init__(self, player_data_path, competition, color1, color2, match_name, match_teams):
+    def __init__(self, player_data_path, competition, color1, color2, match_name, match_teams, player_data=None):
         self.player_data_path = player_data_path
-        self.player_data = self._load_player_data()
+        # player_data : données déjà chargées (ex. partagées par render_scheduler), sinon
+        # colonnes memmap (format colonnaire ou fichier compagnon), à défaut lecture du fichier
+        opened = open_player_table(player_data_path) if player_data is None and player_data_path else None
+        if opened:
+            self.player_data, self.events_table = opened
+        else:
+            self.player_data = player_data if player_data is not None else self._load_player_data()
+            # Table colonnaire construite une fois et partagée par toutes les visualisations
+            self.events_table = EventTable(self.player_data.get('events', []))
         self.competition = competition
         self.color1 = color1
         self.color2 = color2
@@ -929,9 +774,8 @@ class SeasonVisualizer:
         self.match_teams = match_teams
 
     def _load_player_data(self):
-        with open(self.player_data_path, 'r') as file:
-            data = json.load(file)
-        return data
+        # JSON, JSON compressé ou colonnaire selon le fichier présent
+        return read_player_data(self.player_data_path)
 
     def _add_horizontal_bar(self, ax, label, value, max_value):
         bar_height = 0.2
@@ -953,47 +797,32 @@ class SeasonVisualizer:
             return
 
         total_matches = 1
-        events = self.player_data.get('events', [])
-        
-        offensive_events = [e for e in events if e.get('type', {}).get('displayName') in ['TakeOn', 'Goal', 'Pass']]
-        takeons = [e for e in offensive_events if e['type']['displayName'] == 'TakeOn']
-        successful_takeons = [e for e in takeons if e.get('outcomeType', {}).get('displayName') == 'Successful']
-        goals = [e for e in offensive_events if e['type']['displayName'] == 'Goal']
-
-        defensive_events = [e for e in events if e.get('type', {}).get('displayName') in ['BallRecovery', 'Interception']]
-        ball_recoveries = [e for e in defensive_events if e['type']['displayName'] == 'BallRecovery']
-        successful_ball_recoveries = [e for e in ball_recoveries if e.get('outcomeType', {}).get('displayName') == 'Successful']
-        interceptions = [e for e in defensive_events if e['type']['displayName'] == 'Interception']
-        successful_interceptions = [e for e in interceptions if e.get('outcomeType', {}).get('displayName') == 'Successful']
-
-        key_passes = [e for e in offensive_events if e['type']['displayName'] == 'Pass' and any(q['type']['displayName'] == 'KeyPass' for q in e.get('qualifiers', []))]
-        key_passes_successful = [e for e in key_passes if e.get('outcomeType', {}).get('displayName') == 'Successful']
-
-        fig = plt.figure(figsize=(16, 16))
-        gradient = np.linspace(0, 1, 256).reshape(-1, 1)
-        gradient = np.hstack((gradient, gradient))
-        cmap = mcolors.LinearSegmentedColormap.from_list("", [self.color1, self.color2])
-        ax = fig.add_axes([0, 0, 1, 1])
-        ax.axis('off')
-        ax.imshow(gradient, aspect='auto', cmap=cmap, extent=[0, 1, 0, 1])
+        table = self.events_table
+        successful = table.successful()
+        
+        successful_takeons = table.type_mask('TakeOn') & successful
+        goals = table.type_mask('Goal')
+        n_takeons = int(np.count_nonzero(successful_takeons))
+        n_goals = int(np.count_nonzero(goals))
+
+        successful_ball_recoveries = table.type_mask('BallRecovery') & successful
+        successful_interceptions = table.type_mask('Interception') & successful
+        n_ball_recoveries = int(np.count_nonzero(successful_ball_recoveries))
+
+        n_key_passes_successful = int(np.count_nonzero(table.type_mask('Pass') & table.qualifier_mask('KeyPass') & successful))
+
+        fig, ax = new_figure((16, 16), self.color1, self.color2)
         gs = GridSpec(7, 2, height_ratios=[1, 1, 1, 1, 4, 4, 4])
 
-        image_path = PlayerProfileScraper(self.player_data['player_name']).save_player_profile()
-        try:
-            player_photo = mpimg.imread(image_path)
-            ax_image = fig.add_subplot(gs[:4, 0])
-            ax_image.imshow(player_photo, aspect='equal')
-            ax_image.set_anchor('W')
-            ax_image.axis('off')
-        except:
-            pass
+        image_path = player_photo_path(self.player_data)
+        add_photo(fig, gs[:4, 0], image_path)
 
         y_position = 0.96
         y_step = 0.03
         text_items = [
             f"{self.player_data['player_name']}",
             f"Saison {self.match_name}",
-            f"{len(goals)} but(s)" if len(goals) >= 1 else None,
+            f"{n_goals} but(s)" if n_goals >= 1 else None,
             f"{total_matches} match(s)",
         ]
 
@@ -1010,10 +839,10 @@ class SeasonVisualizer:
         ax_bar4 = fig.add_subplot(gs[3, 1])
 
         selected_stats = [
-            ("Buts", len(goals), len(goals)),
-            ('Dribbles', len(successful_takeons), len(successful_takeons)),
-            ('Passes clés', len(key_passes_successful), len(key_passes_successful)),
-            ('Récuperations', len(successful_ball_recoveries), len(successful_ball_recoveries)),
+            ("Buts", n_goals, n_goals),
+            ('Dribbles', n_takeons, n_takeons),
+            ('Passes clés', n_key_passes_successful, n_key_passes_successful),
+            ('Récuperations', n_ball_recoveries, n_ball_recoveries),
         ]
 
         ax_bars = [ax_bar1, ax_bar2, ax_bar3, ax_bar4]
@@ -1021,76 +850,38 @@ class SeasonVisualizer:
             label, value, total = selected_stats[i]
             self._add_horizontal_bar(ax_bars[i], label, value, max(total, 1))
 
-        pitch = Pitch(pitch_type='opta', pitch_color='none', line_color='white', linewidth=2)
+        pitch = get_pitch(Pitch, pitch_type='opta', pitch_color='none', line_color='white', linewidth=2)
         ax_pitch = fig.add_subplot(gs[4:, :])
         pitch.draw(ax=ax_pitch)
         
         color_success = "#78ff00"
         marker_size = 600
 
-        for e in successful_takeons:
-            if 'x' in e:
-                pitch.scatter(e['x'], e['y'], s=marker_size, marker='s', color=color_success, edgecolor='white', linewidth=2, ax=ax_pitch)
-
-        for e in goals:
-            if 'x' in e:
-                pitch.scatter(e['x'], e['y'], s=marker_size, marker='o', color=color_success, edgecolor='white', linewidth=2, ax=ax_pitch)
+        for marker, mask in (('s', successful_takeons), ('o', goals), ('*', successful_interceptions), ('P', successful_ball_recoveries)):
+            draw_scatter_layer(pitch, ax_pitch, table, mask, s=marker_size, marker=marker, color=color_success, edgecolor='white', linewidth=2)
 
-        for e in successful_interceptions:
-            if 'x' in e:
-                pitch.scatter(e['x'], e['y'], s=marker_size, marker='*', color=color_success, edgecolor='white', linewidth=2, ax=ax_pitch)
-
-        for e in successful_ball_recoveries:
-            if 'x' in e:
-                pitch.scatter(e['x'], e['y'], s=marker_size, marker='P', color=color_success, edgecolor='white', linewidth=2, ax=ax_pitch)
-
-        plt.tight_layout()
-        plt.savefig(save_path, facecolor=fig.get_facecolor(), edgecolor='none')
-        plt.close(fig)
+        save_figure(fig, save_path, 'SeasonVisualizer.plot_passes_heatmap_and_bar_charts')
 
     def plot_progressive_actions(self, save_path):
         """Passes progressives et courses progressives - Saison"""
-        events = self.player_data.get('events', [])
-        
-        progressive_passes = []
-        progressive_carries = []
+        table = self.events_table
+        successful = table.successful()
         
-        # Détection passes progressives (progression >= 10m vers l'avant)
-        for e in events:
-            if e.get('type', {}).get('displayName') == 'Pass' and 'x' in e:
-                x_start = e.get('x', 0)
-                x_end = e.get('endX', x_start)
-                
-                if x_end - x_start >= 10 and e.get('outcomeType', {}).get('displayName') == 'Successful':
-                    progressive_passes.append(e)
+        # Passes progressives (progression >= 10m vers l'avant, voir pass_classifier)
+        progressive_passes = table.type_mask('Pass') & table.pass_classes()['progressive']
+        n_progressive_passes = int(np.count_nonzero(progressive_passes))
         
-        # Détection courses progressives (dribbles réussis)
-        for e in events:
-            if e.get('type', {}).get('displayName') == 'TakeOn' and 'x' in e:
-                if e.get('outcomeType', {}).get('displayName') == 'Successful':
-                    progressive_carries.append(e)
+        # Courses progressives (dribbles réussis)
+        progressive_carries = table.type_mask('TakeOn') & table.has_x & successful
+        n_progressive_carries = int(np.count_nonzero(progressive_carries))
         
         # Setup visuel
-        gradient = np.linspace(0, 1, 256).reshape(-1, 1)
-        gradient = np.hstack((gradient, gradient))
-        cmap = mcolors.LinearSegmentedColormap.from_list("", [self.color1, self.color2])
-        
-        fig = plt.figure(figsize=(16, 16))
-        ax = fig.add_axes([0, 0, 1, 1])
-        ax.axis('off')
-        ax.imshow(gradient, aspect='auto', cmap=cmap, extent=[0, 1, 0, 1])
+        fig, ax = new_figure((16, 16), self.color1, self.color2)
         gs = GridSpec(7, 2, height_ratios=[1, 1, 1, 1, 4, 4, 4])
         
         # Photo joueur
-        image_path = PlayerProfileScraper(self.player_data['player_name']).save_player_profile()
-        try:
-            player_photo = mpimg.imread(image_path)
-            ax_image = fig.add_subplot(gs[:4, 0])
-            ax_image.imshow(player_photo, aspect='equal')
-            ax_image.set_anchor('W')
-            ax_image.axis('off')
-        except:
-            pass
+        image_path = player_photo_path(self.player_data)
+        add_photo(fig, gs[:4, 0], image_path)
 
         # Infos
         y_position = 0.96
@@ -1098,8 +889,8 @@ class SeasonVisualizer:
         text_items = [
             f"{self.player_data['player_name']}",
             f"Saison {self.match_name}",
-            f"{len(progressive_passes)} passes progressives",
-            f"{len(progressive_carries)} courses progressives",
+            f"{n_progressive_passes} passes progressives",
+            f"{n_progressive_carries} courses progressives",
         ]
 
         for text in text_items:
@@ -1115,11 +906,11 @@ class SeasonVisualizer:
         ax_bar3 = fig.add_subplot(gs[2, 1])
         ax_bar4 = fig.add_subplot(gs[3, 1])
 
-        total_progressive = len(progressive_passes) + len(progressive_carries)
+        total_progressive = n_progressive_passes + n_progressive_carries
         
         selected_stats = [
-            ("Passes progressives", len(progressive_passes), len(progressive_passes)),
-            ('Courses progressives', len(progressive_carries), len(progressive_carries)),
+            ("Passes progressives", n_progressive_passes, n_progressive_passes),
+            ('Courses progressives', n_progressive_carries, n_progressive_carries),
             ('Total progressions', total_progressive, total_progressive),
             ('N/A', 0, 0),
         ]
@@ -1131,7 +922,7 @@ class SeasonVisualizer:
                 self._add_horizontal_bar(ax_bars[i], label, value, max(total, 1))
         
         # Terrain
-        pitch = Pitch(pitch_type='opta', pitch_color='none', line_color='white', linewidth=2)
+        pitch = get_pitch(Pitch, pitch_type='opta', pitch_color='none', line_color='white', linewidth=2)
         ax_pitch = fig.add_subplot(gs[4:, :])
         pitch.draw(ax=ax_pitch)
         
@@ -1139,21 +930,12 @@ class SeasonVisualizer:
                           arrowprops=dict(edgecolor='white', facecolor='none', width=10, headwidth=25, headlength=25))
         
         # Passes progressives (flèches dorées)
-        for pas in progressive_passes:
-            if 'x' in pas and 'endX' in pas:
-                x_start = pas['x']
-                y_start = pas['y']
-                x_end = pas['endX']
-                y_end = pas['endY']
-                pitch.arrows(x_start, y_start, x_end, y_end, width=4, headwidth=6, headlength=6, 
-                           color='#FFD700', alpha=0.6, ax=ax_pitch, zorder=3)
+        draw_arrow_layer(pitch, ax_pitch, table, progressive_passes, width=4, headwidth=6, headlength=6,
+                         color='#FFD700', alpha=0.6, zorder=3)
         
         # Courses progressives (triangles cyan)
-        for carry in progressive_carries:
-            x = carry['x']
-            y = carry['y']
-            pitch.scatter(x, y, s=600, marker='>', color='#00FFFF', edgecolor='white', 
-                        linewidth=2, ax=ax_pitch, zorder=3)
+        draw_scatter_layer(pitch, ax_pitch, table, progressive_carries, s=600, marker='>', color='#00FFFF',
+                           edgecolor='white', linewidth=2, zorder=3)
         
         legend_handles = [
             plt.Line2D([0], [0], color='#FFD700', lw=4, label='Passe progressive'),
@@ -1162,52 +944,33 @@ class SeasonVisualizer:
         ]
         ax_pitch.legend(handles=legend_handles, loc='upper center', bbox_to_anchor=(0.5, 0.96), ncol=2, fontsize=12)
         
-        plt.tight_layout()
-        plt.savefig(save_path, facecolor=fig.get_facecolor(), edgecolor='none')
-        plt.close(fig)
+        save_figure(fig, save_path, 'SeasonVisualizer.plot_progressive_actions')
 
     def plot_zone_dominance(self, save_path):
         """Dominance par zone du terrain - Saison"""
-        events = self.player_data.get('events', [])
+        table = self.events_table
         
         # Calcul des touches par zone
-        zones = {'defensive': [], 'middle': [], 'offensive': []}
-        
-        for e in events:
-            if 'x' in e:
-                if e['x'] < 33:
-                    zones['defensive'].append(e)
-                elif e['x'] < 66:
-                    zones['middle'].append(e)
-                else:
-                    zones['offensive'].append(e)
-        
-        total_touches = len(events)
-        defensive_pct = (len(zones['defensive']) / total_touches * 100) if total_touches > 0 else 0
-        middle_pct = (len(zones['middle']) / total_touches * 100) if total_touches > 0 else 0
-        offensive_pct = (len(zones['offensive']) / total_touches * 100) if total_touches > 0 else 0
+        zone = table.pass_classes()['zone']
+        zones = {
+            'defensive': zone == ZONE_DEFENSIVE,
+            'middle': zone == ZONE_MIDDLE,
+            'offensive': zone == ZONE_OFFENSIVE,
+        }
+        counts = {name: int(np.count_nonzero(mask)) for name, mask in zones.items()}
         
-        # Setup visuel
-        gradient = np.linspace(0, 1, 256).reshape(-1, 1)
-        gradient = np.hstack((gradient, gradient))
-        cmap = mcolors.LinearSegmentedColormap.from_list("", [self.color1, self.color2])
+        total_touches = len(table)
+        defensive_pct = (counts['defensive'] / total_touches * 100) if total_touches > 0 else 0
+        middle_pct = (counts['middle'] / total_touches * 100) if total_touches > 0 else 0
+        offensive_pct = (counts['offensive'] / total_touches * 100) if total_touches > 0 else 0
         
-        fig = plt.figure(figsize=(16, 16))
-        ax = fig.add_axes([0, 0, 1, 1])
-        ax.axis('off')
-        ax.imshow(gradient, aspect='auto', cmap=cmap, extent=[0, 1, 0, 1])
+        # Setup visuel
+        fig, ax = new_figure((16, 16), self.color1, self.color2)
         gs = GridSpec(7, 2, height_ratios=[1, 1, 1, 1, 4, 4, 4])
         
         # Photo joueur
-        image_path = PlayerProfileScraper(self.player_data['player_name']).save_player_profile()
-        try:
-            player_photo = mpimg.imread(image_path)
-            ax_image = fig.add_subplot(gs[:4, 0])
-            ax_image.imshow(player_photo, aspect='equal')
-            ax_image.set_anchor('W')
-            ax_image.axis('off')
-        except:
-            pass
+        image_path = player_photo_path(self.player_data)
+        add_photo(fig, gs[:4, 0], image_path)
 
         # Infos
         y_position = 0.96
@@ -1234,9 +997,9 @@ class SeasonVisualizer:
         ax_bar4 = fig.add_subplot(gs[3, 1])
 
         selected_stats = [
-            ("Zone défensive", len(zones['defensive']), total_touches),
-            ('Zone médiane', len(zones['middle']), total_touches),
-            ('Zone offensive', len(zones['offensive']), total_touches),
+            ("Zone défensive", counts['defensive'], total_touches),
+            ('Zone médiane', counts['middle'], total_touches),
+            ('Zone offensive', counts['offensive'], total_touches),
             ('Total touches', total_touches, total_touches),
         ]
 
@@ -1246,7 +1009,7 @@ class SeasonVisualizer:
             self._add_horizontal_bar(ax_bars[i], label, value, max(total, 1))
         
         # Terrain avec zones colorées
-        pitch = Pitch(pitch_type='opta', pitch_color='none', line_color='white', linewidth=2)
+        pitch = get_pitch(Pitch, pitch_type='opta', pitch_color='none', line_color='white', linewidth=2)
         ax_pitch = fig.add_subplot(gs[4:, :])
         pitch.draw(ax=ax_pitch)
         
@@ -1254,21 +1017,10 @@ class SeasonVisualizer:
         pitch.lines(33, 0, 33, 100, lw=3, color='white', alpha=0.5, linestyle='--', ax=ax_pitch)
         pitch.lines(66, 0, 66, 100, lw=3, color='white', alpha=0.5, linestyle='--', ax=ax_pitch)
         
-        # Afficher les touches avec un code couleur par zone
-        for e in zones['defensive']:
-            if 'x' in e:
-                pitch.scatter(e['x'], e['y'], s=150, marker='o', color='#FF6B6B', 
-                            alpha=0.3, edgecolor='white', linewidth=0.5, ax=ax_pitch)
-        
-        for e in zones['middle']:
-            if 'x' in e:
-                pitch.scatter(e['x'], e['y'], s=150, marker='o', color='#FFD93D', 
-                            alpha=0.3, edgecolor='white', linewidth=0.5, ax=ax_pitch)
-        
-        for e in zones['offensive']:
-            if 'x' in e:
-                pitch.scatter(e['x'], e['y'], s=150, marker='o', color='#6DF176', 
-                            alpha=0.3, edgecolor='white', linewidth=0.5, ax=ax_pitch)
+        # Afficher les touches avec un code couleur par zone (une couche par zone)
+        for name, color in (('defensive', '#FF6B6B'), ('middle', '#FFD93D'), ('offensive', '#6DF176')):
+            draw_scatter_layer(pitch, ax_pitch, table, zones[name], s=150, marker='o', color=color,
+                               alpha=0.3, edgecolor='white', linewidth=0.5)
         
         # Annotations des zones (utiliser pitch.text() pour VerticalPitch)
         pitch.text(16.5, 50, f'ZONE\nDÉFENSIVE\n{defensive_pct:.1f}%', 
@@ -1293,9 +1045,7 @@ class SeasonVisualizer:
         ]
         ax_pitch.legend(handles=legend_handles, loc='upper center', bbox_to_anchor=(0.5, 0.96), ncol=3, fontsize=12)
         
-        plt.tight_layout()
-        plt.savefig(save_path, facecolor=fig.get_facecolor(), edgecolor='none')
-        plt.close(fig)
+        save_figure(fig, save_path, 'SeasonVisualizer.plot_zone_dominance')
 
 
 # ==================== AUTRES VISUALIZERS (STUBS) ====================
@@ -1312,7 +1062,114 @@ class PlayerDuoVisualizer:
         print("PlayerDuoVisualizer: Non implémenté")
 
 class TeamPassNetworkVisualizer:
-    def __init__(self, match_data, team_name, competition, color1, color2):
-        pass
-    def plot_pass_network(self, save_path):
-        print("TeamPassNetworkVisualizer: Non implémenté")
\ No newline at end of file
+    """
+    Réseau de passes d'une équipe sur un match (extractor.get_full_match_data) :
+    matrice passeur -> receveur et positions moyennes calculées par group-by
+    vectorisés (PassPairings), avant le premier remplacement ou sur une
+    fenêtre de minutes. pairings : appariement du match déjà calculé, partagé
+    entre les deux équipes.
+    """
+
+    def __init__(self, match_data, team_name, competition, color1, color2, pairings=None):
+        self.competition = competition
+        self.color1 = color1
+        self.color2 = color2
+        self.team = None
+
+        match_centre = (match_data or {}).get('matchCentreData') or match_data or {}
+        for side in ('home', 'away'):
+            team = match_centre.get(side) or {}
+            if normalize_name(team.get('name')) == normalize_name(team_name):
+                self.team = team
+                self.opponent = match_centre.get('away' if side == 'home' else 'home') or {}
+                self.side = side
+        if self.team is None:
+            print(f"Équipe '{team_name}' introuvable dans les données du match.")
+            return
+
+        self.team_id = self.team['teamId']
+        self.team_name = self.team['name']
+        self.players = self.team.get('players', [])
+        self.player_ids = np.array([player['playerId'] for player in self.players], dtype=np.int64)
+        self.pairings = pairings if pairings is not None else PassPairings.from_events(match_centre.get('events', []))
+
+    def network(self, start=0, end=None, min_passes=3):
+        """
+        Réseau sur les minutes étendues [start, end[ (end None : jusqu'au
+        premier remplacement de l'équipe, ou fin du match). Retourne un dict :
+        players (indices dans self.players des joueurs ayant touché le ballon),
+        x / y / touches / passes par joueur, matrix (passeur x receveur) et
+        edges (i, j, passes dans les deux sens) d'au moins min_passes passes.
+        """
+        if end is None:
+            end = self.pairings.first_substitution(self.team_id)
+        matrix = self.pairings.pass_matrix(self.player_ids, self.team_id, start, end)
+        mean_x, mean_y, touches = self.pairings.average_positions(self.player_ids, self.team_id, start, end)
+
+        players = np.flatnonzero(touches > 0)
+        matrix = matrix[np.ix_(players, players)]
+        exchanged = np.triu(matrix + matrix.T, k=1)
+        first, second = np.nonzero(exchanged >= max(min_passes, 1))
+        return {
+            "start": start,
+            "end": end,
+            "players": players,
+            "x": mean_x[players],
+            "y": mean_y[players],
+            "touches": touches[players],
+            "passes": matrix.sum(axis=1),
+            "matrix": matrix,
+            "edges": (first, second, exchanged[first, second]),
+        }
+
+    def plot_pass_network(self, save_path, start=0, end=None, min_passes=3):
+        if self.team is None:
+            return
+        network = self.network(start, end, min_passes)
+        if len(network["players"]) == 0:
+            print(f"Aucune touche de {self.team_name} sur la période demandée.")
+            return
+
+        fig, ax = new_figure((16, 16), self.color1, self.color2)
+        pitch = get_pitch(VerticalPitch, pitch_type='opta', pitch_color='none', line_color='white', linewidth=2)
+        ax_pitch = fig.add_axes([0.05, 0.04, 0.9, 0.8])
+        pitch.draw(ax=ax_pitch)
+
+        x, y = network["x"], network["y"]
+
+        # Arêtes : une seule LineCollection, épaisseur et opacité selon le nombre de passes
+        first, second, counts = network["edges"]
+        if len(counts):
+            weight = counts / counts.max()
+            colors = np.tile(mcolors.to_rgba('white'), (len(counts), 1))
+            colors[:, 3] = 0.25 + 0.65 * weight
+            pitch.lines(x[first], y[first], x[second], y[second], lw=2 + 12 * weight,
+                        color=colors, zorder=1, ax=ax_pitch)
+
+        # Nœuds : un seul scatter, taille selon le nombre de passes réussies du joueur
+        passes = network["passes"]
+        sizes = 600 + 2400 * passes / max(passes.max(), 1)
+        pitch.scatter(x, y, s=sizes, color=self.color2, edgecolors='white', linewidth=2.5, zorder=2, ax=ax_pitch)
+
+        for index, player_x, player_y in zip(network["players"], x, y):
+            pitch.annotate(str(self.players[index].get('shirtNo', '')), xy=(player_x, player_y), c='white',
+                           va='center', ha='center', size=16, fontweight='bold', zorder=3, ax=ax_pitch)
+
+        period = f"{network['start']}'-{network['end']}'" if network["end"] is not None else f"{network['start']}'-fin"
+        if end is None and network["end"] is not None:
+            period += " (avant le 1er remplacement)"
+        text_items = [
+            f"Réseau de passes - {self.team_name}",
+            f"vs {self.opponent.get('name', '')}",
+            f"{self.competition}" if self.competition else "",
+            f"Minutes {period}",
+            f"Liens : {min_passes} passes ou plus",
+        ]
+        y_position = 0.97
+        for text in text_items:
+            if text:
+                ax.text(0.05, y_position, text, fontsize=19, color='white', fontweight='bold', ha='left', transform=ax.transAxes)
+                y_position -= 0.03
+        ax.text(0.75, 0.97, f"@TarbouchData", fontsize=20, color='white', fontweight='bold', ha='left', transform=ax.transAxes, alpha=0.8)
+
+        return save_figure(fig, save_path, tight_layout=False)
\ No newline at end of file
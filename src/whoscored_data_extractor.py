@@ -3,13 +3,22 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from bs4 import BeautifulSoup
 import re
-import json
 import time
 import traceback
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import threading
+import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 import os
+from urllib.parse import urljoin
+from event_warehouse import EventWarehouse
+from match_cache import MatchCache
+from pass_network import PassPairings
+from player_index import PlayerIndex
+from page_fetchers import HttpFetcher, SeleniumFetcher
+from player_data_io import OUTPUT_FORMATS, read_player_data, resolve_player_data_path, write_player_data
+from season_aggregator import PlayerSeasonAccumulator, match_partials, peak_rss_mb, rollup_aggregate_files
 
 # --- Début de la fusion de MatchDataExtractor ---
 
@@ -75,13 +84,47 @@ class MatchDataExtractor:
 # --- Fin de la fusion de MatchDataExtractor ---
 
 
+class RateLimiter:
+    """
+    Limiteur de débit global partagé entre plusieurs threads : garantit un
+    intervalle minimal entre deux chargements de page, quel que soit le worker.
+    """
+
+    def __init__(self, min_interval=1.0):
+        self.min_interval = max(0.0, float(min_interval))
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        """Bloque jusqu'au prochain créneau disponible."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
 class WhoScoredDataExtractor(MatchDataExtractor):
     
-    def __init__(self, html_path=None):
+    def __init__(self, html_path=None, pool_size=1, min_request_interval=1.0, cache_dir="data/match_cache", live_ttl=300,
+                 use_http=True, warehouse_path="data/events.sqlite", output_format="json"):
         super().__init__(html_path)
         self.driver = None # Pour stocker l'instance du driver
         self.data = None   # Pour stocker les données scrapées
         self.match_data = None  # Pour stocker les données du match complet
+        self.pool_size = pool_size  # Nombre de navigateurs en parallèle pour les pages joueur
+        self.rate_limiter = RateLimiter(min_request_interval)  # Débit global, tous workers confondus
+        self.match_cache = MatchCache(cache_dir, live_ttl) if cache_dir else None  # Cache disque des matchs
+        # Index playerId <-> nom des matchs ingérés, persisté avec le cache (en mémoire sans cache)
+        self.player_index = PlayerIndex(os.path.join(cache_dir, "player_index.json") if cache_dir else None)
+        # Entrepôt SQLite de tous les événements récupérés (requêtes multi-matchs hors ligne)
+        self.warehouse = EventWarehouse(warehouse_path) if warehouse_path else None
+        # Format des fichiers joueur écrits (voir player_data_io.OUTPUT_FORMATS)
+        self.output_format = output_format
+        # Backend HTTP sans navigateur, Selenium ne sert que de repli
+        self.http_fetcher = HttpFetcher(pool_maxsize=max(10, pool_size)) if use_http else None
         
     def _get_driver(self):
         """Initialise et retourne une instance de Selenium driver."""
@@ -96,42 +139,36 @@ class WhoScoredDataExtractor(MatchDataExtractor):
         return driver
 
     def _extract_data_from_url(self, driver, url):
-        """Extrait les données JSON d'une URL de match donnée."""
-        print(f"Chargement de la page WhoScored {url}...")
-        driver.get(url)
+        """Extrait les données JSON d'une URL de match donnée (backend Selenium)."""
+        return SeleniumFetcher(driver).fetch_match(url)
 
-        try:
-            WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.ID, "layout-wrapper")))
-        except Exception as e:
-            print(f"Erreur d'attente pour {url}: {e}")
+    def _fetch_match_http(self, url):
+        """Tente de récupérer le match sans navigateur ; None si le backend HTTP échoue."""
+        if not self.http_fetcher:
             return None
+        return self.http_fetcher.fetch_match(url)
 
-        print("Récupération du contenu HTML...")
-        html = driver.page_source
-
-        print("Extraction des données avec le modèle regex...")
-        regex_pattern = r'(?<=require\.config\.params\["args"\].=.)[\s\S]*?;'
-        
-        data_txt_match = re.search(regex_pattern, html)
-        
-        if not data_txt_match:
-            print(f"Regex n'a rien trouvé pour {url}")
-            return None
-
-        data_txt = data_txt_match.group(0)
-        data_txt = data_txt.replace('matchId', '"matchId"')
-        data_txt = data_txt.replace('matchCentreData', '"matchCentreData"')
-        data_txt = data_txt.replace('matchCentreEventTypeJson', '"matchCentreEventTypeJson"')
-        data_txt = data_txt.replace('formationIdNameMappings', '"formationIdNameMappings"')
-        data_txt = data_txt.replace('};', '}')
-
-        try:
-            data_json = json.loads(data_txt)
-            print("Données JSON extraites avec succès.")
-            return data_json
-        except json.JSONDecodeError as e:
-            print(f"Erreur de décodage JSON pour {url}: {e}")
+    def _load_cached_match(self, url):
+        """Retourne les données du match depuis le cache disque, ou None."""
+        if not self.match_cache:
             return None
+        match_id = MatchCache.match_id_from_url(url)
+        data_json = self.match_cache.get(match_id)
+        if data_json:
+            print(f"Match {match_id} chargé depuis le cache disque.")
+            if self.warehouse and match_id and not self.warehouse.has_match(match_id):
+                self.warehouse.ingest(match_id, data_json)  # Match en cache antérieur à l'entrepôt
+        return data_json
+
+    def _store_match(self, url, data_json):
+        """Enregistre les données brutes d'un match dans le cache disque et l'entrepôt d'événements."""
+        if not data_json:
+            return
+        match_id = MatchCache.match_id_from_url(url)
+        if self.match_cache:
+            self.match_cache.put(match_id, data_json)
+        if self.warehouse:
+            self.warehouse.ingest(match_id, data_json)
 
     def _extract_data_html(self):
         """Méthode pour extraire les données d'un seul match (self.html_path)."""
@@ -139,10 +176,24 @@ class WhoScoredDataExtractor(MatchDataExtractor):
         if self.data:
             print("Données déjà chargées, utilisation du cache.")
             return self.data
+
+        data_json = self._load_cached_match(self.html_path)
+        if data_json:
+            self.data = data_json
+            self.match_data = data_json
+            return self.data
+
+        data_json = self._fetch_match_http(self.html_path)
+        if data_json:
+            self._store_match(self.html_path, data_json)
+            self.data = data_json
+            self.match_data = data_json
+            return self.data
             
         driver = self._get_driver()
         try:
             data_json = self._extract_data_from_url(driver, self.html_path)
+            self._store_match(self.html_path, data_json)
             self.data = data_json # Stocker les données
             self.match_data = data_json  # Stocker aussi dans match_data pour le réseau d'équipe
         finally:
@@ -153,52 +204,159 @@ class WhoScoredDataExtractor(MatchDataExtractor):
     def _extract_list_matchs_html(self):
         """
         Extrait les données de tous les matchs listés sur une page de joueur (agrégé).
-        Utilise UNE SEULE instance Selenium pour plus de rapidité.
+        Charge tout en mémoire : préférer _iter_list_matchs_html pour une saison.
         """
-        driver = self._get_driver()
-        all_data = []
-        
+        return list(self._iter_list_matchs_html())
+
+    def _iter_list_matchs_html(self):
+        """
+        Génère les données des matchs listés sur une page de joueur, un par un,
+        dans l'ordre de la page. La page joueur est chargée en HTTP (Selenium en
+        repli), puis les matchs sont répartis sur un pool de self.pool_size
+        workers ; chaque match peut être libéré dès qu'il a été consommé.
+        """
+        match_urls, seed_driver = self._player_match_urls()
+        if not match_urls:
+            return
+
+        n_matches = 0
+        try:
+            for data_json in self._scrape_match_urls(match_urls, seed_driver):
+                if data_json:
+                    n_matches += 1
+                    yield data_json
+        except Exception as e:
+            print(f"Erreur durant l'extraction de la liste des matchs : {e}")
+            traceback.print_exc()
+
+        print(f"Fusion complète des données. {n_matches} matchs scrapés.")
+
+    def _player_match_urls(self):
+        """
+        Charge la page joueur (HTTP, Selenium en repli) et retourne
+        (URLs des matchs joués, navigateur Selenium resté ouvert ou None).
+        Le navigateur éventuel doit être confié à _scrape_match_urls ou fermé.
+        """
+        driver = None
         try:
             print(f"Chargement de la page joueur : {self.html_path}...")
-            driver.get(self.html_path)
-            WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.ID, "player-fixture")))
+            html = self.http_fetcher.get_html(self.html_path) if self.http_fetcher else None
+            match_urls = self._parse_fixture_links(html) if html else []
 
-            print("Parsing HTML avec BeautifulSoup pour trouver les liens de matchs...")
-            html = driver.page_source
-            soup = BeautifulSoup(html, 'html.parser')
+            if not match_urls:
+                # Le tableau des matchs est rendu en JavaScript : repli sur Selenium
+                driver = self._get_driver()
+                html = SeleniumFetcher(driver).get_html(self.html_path, "player-fixture")
+                match_urls = self._parse_fixture_links(html) if html else []
 
-            BASE_URL = 'https://www.whoscored.com'
-            links = soup.select('a.result-1.rc') # Sélecteur pour les matchs joués
-            
+        except Exception as e:
+            print(f"Erreur durant l'extraction de la liste des matchs : {e}")
+            traceback.print_exc()
             match_urls = []
-            for link in links:
-                href = link.get('href')
-                if href and 'Matches' in href:
-                    match_urls.append(BASE_URL + href.replace("/Show/", "/Live/"))
 
-            if not match_urls:
-                print("Aucun lien de match trouvé sur la page joueur.")
-                return []
+        if not match_urls:
+            print("Aucun lien de match trouvé sur la page joueur.")
+            if driver:
+                print("Fermeture du navigateur Selenium.")
+                driver.quit()
+            return [], None
 
-            print(f"Trouvé {len(match_urls)} matchs à scraper. Début de la boucle...")
+        print(f"Trouvé {len(match_urls)} matchs sur la page joueur.")
+        return match_urls, driver
+
+    def _parse_fixture_links(self, html):
+        """Retourne les URLs /Live/ des matchs joués listés sur une page joueur."""
+        print("Parsing HTML avec BeautifulSoup pour trouver les liens de matchs...")
+        soup = BeautifulSoup(html, 'html.parser')
+
+        links = soup.select('a.result-1.rc') # Sélecteur pour les matchs joués
+
+        match_urls = []
+        for link in links:
+            href = link.get('href')
+            if href and 'Matches' in href:
+                # Les liens sont relatifs : résolus par rapport à la page joueur (https://www.whoscored.com)
+                match_urls.append(urljoin(self.html_path, href.replace("/Show/", "/Live/")))
+        return match_urls
+
+    def _scrape_match_urls(self, match_urls, seed_driver=None):
+        """
+        Scrape une liste d'URLs de match avec un pool borné de workers
+        (self.pool_size) et le limiteur de débit global. Chaque match est
+        d'abord demandé au backend HTTP ; un navigateur n'est démarré
+        (paresseusement) que si ce dernier échoue.
+        Génère les résultats dans l'ordre des URLs (None pour un échec). Au plus
+        2 x pool_size matchs sont en cours ou en attente de consommation à la fois.
+        """
+        pool_size = max(1, min(self.pool_size, len(match_urls)))
+        idle_drivers = queue.Queue()
+        all_drivers = []
+        drivers_lock = threading.Lock()
+
+        if seed_driver:
+            idle_drivers.put(seed_driver)
+            all_drivers.append(seed_driver)
+
+        def acquire_driver():
+            try:
+                return idle_drivers.get_nowait()
+            except queue.Empty:
+                driver = self._get_driver()
+                with drivers_lock:
+                    all_drivers.append(driver)
+                return driver
+
+        def scrape(indexed_url):
+            i, match_url = indexed_url
+            data_json = self._load_cached_match(match_url)
+            if data_json:
+                return data_json
+
+            if self.http_fetcher and not self.http_fetcher.blocked:
+                self.rate_limiter.wait()
+                data_json = self._fetch_match_http(match_url)
+                if data_json:
+                    self._store_match(match_url, data_json)
+                    return data_json
 
-            # Boucle sur les URLs de match en utilisant LE MÊME driver
-            for i, match_url in enumerate(match_urls):
+            try:
+                driver = acquire_driver()
+            except Exception as e:
+                print(f"Impossible de démarrer un navigateur pour {match_url}: {e}")
+                return None
+            try:
+                self.rate_limiter.wait()
                 print(f"\n--- Scraping Match {i+1}/{len(match_urls)} ---")
                 data_json = self._extract_data_from_url(driver, match_url)
-                if data_json:
-                    all_data.append(data_json)
-                time.sleep(1) # Petite pause pour ne pas surcharger
+                self._store_match(match_url, data_json)
+                return data_json
+            except Exception as e:
+                print(f"Erreur lors du scraping de {match_url}: {e}")
+                return None
+            finally:
+                idle_drivers.put(driver)
 
-        except Exception as e:
-            print(f"Erreur durant l'extraction de la liste des matchs : {e}")
-            traceback.print_exc()
+        print(f"Scraping de {len(match_urls)} matchs avec {pool_size} worker(s)...")
+        window = 2 * pool_size
+        try:
+            with ThreadPoolExecutor(max_workers=pool_size) as executor:
+                # Fenêtre glissante dans l'ordre des matchs de la page joueur
+                indexed_urls = iter(enumerate(match_urls))
+                pending = deque(executor.submit(scrape, item) for item in islice(indexed_urls, window))
+                while pending:
+                    data_json = pending.popleft().result()
+                    next_url = next(indexed_urls, None)
+                    if next_url is not None:
+                        pending.append(executor.submit(scrape, next_url))
+                    yield data_json
+                    data_json = None
         finally:
-            print("Fermeture du navigateur Selenium après la boucle.")
-            driver.quit()
-
-        print(f"Fusion complète des données. {len(all_data)} matchs scrapés.")
-        return all_data
+            print(f"Fermeture des {len(all_drivers)} navigateur(s) Selenium du pool.")
+            for driver in all_drivers:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
 
     def get_player_list(self):
         """
@@ -242,199 +400,271 @@ class WhoScoredDataExtractor(MatchDataExtractor):
             print(f"Erreur de clé lors de la recherche des joueurs: {e}")
             return None
 
-    def extract_player_stats_and_events(self, player_name, output_dir="player_data"):
-        """Extrait les stats et événements du joueur sur WhoScored pour UN match."""
-        
-        # Vérifie si les données sont déjà chargées par get_player_list
+    def get_player_ids(self):
+        """(nom, playerId) de tous les joueurs du match chargé (même analyse que get_player_list)."""
+        if not self.data:
+            return []
+        match_centre = self.data.get('matchCentreData') or {}
+        name_dict = match_centre.get('playerIdNameDictionary', {})
+        return [(name_dict[str(p['playerId'])], p['playerId'])
+                for side in ("home", "away")
+                for p in match_centre.get(side, {}).get('players', [])
+                if str(p.get('playerId')) in name_dict]
+
+    def _ensure_match_data(self):
+        """Charge les données du match si get_player_list ne l'a pas déjà fait ; retourne False en cas d'échec."""
         if not self.data:
             print("Données non trouvées, lancement de l'extraction (stats)...")
             if not self.html_path:
                 print("Erreur: URL non définie.")
-                return None
+                return False
             self._extract_data_html() # Charge les données dans self.data
         
         if not self.data:
             print("Erreur: Aucune donnée n'a pu être extraite.")
-            return None
-            
-        print(f"Extraction des stats de match pour {player_name}...")
-        os.makedirs(output_dir, exist_ok=True)
+            return False
+        return True
 
-        player_id = None
-        try:
-            for pid, name in self.data['matchCentreData']['playerIdNameDictionary'].items():
-                if name.lower() == player_name.lower():
-                    player_id = pid
-                    break
-        except KeyError:
-             print("Erreur: 'matchCentreData' ou 'playerIdNameDictionary' non trouvé dans les données.")
-             return None
-
-        if not player_id:
-            print(f"Joueur '{player_name}' non trouvé.")
-            return None
-
-        events = self.data["matchCentreData"].get("events", [])
-        player_events = [event for event in events if event.get('playerId') == int(player_id)]
-
-        player_stats = None
-        team = None
-
-        for team_type in ["home", "away"]:
-            for player in self.data["matchCentreData"][team_type]["players"]:
-                if player["playerId"] == int(player_id):
-                    player_stats = player
-                    team = team_type
-                    break
-            if player_stats:
-                break
-
-        if not player_stats:
-            print(f"Stats du joueur '{player_name}' non trouvées.")
-            return None
-
-        player_combined_data = {
-            "player_name": player_name,
-            # CORRECTION: Utiliser 'playerId' et le convertir en int pour DuoVisualizer
-            "playerId": int(player_id), 
-            "team": team,
-            "position": player_stats.get("position"),
-            "shirtNo": player_stats.get("shirtNo"),
-            "height": player_stats.get("height"),
-            "weight": player_stats.get("weight"),
-            "age": player_stats.get("age"),
-            "isFirstEleven": player_stats.get("isFirstEleven"),
-            "isManOfTheMatch": player_stats.get("isManOfTheMatch"),
-            "stats": player_stats.get("stats"),
-            "events": player_events
-        }
-
-        # Utilise l'ID du match pour un nom de fichier unique (version corrigée et robuste)
+    def _match_id_for_files(self):
+        """ID du match utilisé dans les noms de fichiers joueur ('match' si introuvable)."""
         try:
             match = re.search(r"/matches/(\d+)/", self.html_path, re.IGNORECASE)
             if not match:
                 raise ValueError("Impossible d'extraire l'ID du match de l'URL")
-            match_id = match.group(1)
+            return match.group(1)
         except Exception as e:
             print(f"Avertissement: Impossible d'extraire l'ID du match de l'URL ({e}). Utilisation d'un ID par défaut 'match'.")
-            match_id = "match" # Fallback
-            
-        output_file = os.path.join(output_dir, f"{player_name.replace(' ', '_')}_{match_id}.json")
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(player_combined_data, f, ensure_ascii=False, indent=4)
+            return "match" # Fallback
+
+    def _build_player_records(self, player_names=None):
+        """
+        Construit les fiches (stats + événements) de plusieurs joueurs en une passe :
+        les événements sont regroupés par playerId en un seul parcours, et les
+        joueurs sont retrouvés via l'index des joueurs (PlayerIndex).
+        player_names : noms voulus (accents et casse ignorés), None pour tous les joueurs.
+        Retourne {nom demandé: fiche}, sans les joueurs introuvables.
+        """
+        try:
+            name_dict = self.data['matchCentreData']['playerIdNameDictionary']
+        except KeyError:
+            print("Erreur: 'matchCentreData' ou 'playerIdNameDictionary' non trouvé dans les données.")
+            return {}
+
+        if player_names is None:
+            player_names = list(name_dict.values())
+
+        index = self.player_index
+        match_id = MatchCache.match_id_from_url(self.html_path)
+        if match_id is None:
+            index, match_id = PlayerIndex(None), "match"  # Match sans ID : index temporaire
+        elif not MatchCache.is_finished(self.data):
+            index = PlayerIndex(None)  # Match en cours : effectif provisoire, jamais persisté
+        index.add_match(match_id, self.data)  # Sans effet si le match est déjà indexé
+        index.save()
+
+        wanted = {}  # playerId -> nom demandé
+        for player_name in player_names:
+            found = index.player_in_match(match_id, player_name)
+            if found is None:
+                print(f"Joueur '{player_name}' non trouvé.")
+            else:
+                wanted.setdefault(int(found[0]), player_name)
+
+        events_by_player = {player_id: [] for player_id in wanted}
+        for event in self.data["matchCentreData"].get("events", []):
+            player_events = events_by_player.get(event.get('playerId'))
+            if player_events is not None:
+                player_events.append(event)
+
+        # Receveurs de toutes les passes réussies du match, inférés en une passe sur tous les événements
+        pairings = PassPairings.from_events(self.data["matchCentreData"].get("events", [])) if wanted else None
+
+        players = {}  # playerId -> (stats du joueur, équipe)
+        for team_type in ["home", "away"]:
+            for player in self.data["matchCentreData"][team_type]["players"]:
+                if player["playerId"] in wanted and player["playerId"] not in players:
+                    players[player["playerId"]] = (player, team_type)
+
+        records = {}
+        for player_id, player_name in wanted.items():
+            if player_id not in players:
+                print(f"Stats du joueur '{player_name}' non trouvées.")
+                continue
+            player_stats, team = players[player_id]
+            records[player_name] = {
+                "player_name": player_name,
+                # CORRECTION: Utiliser 'playerId' et le convertir en int pour DuoVisualizer
+                "playerId": player_id, 
+                "team": team,
+                "position": player_stats.get("position"),
+                "shirtNo": player_stats.get("shirtNo"),
+                "height": player_stats.get("height"),
+                "weight": player_stats.get("weight"),
+                "age": player_stats.get("age"),
+                "isFirstEleven": player_stats.get("isFirstEleven"),
+                "isManOfTheMatch": player_stats.get("isManOfTheMatch"),
+                "stats": player_stats.get("stats"),
+                "pass_connections": pairings.connections(player_id, name_dict),
+                "events": events_by_player[player_id]
+            }
+        return records
 
-        print(f"Les données du match pour '{player_name}' ont été enregistrées dans {output_file}")
+    def extract_player_stats_and_events(self, player_name, output_dir="player_data"):
+        """Extrait les stats et événements du joueur sur WhoScored pour UN match."""
+        extracted = self.extract_players_stats_and_events([player_name], output_dir)
+        if player_name not in extracted:
+            return None
+        output_file, _ = extracted[player_name]
         return output_file
-    
-    def extract_player_aggregate_stats(self, player_name, output_dir="player_data"):
-        """Extrait et agrège les stats et événements du joueur sur plusieurs matchs WhoScored."""
-        print(f"Extraction des données agrégées pour {player_name}...")
 
-        # Utilise la nouvelle méthode optimisée
-        self.data_list = self._extract_list_matchs_html()
-        os.makedirs(output_dir, exist_ok=True)
+    def extract_players_stats_and_events(self, player_names=None, output_dir="player_data", write_files=True):
+        """
+        Extraction groupée pour UN match : toutes les fiches joueur sont
+        construites en une passe sur les événements (voir _build_player_records).
+        player_names : liste de noms, None pour tous les joueurs du match.
+        write_files : écrit les fichiers <nom>_<matchId>.json ; sinon les fiches
+        restent en mémoire pour les visualizers.
+        Retourne {nom: (chemin du fichier ou None, fiche)}.
+        """
+        if not self._ensure_match_data():
+            return {}
 
-        all_events = []
-        positions_count = {}
-        first_eleven_count = 0
-        motm_count = 0
-        aggregated_stats = {}
-        player_id = None
-        height = weight = age = None
-        total_matches_processed = 0
+        print(f"Extraction des stats de match pour {len(player_names) if player_names is not None else 'tous les'} joueur(s)...")
+        records = self._build_player_records(player_names)
+        if not write_files:
+            return {player_name: (None, record) for player_name, record in records.items()}
 
-        if not self.data_list:
+        os.makedirs(output_dir, exist_ok=True)
+        match_id = self._match_id_for_files()
+        extracted = {}
+        for player_name, record in records.items():
+            output_file = write_player_data(os.path.join(output_dir, f"{player_name.replace(' ', '_')}_{match_id}"),
+                                            record, self.output_format)
+            print(f"Les données du match pour '{player_name}' ont été enregistrées dans {output_file}")
+            extracted[player_name] = (output_file, record)
+        return extracted
+    
+    def extract_player_aggregate_stats(self, player_name, output_dir="player_data", incremental=True):
+        """
+        Extrait et agrège les stats et événements du joueur sur plusieurs matchs WhoScored.
+        Chaque match est réduit en agrégats partiels (tous les joueurs, stockés à
+        côté du match dans le cache) puis fusionné dans l'agrégat de saison.
+        incremental : reprend l'agrégat existant (<nom>_aggregated, tout format) et n'y
+        ajoute que les matchs terminés qu'il ne contient pas encore ; les matchs en
+        cours ne sont jamais figés et sont recalculés à chaque exécution.
+        """
+        print(f"Extraction des données agrégées pour {player_name}...")
+        os.makedirs(output_dir, exist_ok=True)
+        output_base = os.path.join(output_dir, f"{player_name.replace(' ', '_')}_aggregated")
+
+        accumulator = None
+        existing_file = resolve_player_data_path(output_base + OUTPUT_FORMATS.get(self.output_format, '.json'))
+        if incremental and existing_file:
+            try:
+                record = read_player_data(existing_file) or {}
+                if record.get("live_match_ids"):
+                    # Chiffres provisoires mêlés aux stats : reconstruction (agrégats partiels en cache)
+                    print(f"Agrégat existant avec {len(record['live_match_ids'])} match(s) en cours, reconstruction.")
+                elif "match_ids" in record:
+                    accumulator = PlayerSeasonAccumulator.from_record(record)
+                    print(f"Agrégat existant : {accumulator.matches_seen} match(s) déjà intégré(s).")
+            except (OSError, ValueError) as e:
+                print(f"Agrégat existant illisible ({e}), reconstruction complète.")
+        if accumulator is None:
+            accumulator = PlayerSeasonAccumulator(player_name)
+
+        match_urls, seed_driver = self._player_match_urls()
+        if not match_urls and not accumulator.matches_seen:
             print("Aucune donnée de match n'a été extraite.")
             return None
 
-        for match_data in self.data_list:
-            match_centre = match_data.get("matchCentreData")
-            if not match_centre:
-                print("Données de match invalides, passage au suivant.")
+        known = set(accumulator.match_ids)
+        new_urls = [url for url in match_urls if MatchCache.match_id_from_url(url) not in known]
+        print(f"{len(new_urls)} nouveau(x) match(s) à intégrer sur {len(match_urls)}.")
+
+        rss_before = peak_rss_mb()
+        index = self.player_index
+        # Matchs (terminés) déjà indexés où le joueur est absent : enregistrés sans rien charger.
+        # Matchs dont les agrégats partiels sont déjà calculés : pas besoin des données brutes
+        to_scrape = []
+        for url in new_urls:
+            match_id = MatchCache.match_id_from_url(url)
+            found = index.player_in_match(match_id, player_name)
+            if found is None and index.knows_match(match_id):
+                accumulator.add_partials(match_id, {})
                 continue
+            partials = self.match_cache.get_partials(match_id) if self.match_cache else None
+            if partials is not None:
+                if not index.knows_match(match_id):
+                    index.add_partials(match_id, partials)
+                    found = index.player_in_match(match_id, player_name)
+                accumulator.add_partials(match_id, partials, found[0] if found else None)
+            else:
+                to_scrape.append(url)
+
+        if to_scrape:
+            # Agrégation au fil du scraping : aucun match complet n'est conservé
+            for i, match_data in enumerate(self._scrape_match_urls(to_scrape, seed_driver)):
+                if not match_data:
+                    continue
+                match_id = MatchCache.match_id_from_url(to_scrape[i])
+                partials = match_partials(match_data)
+                # Match en cours : ni agrégats partiels en cache ni match_ids, recalculé au prochain passage
+                finished = MatchCache.is_finished(match_data)
+                if self.match_cache and finished:
+                    self.match_cache.put_partials(match_id, partials)
+                # Seuls les matchs terminés entrent dans l'index persistant : un joueur encore
+                # absent d'un match en cours ne doit pas y être figé comme absent
+                match_index = index if finished else PlayerIndex(None)
+                match_index.add_match(match_id, match_data)
+                found = match_index.player_in_match(match_id, player_name)
+                accumulator.add_partials(match_id, partials if found else {}, found[0] if found else None,
+                                         finished=finished)
+                match_data = None  # Libère le match avant le suivant
+        elif seed_driver:
+            print("Fermeture du navigateur Selenium.")
+            seed_driver.quit()
+        index.save()
+        rss_after = peak_rss_mb()
 
-            current_player_id = None
-            for pid, name in match_centre.get("playerIdNameDictionary", {}).items():
-                if name.lower() == player_name.lower():
-                    current_player_id = pid
-                    if not player_id: # Sauvegarde du premier ID trouvé
-                        player_id = pid
-                    break
-            
-            if not current_player_id:
-                # print(f"Joueur '{player_name}' non trouvé dans un des matchs.")
-                continue # Passe au match suivant
-
-            events = match_centre.get("events", [])
-            player_events = [event for event in events if event.get('playerId') == int(current_player_id)]
-            all_events.extend(player_events)
-
-            player_stats = None
-            for team_type in ["home", "away"]:
-                for player in match_centre.get(team_type, {}).get("players", []):
-                    if player.get("playerId") == int(current_player_id):
-                        player_stats = player
-                        break
-                if player_stats:
-                    break
-
-            if not player_stats:
-                print(f"Stats de '{player_name}' non trouvées pour un match.")
-                continue
-            
-            total_matches_processed += 1
-            pos = player_stats.get("position")
-            if pos:
-                positions_count[pos] = positions_count.get(pos, 0) + 1
-
-            if player_stats.get("isFirstEleven"):
-                first_eleven_count += 1
-            if player_stats.get("isManOfTheMatch"):
-                motm_count += 1
-            if not height: height = player_stats.get("height")
-            if not weight: weight = player_stats.get("weight")
-            if not age: age = player_stats.get("age")
-
-            # Agrégation des stats
-            for stat_key, stat_value in player_stats.get("stats", {}).items():
-                if stat_key not in aggregated_stats:
-                    aggregated_stats[stat_key] = {} # Initialise un dict pour chaque stat
-                
-                if isinstance(stat_value, dict):
-                    for sub_key, sub_val in stat_value.items():
-                        if isinstance(sub_val, (int, float)):
-                            aggregated_stats[stat_key][sub_key] = aggregated_stats[stat_key].get(sub_key, 0) + sub_val
-                elif isinstance(stat_value, (int, float)):
-                     # Pour les stats qui ne sont pas des dicts (ex: 'rating')
-                     aggregated_stats[stat_key] = aggregated_stats.get(stat_key, 0) + stat_value
-
-
-        if not player_id:
+        if rss_after is not None:
+            print(f"Pic mémoire (RSS) : {rss_after:.0f} Mo ({rss_after - rss_before:+.0f} Mo pendant l'agrégation "
+                  f"de {len(new_urls)} nouveau(x) match(s))")
+
+        if not accumulator.matches_seen:
+            print("Aucune donnée de match n'a été extraite.")
+            return None
+
+        player_combined_data = accumulator.to_record()
+        if not player_combined_data:
             print(f"Joueur '{player_name}' non trouvé dans aucun match.")
             return None
 
-        player_combined_data = {
-            "player_name": player_name,
-            "player_id": player_id,
-            "position": positions_count, # Dict des positions jouées
-            "height": height,
-            "weight": weight,
-            "age": age,
-            "total_matches": total_matches_processed,
-            "isFirstEleven_count": first_eleven_count,
-            "isManOfTheMatch_count": motm_count,
-            "stats": aggregated_stats,
-            "events": all_events
-        }
-
-        output_file = os.path.join(output_dir, f"{player_name.replace(' ', '_')}_aggregated.json")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(player_combined_data, f, ensure_ascii=False, indent=4)
-
-        print(f"Données agrégées pour '{player_name}' (basées sur {total_matches_processed} matchs) enregistrées dans {output_file}")
+        # Colonnes binaires (memmap) lues par les visualizers à la place du JSON
+        output_file = write_player_data(output_base, player_combined_data, self.output_format, sidecar=True)
+
+        print(f"Données agrégées pour '{player_name}' (basées sur {accumulator.total_matches} matchs) enregistrées dans {output_file}")
         return output_file
-    
+
+    def extract_player_career_stats(self, player_name, season_files, output_dir="player_data"):
+        """
+        Cumule plusieurs agrégats de saison (fichiers extract_player_aggregate_stats,
+        tout format) en un agrégat multi-saison / carrière <nom>_career.
+        Retourne le chemin écrit, ou None si aucun agrégat n'est utilisable.
+        """
+        print(f"Cumul de {len(season_files)} agrégat(s) de saison pour {player_name}...")
+        rollup = rollup_aggregate_files(season_files, player_name)
+        player_career_data = rollup.to_record() if rollup else None
+        if not player_career_data:
+            print(f"Aucun agrégat utilisable pour '{player_name}'.")
+            return None
+
+        os.makedirs(output_dir, exist_ok=True)
+        output_base = os.path.join(output_dir, f"{player_name.replace(' ', '_')}_career")
+        output_file = write_player_data(output_base, player_career_data, self.output_format, sidecar=True)
+        print(f"Données cumulées pour '{player_name}' (basées sur {rollup.total_matches} matchs) enregistrées dans {output_file}")
+        return output_file
+
     def get_full_match_data(self):
         """Récupère toutes les données du match (pour le réseau d'équipe)."""
         # Si self.data est chargé, self.match_data l'est aussi
@@ -0,0 +1,6 @@
+# conftest.py
+# Les modules de src/ s'importent par leur nom, comme depuis main.py.
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
@@ -0,0 +1,82 @@
+# Agrégat incrémental : un match en cours n'est jamais figé dans match_ids,
+# ses chiffres définitifs remplacent les provisoires au passage suivant.
+from player_data_io import read_player_data
+from whoscored_data_extractor import WhoScoredDataExtractor
+
+
+def _match(match_id, shots, finished):
+    return {
+        "matchId": match_id,
+        "matchCentreData": {
+            "statusCode": 6 if finished else 3,
+            "playerIdNameDictionary": {"10": "Luka Modric"},
+            "home": {"players": [{"playerId": 10, "position": "CM", "isFirstEleven": True,
+                                  "stats": {"totalShots": {"10": shots}}}]},
+            "away": {"players": []},
+            "events": [],
+        },
+    }
+
+
+def _run(tmp_path, matches):
+    extractor = WhoScoredDataExtractor(cache_dir=str(tmp_path / "cache"), use_http=False, warehouse_path=None)
+    urls = [f"https://www.whoscored.com/matches/{match['matchId']}/live" for match in matches]
+    extractor._player_match_urls = lambda: (urls, None)
+    scraped = {url: match for url, match in zip(urls, matches)}
+    extractor._scrape_match_urls = lambda to_scrape, seed_driver=None: (scraped[url] for url in to_scrape)
+    path = extractor.extract_player_aggregate_stats("Luka Modric", output_dir=str(tmp_path / "out"))
+    return read_player_data(path)
+
+
+def test_live_match_is_recomputed_until_finished(tmp_path):
+    record = _run(tmp_path, [_match(1, 2, True), _match(2, 1, False)])
+    assert record["match_ids"] == ["1"]
+    assert record["live_match_ids"] == ["2"]
+    assert record["total_matches"] == 2
+    assert record["stats"]["totalShots"]["10"] == 3
+
+    record = _run(tmp_path, [_match(1, 2, True), _match(2, 4, True)])
+    assert sorted(record["match_ids"]) == ["1", "2"]
+    assert record["live_match_ids"] == []
+    assert record["total_matches"] == 2
+    assert record["stats"]["totalShots"]["10"] == 6
+
+    # Tout est terminé : reprise incrémentale sans rien recompter
+    record = _run(tmp_path, [_match(1, 2, True), _match(2, 4, True)])
+    assert record["total_matches"] == 2
+    assert record["stats"]["totalShots"]["10"] == 6
+
+
+def _absent_match(match_id, finished):
+    match = _match(match_id, 0, finished)
+    match["matchCentreData"]["playerIdNameDictionary"] = {"20": "Other Player"}
+    match["matchCentreData"]["home"]["players"] = [{"playerId": 20, "stats": {}}]
+    return match
+
+
+def test_player_absent_while_live_counted_when_finished(tmp_path):
+    record = _run(tmp_path, [_match(1, 2, True), _absent_match(2, False)])
+    assert record["match_ids"] == ["1"]
+    assert record["live_match_ids"] == ["2"]
+
+    record = _run(tmp_path, [_match(1, 2, True), _match(2, 4, True)])
+    assert sorted(record["match_ids"]) == ["1", "2"]
+    assert record["total_matches"] == 2
+    assert record["stats"]["totalShots"]["10"] == 6
+
+
+def test_career_rollup_of_season_aggregates(tmp_path):
+    _run(tmp_path / "2023", [_match(1, 2, True)])
+    _run(tmp_path / "2024", [_match(2, 4, True), _match(3, 1, True)])
+
+    extractor = WhoScoredDataExtractor(cache_dir=None, use_http=False, warehouse_path=None, output_format="gzip")
+    path = extractor.extract_player_career_stats(
+        "Luka Modric", [str(tmp_path / "2023" / "out" / "Luka_Modric_aggregated.json"),
+                        str(tmp_path / "2024" / "out" / "Luka_Modric_aggregated")],
+        output_dir=str(tmp_path / "career"))
+    record = read_player_data(path)
+
+    assert path.endswith("Luka_Modric_career.json.gz")
+    assert sorted(record["match_ids"]) == ["1", "2", "3"]
+    assert record["total_matches"] == 3
+    assert record["stats"]["totalShots"]["10"] == 7
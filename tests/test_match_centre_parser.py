@@ -0,0 +1,40 @@
+# test_match_centre_parser.py
+from match_centre_parser import PLAYER_LIST_SECTIONS, parse_match_args
+
+# Clés de premier niveau en JS non quoté, valeurs en JSON, comme sur WhoScored ;
+# "formationIdNameMappings" existe aussi sous home.
+PAGE = """<script>
+require.config.params["args"] = {
+    matchId: 42,
+    matchCentreData: {"home": {"teamId": 1, "name": "Home", "formationIdNameMappings": "WRONG", "extra": {"a": [1, 2, "}"]}},
+                      "away": {"teamId": 2, "name": "Away"},
+                      "playerIdNameDictionary": {"10": "Luka Modri\\u0107"}},
+    matchCentreEventTypeJson: {"pass": 1},
+    formationIdNameMappings: {"2": "442"}
+};
+</script>"""
+
+
+def test_full_parse():
+    data = parse_match_args(PAGE)
+    assert data['matchCentreData']['home']['formationIdNameMappings'] == "WRONG"
+    assert data['formationIdNameMappings'] == {"2": "442"}
+
+
+def test_nested_section_then_top_level_key_with_same_name():
+    data = parse_match_args(PAGE, ['matchCentreData.home', 'formationIdNameMappings'])
+    assert data['formationIdNameMappings'] == {"2": "442"}
+    assert data['matchCentreData'] == {'home': parse_match_args(PAGE)['matchCentreData']['home']}
+
+
+def test_nested_section_then_later_top_level_key():
+    data = parse_match_args(PAGE, ['matchCentreData.home', 'matchCentreEventTypeJson'])
+    assert data['matchCentreEventTypeJson'] == {"pass": 1}
+    assert set(data) == {'matchCentreData', 'matchCentreEventTypeJson'}
+
+
+def test_player_list_sections():
+    data = parse_match_args(PAGE, PLAYER_LIST_SECTIONS)
+    assert data['matchId'] == 42
+    assert set(data['matchCentreData']) == {'home', 'away', 'playerIdNameDictionary'}
+    assert data['matchCentreData']['playerIdNameDictionary'] == {"10": "Luka Modrić"}
@@ -0,0 +1,101 @@
+# HttpFetcher contre un serveur HTTP local : seuls un challenge ou des refus
+# répétés désactivent le backend HTTP ; page vide et 5xx n'échouent que pour leur URL.
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from page_fetchers import HttpFetcher, is_challenge_page
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+# chemin -> (code HTTP, corps)
+ROUTES = {
+    '/match': (200, _fixture('match_page.html')),
+    '/challenge': (200, _fixture('challenge_page.html')),
+    '/challenge-403': (403, _fixture('challenge_page.html')),
+    '/empty': (200, ''),
+    '/unavailable': (503, 'Service Unavailable'),
+    '/server-error': (500, '<html><body>Internal Server Error</body></html>'),
+    '/forbidden': (403, 'Forbidden'),
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        status, body = ROUTES[self.path]
+        payload = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def fetcher():
+    fetcher = HttpFetcher(timeout=5)
+    yield fetcher
+    fetcher.close()
+
+
+def test_challenge_markers():
+    assert is_challenge_page(_fixture('challenge_page.html'))
+    assert not is_challenge_page(_fixture('match_page.html'))
+    assert not is_challenge_page('')
+
+
+def test_match_page(server, fetcher):
+    data = fetcher.fetch_match(f"{server}/match")
+    assert data['matchId'] == 42
+    assert data['formationIdNameMappings'] == {"2": "442"}
+    assert not fetcher.blocked
+
+
+@pytest.mark.parametrize('path', ['/challenge', '/challenge-403'])
+def test_challenge_blocks_http_backend(server, fetcher, path):
+    assert fetcher.get_html(f"{server}{path}") is None
+    assert fetcher.blocked
+    assert fetcher.get_html(f"{server}/match") is None
+
+
+@pytest.mark.parametrize('path', ['/empty', '/unavailable', '/server-error'])
+def test_empty_and_server_errors_fail_only_that_url(server, fetcher, path):
+    assert fetcher.get_html(f"{server}{path}") is None
+    assert not fetcher.blocked
+    assert fetcher.fetch_match(f"{server}/match")['matchId'] == 42
+
+
+def test_single_refusal_does_not_block(server, fetcher):
+    assert fetcher.get_html(f"{server}/forbidden") is None
+    assert not fetcher.blocked
+    assert fetcher.get_html(f"{server}/match") is not None
+    # Le compteur repart à zéro après une page valide
+    assert fetcher.get_html(f"{server}/forbidden") is None
+    assert not fetcher.blocked
+
+
+def test_repeated_refusals_block(server, fetcher):
+    fetcher.get_html(f"{server}/forbidden")
+    fetcher.get_html(f"{server}/forbidden")
+    assert fetcher.blocked
@@ -0,0 +1,38 @@
+# Homonymes : un playerId n'adopte jamais la photo ou l'entrée d'un autre joueur
+from photo_index import PhotoIndex
+from player_image_downloader import PlayerProfileScraper
+
+
+def _scraper(tmp_path, monkeypatch, player_id, index):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data" / "photo").mkdir(parents=True, exist_ok=True)
+    return PlayerProfileScraper("Vitinha", player_id=player_id, photo_index=index)
+
+
+def test_photo_path_is_keyed_by_player_id():
+    assert PlayerProfileScraper("Vitinha", player_id=1).image_save_path != \
+        PlayerProfileScraper("Vitinha", player_id=2).image_save_path
+
+
+def test_homonym_does_not_adopt_other_player_photo(tmp_path, monkeypatch):
+    index = PhotoIndex(path=None)
+    owner = _scraper(tmp_path, monkeypatch, 384887, index)
+    with open(owner.image_save_path, 'wb') as f:
+        f.write(b"jpeg")
+    assert owner._known_photo() == owner.image_save_path
+
+    homonym = _scraper(tmp_path, monkeypatch, 999, index)
+    assert homonym._known_photo() is None
+    assert index.lookup(999, "Vitinha") is None
+
+
+def test_legacy_name_file_only_without_id(tmp_path, monkeypatch):
+    index = PhotoIndex(path=None)
+    legacy = _scraper(tmp_path, monkeypatch, None, index)
+    with open(legacy.image_save_path, 'wb') as f:
+        f.write(b"jpeg")
+
+    assert _scraper(tmp_path, monkeypatch, 384887, index)._known_photo() is None
+    assert legacy._known_photo() == legacy.image_save_path
+    # L'entrée par nom ne sert pas non plus pour un playerId
+    assert index.lookup(384887, "Vitinha") is None
@@ -0,0 +1,39 @@
+# peak_rss_mb : ru_maxrss en octets sous macOS, en Ko ailleurs
+from types import SimpleNamespace
+
+import pytest
+
+import season_aggregator
+
+
+@pytest.mark.parametrize('platform, maxrss', [('linux', 200 * 1024), ('darwin', 200 * 1024 * 1024)])
+def test_peak_rss_mb_scale(monkeypatch, platform, maxrss):
+    if season_aggregator.resource is None:
+        pytest.skip("getrusage indisponible")
+    monkeypatch.setattr(season_aggregator.sys, 'platform', platform)
+    monkeypatch.setattr(season_aggregator.resource, 'getrusage', lambda who: SimpleNamespace(ru_maxrss=maxrss))
+    assert season_aggregator.peak_rss_mb() == 200
+
+
+def _season(match_ids, shots, live_match_ids=()):
+    accumulator = season_aggregator.PlayerSeasonAccumulator("Luka Modric")
+    for match_id in match_ids:
+        partial = season_aggregator.PlayerSeasonAccumulator("Luka Modric")
+        partial._add_player_match("10", {"position": "CM", "stats": {"totalShots": {"10": shots}}}, [])
+        accumulator.add_partials(match_id, {"10": partial.to_record()}, "10")
+    accumulator.live_match_ids = list(live_match_ids)
+    return accumulator.to_record()
+
+
+@pytest.mark.parametrize('output_format', ['json', 'gzip', 'columnar'])
+def test_rollup_reads_every_format_and_skips_live(tmp_path, output_format):
+    from player_data_io import write_player_data
+
+    paths = [write_player_data(str(tmp_path / "s1_aggregated"), _season(["1", "2"], 1), output_format),
+             write_player_data(str(tmp_path / "s2_aggregated"), _season(["3"], 2), output_format),
+             write_player_data(str(tmp_path / "s3_aggregated"), _season(["4"], 5, ["5"]), output_format)]
+    rollup = season_aggregator.rollup_aggregate_files(paths)
+
+    assert rollup.match_ids == ["1", "2", "3"]
+    assert rollup.total_matches == 3
+    assert rollup.stats["totalShots"]["10"] == 4
@@ -0,0 +1,19 @@
+# sum_matches (additions en place) doit rester identique à la réduction de stack_matches
+import numpy as np
+
+from stat_matrix import StatMatrix, StatVocabulary, stack_matches, sum_matches
+
+
+def test_sum_matches_equals_stacked_sum():
+    vocabulary = StatVocabulary()
+    matrices = [
+        StatMatrix.from_stats({"passes": {"3": 2, "45": 1}, "shots": {"10": 1}}, vocabulary),
+        StatMatrix.from_stats({"shots": {"131": 2}, "rating": 7.1}, vocabulary),
+        StatMatrix.from_stats({"passes": {"3": 0}}, vocabulary),
+    ]
+    total = sum_matches(matrices, vocabulary)
+    _, values, present = stack_matches(matrices, vocabulary)
+
+    np.testing.assert_array_equal(total.values, values.sum(axis=0))
+    np.testing.assert_array_equal(total.present, present.any(axis=0))
+    assert total.to_stats() == {"passes": {"3": 2.0, "45": 1.0}, "shots": {"10": 1.0, "131": 2.0}, "rating": 7.1}